@@ -0,0 +1,163 @@
+"""
+Content-addressed file cache on disk.
+
+Results that are expensive to compute (converted audio, speaker segments) are
+stored as files named after a key that is derived from the input file
+(see `utils.file_fingerprint`) and the options that influence the
+result. The cache has a size cap; if it is exceeded, the least recently used
+entries are removed. Reading an entry counts as a use.
+"""
+
+import os
+import shutil
+import time
+import uuid
+
+
+class DiskCache:
+    """
+    A directory of cache entries, one file per key.
+
+    Entries are written to a temporary file first and then moved into place,
+    so a crash never leaves a half written entry behind, and several threads
+    or processes can use the same directory.
+    """
+
+    def __init__(self, directory: str, max_size_mb: float, suffix: str = ''):
+        self.directory = directory
+        self.max_size_mb = max_size_mb
+        self.suffix = suffix
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        """File name of the entry `key` (whether it exists or not)."""
+        return os.path.join(self.directory, f'{key}{self.suffix}')
+
+    def get(self, key: str):
+        """Path of the entry `key`, or None if it is not in the cache."""
+        path = self.path(key)
+        try:
+            os.utime(path)  # mark as recently used
+        except OSError:
+            return None
+        return path
+
+    def get_bytes(self, key: str):
+        """Content of the entry `key`, or None if it is not in the cache."""
+        path = self.get(key)
+        if path is None:
+            return None
+        try:
+            with open(path, 'rb') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def new_file(self) -> str:
+        """Temporary file name in the cache directory to write a new entry to,
+        pass it to `put_file()` when it is complete."""
+        return os.path.join(self.directory, f'.{uuid.uuid4().hex}.tmp')
+
+    def put_file(self, key: str, src: str, move: bool = False) -> str:
+        """Store the file `src` as entry `key` (moved if `move`, else copied).
+        Returns the path of the entry."""
+        path = self.path(key)
+        if move and os.path.dirname(os.path.abspath(src)) == os.path.abspath(self.directory):
+            os.replace(src, path)
+        else:
+            tmp = self.new_file()
+            try:
+                if move:
+                    shutil.move(src, tmp)
+                else:
+                    shutil.copyfile(src, tmp)
+                os.replace(tmp, path)
+            except BaseException:
+                self._remove(tmp)
+                raise
+        self.evict(keep=key)
+        return path
+
+    def put_bytes(self, key: str, data: bytes) -> str:
+        """Store `data` as entry `key`. Returns the path of the entry."""
+        tmp = self.new_file()
+        try:
+            with open(tmp, 'wb') as f:
+                f.write(data)
+        except BaseException:
+            self._remove(tmp)
+            raise
+        return self.put_file(key, tmp, move=True)
+
+    def entries(self) -> list:
+        """All entries as dicts with "key", "path", "size" (bytes) and "last_used"
+        (timestamp), least recently used first."""
+        ret = []
+        try:
+            names = os.listdir(self.directory)
+        except OSError:
+            return ret
+        for name in names:
+            if name.startswith('.') or not name.endswith(self.suffix):
+                continue
+            path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(path)
+            except OSError:
+                continue
+            ret.append({
+                'key': name[:len(name) - len(self.suffix)] if self.suffix else name,
+                'path': path,
+                'size': st.st_size,
+                'last_used': st.st_mtime,
+            })
+        ret.sort(key=lambda e: e['last_used'])
+        return ret
+
+    def size(self) -> int:
+        """Total size of all entries in bytes."""
+        return sum(e['size'] for e in self.entries())
+
+    def evict(self, keep: str = None) -> int:
+        """Remove least recently used entries until the cache fits into
+        `max_size_mb` (a cap of 0 or less means no limit). The entry `keep` is
+        never removed. Returns the number of removed entries."""
+        if self.max_size_mb is None or self.max_size_mb <= 0:
+            return 0
+        return self.prune(max_size_mb=self.max_size_mb, keep=keep)
+
+    def prune(self, max_age_days: float = None, max_size_mb: float = None, keep: str = None) -> int:
+        """Remove entries that have not been used for `max_age_days`, then the least
+        recently used ones until the rest fits into `max_size_mb`. Returns the number
+        of removed entries."""
+        entries = self.entries()
+        removed = 0
+        if max_age_days is not None:
+            limit = time.time() - max_age_days * 86400
+            for e in list(entries):
+                if e['last_used'] < limit and e['key'] != keep:
+                    self._remove(e['path'])
+                    entries.remove(e)
+                    removed += 1
+        if max_size_mb is not None:
+            total = sum(e['size'] for e in entries)
+            for e in entries:
+                if total <= max_size_mb * 1024 * 1024:
+                    break
+                if e['key'] == keep:
+                    continue
+                self._remove(e['path'])
+                total -= e['size']
+                removed += 1
+        return removed
+
+    def clear(self) -> int:
+        """Remove all entries. Returns the number of removed entries."""
+        return self.prune(max_size_mb=0)
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
@@ -0,0 +1,3168 @@
+"""
+The transcription engine of noScribe, without any GUI.
+
+Everything needed to run transcription jobs lives here: the config, the job
+and queue classes, audio conversion, speaker identification (pyannote),
+transcription (faster-whisper) in worker processes and the rendering of the
+transcript. The GUI (noScribe.py), the command line modes and other Python
+programs are clients of the `Engine` class, which reports the log, progress
+and the transcribed segments through callbacks. For a single file:
+
+    from engine import create_transcription_job, transcribe
+    job = create_transcription_job('interview.mp3', 'interview.html', whisper_model_name='precise')
+    for segment in transcribe(job):
+        print(segment.start, segment.speaker, segment.text)
+"""
+
+import sys
+import os
+import platform
+import yaml
+import locale
+import appdirs
+from subprocess import Popen, PIPE, STDOUT, DEVNULL
+if platform.system() == 'Windows':
+    from subprocess import STARTUPINFO, STARTF_USESHOWWINDOW
+import re
+if platform.system() == "Darwin": # = MAC
+    from subprocess import check_output
+    if platform.machine() == "x86_64":
+        os.environ['KMP_DUPLICATE_LIB_OK']='True' # prevent OMP: Error #15: Initializing libomp.dylib, but found libiomp5.dylib already initialized.
+    # import torch.backends.mps # loading torch modules leads to segmentation fault later
+import html
+from threading import Thread, Event, local
+from tempfile import TemporaryDirectory
+import datetime
+from pathlib import Path
+if platform.system() in ("Darwin", "Linux"):
+    import shlex
+if platform.system() == 'Windows':
+    import cpufeature
+if platform.system() == 'Darwin':
+    import Foundation
+import logging
+import json
+import io
+import multiprocessing as mp
+import wave
+import queue as pyqueue
+import traceback
+from dataclasses import dataclass, field
+from enum import Enum
+from typing import TYPE_CHECKING, Callable, Iterator, Optional, List
+import time
+import uuid
+
+import utils
+from mp_service import ResidentWorker
+from disk_cache import DiskCache
+from segment_store import SegmentJournal, SegmentStore
+from job_store import JobStore
+
+# Heavy libraries (faster-whisper with onnxruntime, numpy, the HTML parser) are imported
+# where they are first used, so that starting the app or a command line mode stays fast
+# (see 'python noScribe.py --profile-startup').
+if TYPE_CHECKING:
+    import AdvancedHTMLParser
+    import numpy as np
+    from faster_whisper.vad import VadOptions
+
+app_version = '0.7'
+app_year = '2025'
+app_dir = os.path.abspath(os.path.dirname(__file__))
+
+default_html = """
+<!DOCTYPE HTML PUBLIC "-//W3C//DTD HTML 4.0//EN" "http://www.w3.org/TR/REC-html40/strict.dtd">
+<html >
+<head >
+<meta charset="UTF-8" />
+<meta name="qrichtext" content="1" />
+<style type="text/css" >
+p, li { white-space: pre-wrap; }
+</style>
+<style type="text/css" > 
+ p { font-size: 0.9em; } 
+ .MsoNormal { font-family: "Arial"; font-weight: 400; font-style: normal; font-size: 0.9em; }
+ @page WordSection1 {mso-line-numbers-restart: continuous; mso-line-numbers-count-by: 1; mso-line-numbers-start: 1; }
+ div.WordSection1 {page:WordSection1;} 
+</style>
+</head>
+<body style="font-family: 'Arial'; font-weight: 400; font-style: normal" >
+</body>
+</html>"""
+
+languages = {
+    "Auto": "auto",
+    "Multilingual": "multilingual",
+    "Afrikaans": "af",
+    "Arabic": "ar",
+    "Armenian": "hy",
+    "Azerbaijani": "az",
+    "Belarusian": "be",
+    "Bosnian": "bs",
+    "Bulgarian": "bg",
+    "Catalan": "ca",
+    "Chinese": "zh",
+    "Croatian": "hr",
+    "Czech": "cs",
+    "Danish": "da",
+    "Dutch": "nl",
+    "English": "en",
+    "Estonian": "et",
+    "Finnish": "fi",
+    "French": "fr",
+    "Galician": "gl",
+    "German": "de",
+    "Greek": "el",
+    "Hebrew": "he",
+    "Hindi": "hi",
+    "Hungarian": "hu",
+    "Icelandic": "is",
+    "Indonesian": "id",
+    "Italian": "it",
+    "Japanese": "ja",
+    "Kannada": "kn",
+    "Kazakh": "kk",
+    "Korean": "ko",
+    "Latvian": "lv",
+    "Lithuanian": "lt",
+    "Macedonian": "mk",
+    "Malay": "ms",
+    "Marathi": "mr",
+    "Maori": "mi",
+    "Nepali": "ne",
+    "Norwegian": "no",
+    "Persian": "fa",
+    "Polish": "pl",
+    "Portuguese": "pt",
+    "Romanian": "ro",
+    "Russian": "ru",
+    "Serbian": "sr",
+    "Slovak": "sk",
+    "Slovenian": "sl",
+    "Spanish": "es",
+    "Swahili": "sw",
+    "Swedish": "sv",
+    "Tagalog": "tl",
+    "Tamil": "ta",
+    "Thai": "th",
+    "Turkish": "tr",
+    "Ukrainian": "uk",
+    "Urdu": "ur",
+    "Vietnamese": "vi",
+    "Welsh": "cy",
+}
+
+# config
+config_dir = appdirs.user_config_dir('noScribe')
+if not os.path.exists(config_dir):
+    os.makedirs(config_dir)
+
+config_file = os.path.join(config_dir, 'config.yml')
+
+try:
+    with open(config_file, 'r') as file:
+        config = yaml.safe_load(file)
+        if not config:
+            raise # config file is empty (None)        
+except: # seems we run it for the first time and there is no config file
+    config = {}
+    
+def get_config(key: str, default) -> str:
+    """ Get a config value, set it if it doesn't exist """
+    if key not in config:
+        config[key] = default
+    return config[key]
+
+force_pyannote_cpu = get_config('force_pyannote_cpu', '').lower() == 'true'
+force_whisper_cpu = get_config('force_whisper_cpu', '').lower() == 'true'
+
+def save_config():
+    with open(config_file, 'w') as file:
+        yaml.safe_dump(config, file)
+
+# locale: setting the language of the UI
+# see https://pypi.org/project/python-i18n/
+import i18n
+from i18n import t
+i18n.set('filename_format', '{locale}.{format}')
+i18n.load_path.append(os.path.join(app_dir, 'trans'))
+
+try:
+    app_locale = config['locale']
+except:
+    app_locale = 'auto'
+
+if app_locale == 'auto': # read system locale settings
+    try:
+        if platform.system() == 'Windows':
+            app_locale = locale.getdefaultlocale()[0][0:2]
+        elif platform.system() == "Darwin": # = MAC
+            app_locale = Foundation.NSUserDefaults.standardUserDefaults().stringForKey_('AppleLocale')[0:2]
+    except:
+        app_locale = 'en'
+i18n.set('fallback', 'en')
+i18n.set('locale', app_locale)
+config['locale'] = app_locale
+
+# determine optimal number of threads for faster-whisper (depending on cpu cores)
+if platform.system() == 'Windows':
+    number_threads = get_config('threads', cpufeature.CPUFeature["num_physical_cores"])
+elif platform.system() == "Linux":
+    number_threads = get_config('threads', os.cpu_count() if os.cpu_count() is not None else 4)
+elif platform.system() == "Darwin": # = MAC
+    if platform.machine() == "arm64":
+        cpu_count = int(check_output(["sysctl", "-n", "hw.perflevel0.logicalcpu_max"]))
+    elif platform.machine() == "x86_64":
+        cpu_count = int(check_output(["sysctl", "-n", "hw.logicalcpu_max"]))
+    else:
+        raise Exception("Unsupported mac")
+    number_threads = get_config('threads', int(cpu_count * 0.75))
+else:
+    raise Exception('Platform not supported yet.')
+
+# Decoding profiles: trade transcription accuracy for speed.
+# 'threads': 0 uses the 'threads' setting from the config. The profiles can be
+# changed and extended in the config under 'decoding_profiles'.
+_TEMPERATURE_FALLBACK = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+DECODING_PROFILES = {
+    'throughput': {'beam_size': 1, 'best_of': 1, 'temperature': [0.0, 0.5, 1.0],
+                   'compute_type': 'int8', 'batch_size': 8, 'threads': 0},
+    'balanced': {'beam_size': 5, 'best_of': 5, 'temperature': _TEMPERATURE_FALLBACK,
+                 'compute_type': 'default', 'batch_size': 0, 'threads': 0},
+    'max_accuracy': {'beam_size': 8, 'best_of': 5, 'temperature': _TEMPERATURE_FALLBACK,
+                     'compute_type': 'float32', 'batch_size': 0, 'threads': 0},
+}
+
+def decoding_profile_names() -> list:
+    return list(DECODING_PROFILES) + [name for name in (config.get('decoding_profiles') or {})
+                                      if name not in DECODING_PROFILES]
+
+def get_decoding_profile(name: str) -> dict:
+    """ Get the settings of a decoding profile, including changes from the config """
+    custom = (config.get('decoding_profiles') or {}).get(name)
+    if name not in DECODING_PROFILES and custom is None:
+        raise ValueError(f"Unknown decoding profile: {name}")
+    profile = dict(DECODING_PROFILES.get(name, DECODING_PROFILES['balanced']))
+    profile.update(custom or {})
+    return profile
+
+# Disk caches in <config dir>/cache, the size of each is limited by '<name>_cache_mb' in the config
+CACHES = {  # name -> (file suffix, default size limit in MB)
+    'audio': ('.wav', '4096'),  # converted audio, see Engine._prepare_audio()
+    'diarization': ('.json', '256'),  # speaker segments, see Engine._run_diarize_subprocess()
+    'segments': ('.json.gz', '1024'),  # finished transcriptions, see SegmentStore
+    'journal': ('.jsonl', '256'),  # segments of running transcriptions, see SegmentJournal
+}
+
+def open_cache(name: str, enabled_only: bool = True) -> Optional[DiskCache]:
+    """ Get one of the CACHES. Returns None if it is disabled (size limit 0) and `enabled_only` """
+    suffix, default_mb = CACHES[name]
+    try:
+        max_size_mb = float(get_config(f'{name}_cache_mb', default_mb))
+    except ValueError:
+        max_size_mb = float(default_mb)
+    if max_size_mb <= 0 and enabled_only:
+        return None
+    return DiskCache(os.path.join(config_dir, 'cache', name), max_size_mb, suffix)
+
+_pyannote_config_hash = None
+
+def pyannote_config_hash() -> str:
+    """ Fingerprint of the diarization setup (pipeline config and model files), part of the
+    diarization cache key so that an update of the models invalidates cached results """
+    global _pyannote_config_hash
+    if _pyannote_config_hash is None:
+        parts = []
+        with open(os.path.join(app_dir, 'pyannote', 'pyannote_config.yaml'), 'r') as yaml_file:
+            pyannote_config = yaml.safe_load(yaml_file)
+        parts.append(json.dumps(pyannote_config, sort_keys=True))
+        for param in ('embedding', 'segmentation'):
+            model_file = os.path.join(app_dir, *pyannote_config['pipeline']['params'][param].split("/"))
+            parts.append(utils.file_fingerprint(model_file) if os.path.exists(model_file) else '')
+        _pyannote_config_hash = utils.cache_key(*parts)
+    return _pyannote_config_hash
+
+def open_segment_store() -> Optional[SegmentStore]:
+    """ The store of finished transcriptions, None if it is disabled ('segments_cache_mb' = 0) """
+    cache = open_cache('segments')
+    return SegmentStore(cache) if cache is not None else None
+
+def segment_store_key(job) -> str:
+    """ Key of a job's transcription in the segment store: the audio and everything
+    that changes what Whisper produces (but not the output format and rendering options) """
+    try:
+        vad_threshold = float(config.get('voice_activity_detection_threshold', '0.5'))
+    except ValueError:
+        vad_threshold = 0.5
+    return utils.cache_key('segments', job.fingerprint(), job.start, job.stop,
+                           os.path.basename(os.path.normpath(job.whisper_model)), job.language_name,
+                           job.disfluencies, job.whisper_beam_size, job.whisper_best_of, job.whisper_temperature,
+                           job.whisper_compute_type, job.whisper_batch_size, job.whisper_parallel_workers,
+                           vad_threshold)
+
+def diarization_cache_key(job) -> str:
+    """ Key of a job's speaker segments in the diarization cache """
+    num_speakers = int(job.speaker_detection) if str(job.speaker_detection).isdigit() else None
+    return utils.cache_key('diarization', job.fingerprint(), job.start, job.stop,
+                           pyannote_config_hash(), num_speakers)
+
+# timestamp regex
+timestamp_re = re.compile(r'\[\d\d:\d\d:\d\d.\d\d\d --> \d\d:\d\d:\d\d.\d\d\d\]')
+
+# Helper functions
+
+def iter_except(function, exception):
+        # Works like builtin 2-argument `iter()`, but stops on `exception`.
+        try:
+            while True:
+                yield function()
+        except exception:
+            return
+        
+def total_memory_mb() -> float:
+    """Physical memory of the machine in MB (0 if unknown)."""
+    try:
+        if platform.system() == 'Windows':
+            import ctypes
+
+            class MEMORYSTATUSEX(ctypes.Structure):
+                _fields_ = [('dwLength', ctypes.c_ulong), ('dwMemoryLoad', ctypes.c_ulong),
+                            ('ullTotalPhys', ctypes.c_ulonglong), ('ullAvailPhys', ctypes.c_ulonglong),
+                            ('ullTotalPageFile', ctypes.c_ulonglong), ('ullAvailPageFile', ctypes.c_ulonglong),
+                            ('ullTotalVirtual', ctypes.c_ulonglong), ('ullAvailVirtual', ctypes.c_ulonglong),
+                            ('sullAvailExtendedVirtual', ctypes.c_ulonglong)]
+
+            status = MEMORYSTATUSEX()
+            status.dwLength = ctypes.sizeof(MEMORYSTATUSEX)
+            ctypes.windll.kernel32.GlobalMemoryStatusEx(ctypes.byref(status))
+            return status.ullTotalPhys / (1024 * 1024)
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 * 1024)
+    except Exception:
+        return 0.0
+
+def probe_duration(path: str) -> float:
+    """Length of a media file in seconds, read from the container without decoding.
+    Falls back to a guess from the file size (assuming ~128 kbit/s) if that fails."""
+    try:
+        import av
+        with av.open(path) as container:
+            if container.duration:
+                return container.duration / av.time_base
+    except Exception:
+        pass
+    try:
+        return os.path.getsize(path) / 16000
+    except OSError:
+        return 0.0
+
+# Helper for text only output
+        
+def html_node_to_text(node: 'AdvancedHTMLParser.AdvancedTag') -> str:
+    """
+    Recursively get all text from a html node and its children. 
+    """
+    import AdvancedHTMLParser
+    # For text nodes, return their value directly
+    if AdvancedHTMLParser.isTextNode(node): # node.nodeType == node.TEXT_NODE:
+        return html.unescape(node)
+    # For element nodes, recursively process their children
+    elif AdvancedHTMLParser.isTagNode(node):
+        text_parts = []
+        for child in node.childBlocks:
+            text = html_node_to_text(child)
+            if text:
+                text_parts.append(text)
+        # For block-level elements, prepend and append newlines
+        if node.tagName.lower() in ['p', 'div', 'ul', 'ol', 'li', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'br']:
+            if node.tagName.lower() == 'br':
+                return '\n'
+            else:
+                return '\n' + ''.join(text_parts).strip() + '\n'
+        else:
+            return ''.join(text_parts)
+    else:
+        return ''
+
+def html_to_text(parser: 'AdvancedHTMLParser.AdvancedHTMLParser') -> str:
+    return html_node_to_text(parser.body)
+
+# Helper for WebVTT output
+
+def vtt_escape(txt: str) -> str:
+    txt = html.escape(txt)
+    while txt.find('\n\n') > -1:
+        txt = txt.replace('\n\n', '\n')
+    return txt    
+
+
+def html_to_webvtt(parser: 'AdvancedHTMLParser.AdvancedHTMLParser', media_path: str):
+    vtt = 'WEBVTT '
+    paragraphs = parser.getElementsByTagName('p')
+    # The first paragraph contains the title
+    vtt += vtt_escape(paragraphs[0].textContent) + '\n\n'
+    # Next paragraph contains info about the transcript. Add as a note.
+    vtt += vtt_escape('NOTE\n' + html_node_to_text(paragraphs[1])) + '\n\n'
+    # Add media source:
+    vtt += f'NOTE media: {media_path}\n\n'
+
+    #Add all segments as VTT cues
+    segments = parser.getElementsByTagName('a')
+    i = 0
+    for i in range(len(segments)):
+        segment = segments[i]
+        name = segment.attributes['name']
+        if name is not None:
+            name_elems = name.split('_', 4)
+            if len(name_elems) > 1 and name_elems[0] == 'ts':
+                start = utils.ms_to_webvtt(int(name_elems[1]))
+                end = utils.ms_to_webvtt(int(name_elems[2]))
+                spkr = name_elems[3]
+                txt = vtt_escape(html_node_to_text(segment))
+                vtt += f'{i+1}\n{start} --> {end}\n<v {spkr}>{txt.lstrip()}\n\n'
+    return vtt
+
+# Transcript rendering
+
+class TranscriptRenderer:
+    """Builds the transcript document of a job from the segments streamed by Whisper.
+
+    Everything that only affects the output (format, timestamps, pause markers,
+    speaker names and overlapping speech) happens here, so a stored transcription
+    can be rendered again without running the models (see SegmentStore).
+    log/logn: functions that show the transcript while it grows (e.g. Engine.log/Engine.logn).
+    """
+
+    def __init__(self, job, diarization: list, speech_chunks: list, duration: float,
+                 sampling_rate: int = 16000, log=None, logn=None):
+        self.job = job
+        self.diarization = diarization
+        self.speech_chunks = speech_chunks
+        self.duration = duration
+        self.sampling_rate = sampling_rate
+        self.log = log or (lambda *args, **kwargs: None)
+        self.logn = logn or (lambda *args, **kwargs: None)
+
+        # prepare transcript html
+        import AdvancedHTMLParser
+        d = AdvancedHTMLParser.AdvancedHTMLParser()
+        d.parseStr(default_html)                
+
+        # add audio file path:
+        tag = d.createElement("meta")
+        tag.name = "audio_source"
+        tag.content = job.audio_file
+        d.head.appendChild(tag)
+
+        # add app version:
+        """ # removed because not really necessary
+        tag = d.createElement("meta")
+        tag.name = "noScribe_version"
+        tag.content = app_version
+        d.head.appendChild(tag)
+        """
+
+        #add WordSection1 (for line numbers in MS Word) as main_body
+        main_body = d.createElement('div')
+        main_body.addClass('WordSection1')
+        d.body.appendChild(main_body)
+
+        # header               
+        p = d.createElement('p')
+        p.setStyle('font-weight', '600')
+        p.appendText(Path(job.audio_file).stem) # use the name of the audio file (without extension) as the title
+        main_body.appendChild(p)
+
+        # subheader
+        p = d.createElement('p')
+        s = d.createElement('span')
+        s.setStyle('color', '#909090')
+        s.setStyle('font-size', '0.8em')
+        s.appendText(t('doc_header', version=app_version))
+        br = d.createElement('br')
+        s.appendChild(br)
+
+        s.appendText(t('doc_header_audio', file=job.audio_file))
+        br = d.createElement('br')
+        s.appendChild(br)
+
+        s.appendText(f'({html.escape(self.option_info())})')
+
+        p.appendChild(s)
+        main_body.appendChild(p)
+
+        p = d.createElement('p')
+        main_body.appendChild(p)
+
+        self.d = d
+        self.main_body = main_body
+        self.p = p
+        self.speaker = ''
+        self.prev_speaker = ''
+        self.last_segment_end = 0
+        self.last_timestamp_ms = 0
+        self.first_segment = True
+        self.last_save = datetime.datetime.now()
+
+    def option_info(self) -> str:
+        """ Options of the job, shown in the header of the transcript """
+        job = self.job
+        option_info = ''
+        if job.start > 0:
+            option_info += f'{t("label_start")} {utils.ms_to_str(job.start)} | '
+        if job.stop > 0:
+            option_info += f'{t("label_stop")} {utils.ms_to_str(job.stop)} | '
+        option_info += f'{t("label_language")} {job.language_name} ({languages[job.language_name]}) | '
+        option_info += f'{t("label_speaker")} {job.speaker_detection} | '
+        option_info += f'{t("label_overlapping")} {job.overlapping} | '
+        option_info += f'{t("label_timestamps")} {job.timestamps} | '
+        option_info += f'{t("label_disfluencies")} {job.disfluencies} | '
+        option_info += f'{t("label_pause")} {job.pause}'
+        return option_info
+
+    @staticmethod
+    def overlap_len(ss_start, ss_end, ts_start, ts_end):
+        # ss...: speaker segment start and end in milliseconds (from pyannote)
+        # ts...: transcript segment start and end (from whisper.cpp)
+        # returns overlap percentage, i.e., "0.8" = 80% of the transcript segment overlaps with the speaker segment from pyannote  
+        if ts_end < ss_start: # no overlap, ts is before ss
+            return None
+
+        if ts_start > ss_end: # no overlap, ts is after ss
+            return 0.0
+
+        ts_len = ts_end - ts_start
+        if ts_len <= 0:
+            return None
+
+        # ss & ts have overlap
+        overlap_start = max(ss_start, ts_start) # Whichever starts later
+        overlap_end = min(ss_end, ts_end) # Whichever ends sooner
+
+        ol_len = overlap_end - overlap_start + 1
+        return ol_len / ts_len
+
+    def find_speaker(self, transcript_start, transcript_end) -> str:
+        # Looks for the shortest segment in diarization that has at least 80% overlap 
+        # with transcript_start - trancript_end.  
+        # Returns the speaker name if found.
+        # If only an overlap < 80% is found, this speaker name ist returned.
+        # If no overlap is found, an empty string is returned.
+        spkr = ''
+        overlap_found = 0
+        overlap_threshold = 0.8
+        segment_len = 0
+        is_overlapping = False
+
+        for segment in self.diarization:
+            t = self.overlap_len(segment["start"], segment["end"], transcript_start, transcript_end)
+            if t is None: # we are already after transcript_end
+                break
+
+            current_segment_len = segment["end"] - segment["start"] # Length of the current segment
+            current_segment_spkr = f'S{segment["label"][8:]}' # shorten the label: "SPEAKER_01" > "S01"
+
+            if overlap_found >= overlap_threshold: # we already found a fitting segment, compare length now
+                if (t >= overlap_threshold) and (current_segment_len < segment_len): # found a shorter (= better fitting) segment that also overlaps well
+                    is_overlapping = True
+                    overlap_found = t
+                    segment_len = current_segment_len
+                    spkr = current_segment_spkr
+            elif t > overlap_found: # no segment with good overlap yet, take this if the overlap is better then previously found 
+                overlap_found = t
+                segment_len = current_segment_len
+                spkr = current_segment_spkr
+            
+        if self.job.overlapping and is_overlapping:
+            return f"//{spkr}"
+        else:
+            return spkr
+
+    def adjust_for_pause(self, segment):
+        """Adjusts start and end of segment if it falls into a pause 
+        identified by the VAD"""
+        speech_chunks = self.speech_chunks
+        pause_extend = 0.2  # extend the pauses by 200ms to make the detection more robust
+        
+        # iterate through the pauses and adjust segment boundaries accordingly
+        for i in range(0, len(speech_chunks)):
+            pause_start = (speech_chunks[i]['end'] / self.sampling_rate) - pause_extend
+            if i == (len(speech_chunks) - 1): 
+                pause_end = self.duration + pause_extend # last segment, pause till the end
+            else:
+                pause_end = (speech_chunks[i+1]['start']  / self.sampling_rate) + pause_extend
+            
+            if pause_start > segment.end:
+                break  # we moved beyond the segment, stop going further
+            if segment.start > pause_start and segment.start < pause_end:
+                segment.start = pause_end - pause_extend
+            if segment.end > pause_start and segment.end < pause_end:
+                segment.end = pause_start + pause_extend
+        
+        return segment
+
+    def add_segment(self, seg: dict):
+        """Add a segment (as streamed by the Whisper worker) to the transcript"""
+        job = self.job
+        d = self.d
+        # Map dict to simple object-like for existing code
+        class _Seg:
+            __slots__ = ("start", "end", "text", "words")
+            def __init__(self, d):
+                self.start = d.get('start')
+                self.end = d.get('end')
+                self.text = d.get('text')
+                self.words = d.get('words')
+        segment = _Seg(seg)
+
+        segment = self.adjust_for_pause(segment)
+
+        # get time of the segment in milliseconds
+        start = round(segment.start * 1000.0)
+        end = round(segment.end * 1000.0)
+        # if we skipped a part at the beginning of the audio we have to add this here again, otherwise the timestaps will not match the original audio:
+        orig_audio_start = job.start + start
+        orig_audio_end = job.start + end
+
+        if job.timestamps:
+            ts = utils.ms_to_str(orig_audio_start)
+            ts = f'[{ts}]'
+
+        # check for pauses and mark them in the transcript
+        if (job.pause > 0) and (start - self.last_segment_end >= job.pause * 1000): # (more than x seconds with no speech)
+            pause_len = round((start - self.last_segment_end)/1000)
+            if pause_len >= 60: # longer than 60 seconds
+                pause_str = ' ' + t('pause_minutes', minutes=round(pause_len/60))
+            elif pause_len >= 10: # longer than 10 seconds
+                pause_str = ' ' + t('pause_seconds', seconds=pause_len)
+            else: # less than 10 seconds
+                pause_str = ' (' + (job.pause_marker * pause_len) + ')'
+
+            if self.first_segment:
+                pause_str = pause_str.lstrip() + ' '
+
+            orig_audio_start_pause = job.start + self.last_segment_end
+            orig_audio_end_pause = job.start + start
+            a = d.createElement('a')
+            a.name = f'ts_{orig_audio_start_pause}_{orig_audio_end_pause}_{self.speaker}'
+            a.appendText(pause_str)
+            self.p.appendChild(a)
+            self.log(pause_str)
+            if self.first_segment:
+                self.logn()
+                self.logn()
+        self.last_segment_end = end
+
+        # write text to the doc
+        # diarization (speaker detection)?
+        seg_text = segment.text
+        seg_html = html.escape(seg_text)
+
+        if job.speaker_detection != 'none':
+            new_speaker = self.find_speaker(start, end)
+            if (self.speaker != new_speaker) and (new_speaker != ''): # speaker change
+                if new_speaker[:2] == '//': # is overlapping speech, create no new paragraph
+                    self.prev_speaker = self.speaker
+                    self.speaker = new_speaker
+                    seg_text = f' {self.speaker}:{seg_text}'
+                    seg_html = html.escape(seg_text)                                
+                elif (self.speaker[:2] == '//') and (new_speaker == self.prev_speaker): # was overlapping speech and we are returning to the previous speaker 
+                    self.speaker = new_speaker
+                    seg_text = f'//{seg_text}'
+                    seg_html = html.escape(seg_text)
+                else: # new speaker, not overlapping
+                    if self.speaker[:2] == '//': # was overlapping speech, mark the end
+                        last_elem = self.p.lastElementChild
+                        if last_elem:
+                            last_elem.appendText('//')
+                        else:
+                            self.p.appendText('//')
+                        self.log('//')
+                    self.p = d.createElement('p')
+                    self.main_body.appendChild(self.p)
+                    if not self.first_segment:
+                        self.logn()
+                        self.logn()
+                    self.speaker = new_speaker
+                    # add timestamp
+                    if job.timestamps:
+                        seg_html = f'{self.speaker}: <span style="color: {job.timestamp_color}" >{ts}</span>{html.escape(seg_text)}'
+                        seg_text = f'{self.speaker}: {ts}{seg_text}'
+                        self.last_timestamp_ms = start
+                    else:
+                        if job.file_ext != 'vtt': # in vtt files, speaker names are added as special voice tags so skip this here
+                            seg_text = f'{self.speaker}:{seg_text}'
+                            seg_html = html.escape(seg_text)
+                        else:
+                            seg_html = html.escape(seg_text).lstrip()
+                            seg_text = f'{self.speaker}:{seg_text}'
+                        
+            else: # same speaker
+                if job.timestamps:
+                    if (start - self.last_timestamp_ms) > job.timestamp_interval:
+                        seg_html = f' <span style=\"color: {job.timestamp_color}\" >{ts}</span>{html.escape(seg_text)}'
+                        seg_text = f' {ts}{seg_text}'
+                        self.last_timestamp_ms = start
+                    else:
+                        seg_html = html.escape(seg_text)
+
+        else: # no speaker detection
+            if job.timestamps and (self.first_segment or (start - self.last_timestamp_ms) > job.timestamp_interval):
+                seg_html = f' <span style=\"color: {job.timestamp_color}\" >{ts}</span>{html.escape(seg_text)}'
+                seg_text = f' {ts}{seg_text}'
+                self.last_timestamp_ms = start
+            else:
+                seg_html = html.escape(seg_text)
+            # avoid leading whitespace in first paragraph
+            if self.first_segment:
+                seg_text = seg_text.lstrip()
+                seg_html = seg_html.lstrip()
+
+        # Create bookmark with audio timestamps start to end and add the current segment.
+        a_html = f'<a name=\"ts_{orig_audio_start}_{orig_audio_end}_{self.speaker}\" >{seg_html}</a>'
+        a = d.createElementFromHTML(a_html)
+        self.p.appendChild(a)
+
+        self.log(seg_text)
+        
+        self.first_segment = False
+
+    def save(self):
+        """Write the transcript to job.transcript_file in the format of the job.
+        If the file cannot be written (e.g. opened in Word), another file name is used."""
+        job = self.job
+        txt = ''
+        if job.file_ext == 'html':
+            txt = self.d.asHTML()
+        elif job.file_ext == 'txt':
+            txt = html_to_text(self.d)
+        elif job.file_ext == 'vtt':
+            txt = html_to_webvtt(self.d, job.audio_file)
+        else:
+            raise TypeError(f'Invalid file type "{job.file_ext}".')
+        try:
+            if txt != '':
+                with open(job.transcript_file, 'w', encoding="utf-8") as f:
+                    f.write(txt)
+                    f.flush()
+                self.last_save = datetime.datetime.now()
+        except Exception:
+            # other error while saving, maybe the file is already open in Word and cannot be overwritten
+            # try saving to a different filename
+            try:
+                job.transcript_file = utils.create_unique_filenames([Path(job.transcript_file)])[0]
+            except RuntimeError as e:
+                # File name already exists and a new one could not
+                # be found.
+                raise RuntimeError(t('rescue_saving_failed')) from e
+
+            # `job.transcript_file` is for sure a `Path` here as we
+            # called `create_unique_filenames`.
+            job.transcript_file.write_text(txt, encoding="utf-8")
+
+            self.logn()
+            self.logn(t('rescue_saving', file=job.transcript_file), 'error', link=f'file://{job.transcript_file}')
+            self.last_save = datetime.datetime.now()
+
+# Transcription Job Management Classes
+
+class JobStatus(Enum):
+    WAITING = "waiting"
+    AUDIO_CONVERSION = "audio_conversion"
+    SPEAKER_IDENTIFICATION = "speaker_identification"
+    TRANSCRIPTION = "transcription"
+    CANCELING = "canceling"
+    CANCELED = "canceled"
+    FINISHED = "finished"
+    ERROR = "error"
+
+class TranscriptionJob:
+    """Represents a single transcription job with all its parameters and status"""
+
+    # Settings and results that are kept in the JobStore (see to_dict())
+    PERSISTENT_FIELDS = (
+        'error_message', 'error_tb', 'audio_file', 'transcript_file', 'has_partial_transcript',
+        'start', 'stop', 'language_name', 'whisper_model', 'speaker_detection', 'overlapping',
+        'timestamps', 'disfluencies', 'pause', 'decoding_profile', 'whisper_beam_size',
+        'whisper_best_of', 'whisper_temperature', 'whisper_compute_type', 'whisper_threads',
+        'whisper_batch_size', 'whisper_parallel_workers', 'word_alignment', 'timestamp_interval',
+        'timestamp_color', 'pause_marker', 'auto_save', 'whisper_xpu', 'vad_threshold', 'file_ext',
+    )  # not audio_fingerprint: the file may change while noScribe is not running
+    
+    def __init__(self):
+        # Status tracking
+        self.id: str = uuid.uuid4().hex
+        self.store: Optional[JobStore] = None  # status changes are written here, see TranscriptionQueue
+        self._status: JobStatus = JobStatus.WAITING
+        self.error_message: Optional[str] = None
+        self.error_tb: Optional[str] = None
+        self.created_at: datetime.datetime = datetime.datetime.now()
+        self.started_at: Optional[datetime.datetime] = None
+        self.finished_at: Optional[datetime.datetime] = None
+        
+        # Progress tracking
+        self.progress: float = 0.0  # Progress from 0.0 to 1.0
+        
+        # File paths
+        self.audio_file: str = ''
+        self.transcript_file: str = ''
+        # Partial transcript tracking
+        self.has_partial_transcript: bool = False
+        
+        # Time range
+        self.start: int = 0  # milliseconds
+        self.stop: int = 0   # milliseconds (0 means until end)
+        
+        # Language and model settings
+        self.language_name: str = 'Auto'
+        self.whisper_model: str = ''  # path to the model
+        
+        # Processing options
+        self.speaker_detection: str = 'auto'
+        self.overlapping: bool = True
+        self.timestamps: bool = False
+        self.disfluencies: bool = True
+        self.pause: int = 0  # index value (0=none, 1=1sec+, etc.)
+        
+        # Config-based options
+        self.decoding_profile: str = 'balanced'  # see DECODING_PROFILES
+        self.whisper_beam_size: int = 5
+        self.whisper_best_of: int = 5
+        self.whisper_temperature: list = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]  # fallback temperatures
+        self.whisper_compute_type: str = 'default'
+        self.whisper_threads: int = 4
+        self.whisper_batch_size: int = 0  # > 1 enables batched inference
+        self.whisper_parallel_workers: int = 0  # > 1 splits long audio into parts transcribed in parallel
+        self.word_alignment: str = 'word'  # 'off', 'segment' or 'word' (see needed_word_alignment())
+        self.timestamp_interval: int = 60_000
+        self.timestamp_color: str = '#78909C'
+        self.pause_marker: str = '.'
+        self.auto_save: bool = True
+        self.whisper_xpu: str = 'cpu' 
+        self.vad_threshold: float = 0.5
+        
+        # Derived properties
+        self.file_ext: str = ''
+        self.audio_fingerprint: str = ''  # see fingerprint()
+
+        # Runtime state, per job so that several jobs can run at the same time
+        self.cancel_event: Event = Event()  # cancellation token of this job
+        self.mp_proc = None  # active worker process (Whisper or pyannote)
+        self.ffmpeg_proc = None  # active audio conversion
+        self.slot: int = 0  # scheduler slot, selects the resident workers the job uses
+        self.memory_mb: float = 0.0  # estimated memory need, see Engine._estimate_job_memory()
+        self.duration: float = 0.0  # seconds to transcribe, see Engine._job_duration()
+        self.prepared: Optional[dict] = None  # audio/speakers prepared ahead of time, see Engine._advance_pipeline()
+        self.pipeline_stages: set = set()  # pipeline stages started for this job
+        self.stage_thread: Optional[Thread] = None  # pipeline stage currently working on this job
+
+    @property
+    def status(self) -> JobStatus:
+        return self._status
+
+    @status.setter
+    def status(self, status: JobStatus):
+        self._status = status
+        self.save()
+
+    def save(self):
+        """Write the job to its store (if the queue is persistent)"""
+        store = self.store
+        if store is None:
+            return
+        try:
+            store.save(self.id, self._status.value, self.to_dict())
+        except Exception as e:
+            logging.warning(f'Cannot save the job queue: {e}')
+
+    def to_dict(self) -> dict:
+        """Settings, results and timestamps of the job as JSON compatible dict"""
+        data = {name: getattr(self, name) for name in self.PERSISTENT_FIELDS}
+        for name in ('created_at', 'started_at', 'finished_at'):
+            value = getattr(self, name)
+            data[name] = value.isoformat() if value is not None else None
+        return data
+
+    @classmethod
+    def from_dict(cls, job_id: str, status: str, data: dict) -> 'TranscriptionJob':
+        """Restore a job saved with to_dict(). Unknown fields are ignored, missing
+        ones keep their defaults."""
+        job = cls()
+        job.id = job_id
+        job._status = JobStatus(status)
+        for name in cls.PERSISTENT_FIELDS:
+            if name in data:
+                setattr(job, name, data[name])
+        for name in ('created_at', 'started_at', 'finished_at'):
+            if data.get(name):
+                setattr(job, name, datetime.datetime.fromisoformat(data[name]))
+        return job
+
+    def request_cancel(self):
+        """Cancel this job: set its cancellation token and stop its child processes"""
+        self.cancel_event.set()
+        proc = self.mp_proc
+        if proc is not None:
+            try:
+                if proc.is_alive():
+                    proc.terminate()
+            except Exception:
+                pass
+        ffmpeg_proc = self.ffmpeg_proc
+        if ffmpeg_proc is not None:
+            try:
+                if ffmpeg_proc.poll() is None:
+                    ffmpeg_proc.terminate()
+            except Exception:
+                pass
+    
+    def fingerprint(self) -> str:
+        """Fingerprint of the audio file (computed once per run), used as cache key"""
+        if not self.audio_fingerprint:
+            self.audio_fingerprint = utils.file_fingerprint(self.audio_file)
+        return self.audio_fingerprint
+
+    def prepared_mb(self) -> float:
+        """Memory held by the audio the pipeline has prepared for this job in MB (see release_prepared())"""
+        prepared = self.prepared
+        if prepared is None:
+            return 0.0
+        audio = prepared.get('audio')
+        if audio is None and prepared.get('shared_audio') is not None:
+            audio = prepared['shared_audio'].array
+        return audio.nbytes / (1024 * 1024) if audio is not None else 0.0
+
+    def release_prepared(self):
+        """Free the audio prepared by the pipeline if the job does not use it"""
+        prepared, self.prepared = self.prepared, None
+        if prepared is None:
+            return
+        if prepared.get('shared_audio') is not None:
+            prepared['shared_audio'].release()
+        prepared['tmpdir'].cleanup()
+    
+    def needed_word_alignment(self) -> str:
+        """Derive the timestamp precision the job's output needs:
+        'word': word level alignment (costly), gives exact segment boundaries for
+                speaker attribution and subtitle cues
+        'segment': segment timestamps as predicted by Whisper
+        'off': no timestamps at all (plain text without timing information)"""
+        if self.speaker_detection != 'none' or self.file_ext == 'vtt':
+            return 'word'
+        if self.file_ext == 'txt' and not self.timestamps and self.pause == 0:
+            return 'off'
+        return 'segment'
+
+    def set_running(self):
+        """Mark job as running and record start time"""
+        self.started_at = datetime.datetime.now()
+        self.status = JobStatus.AUDIO_CONVERSION
+    
+    def set_finished(self):
+        """Mark job as finished and record completion time"""
+        self.finished_at = datetime.datetime.now()
+        self.status = JobStatus.FINISHED
+    
+    def set_error(self, error_message: str, error_tb: str = ''):
+        """Mark job as failed and store error message"""
+        self.error_message = error_message
+        self.error_tb = error_tb
+        self.finished_at = datetime.datetime.now()
+        self.status = JobStatus.ERROR
+
+    def set_canceled(self, message: Optional[str] = None):
+        """Mark job as canceled by the user"""
+        self.error_message = message
+        self.finished_at = datetime.datetime.now()
+        self.status = JobStatus.CANCELED
+    
+    def get_duration(self) -> Optional[datetime.timedelta]:
+        """Get processing duration if job is completed"""
+        if self.started_at and self.finished_at:
+            return self.finished_at - self.started_at
+        return None
+
+    def format_summary(self) -> str:
+        """Build a concise, multi-line summary for tooltips.
+
+        Uses localized UI labels where available and simple symbols for booleans.
+        """
+        lines = []
+
+        def yn(v: bool) -> str:
+            return '✓' if bool(v) else '✗'
+
+        # Output file (show basename and format)
+        try:
+            out_name = os.path.basename(self.transcript_file) if self.transcript_file else ''
+            lines.append(f"{t('job_tt_transcript_file')} {out_name}")
+        except Exception:
+            pass
+
+        # Time range
+        try:
+            start_ms = getattr(self, 'start', 0) or 0
+            stop_ms = getattr(self, 'stop', 0) or 0
+            start_txt = utils.ms_to_str(start_ms) if start_ms > 0 else '00:00:00'
+            stop_txt = utils.ms_to_str(stop_ms) if stop_ms > 0 else 'end'
+            lines.append(f"{t('label_start')} {start_txt}")
+            lines.append(f"{t('label_stop')} {stop_txt}")
+        except Exception:
+            pass
+
+        # Language
+        try:
+            lines.append(f"{t('label_language')} {self.language_name}")
+        except Exception:
+            pass
+
+        # Decoding profile
+        try:
+            lines.append(f"{t('label_decoding_profile')} {self.decoding_profile}")
+        except Exception:
+            pass
+
+        # Model (display basename if a path)
+        try:
+            model_disp = os.path.basename(self.whisper_model) if self.whisper_model else ''
+            if not model_disp:
+                model_disp = str(self.whisper_model)
+            lines.append(f"{t('label_whisper_model')} {model_disp}")
+        except Exception:
+            pass
+
+        # Pause threshold (map int index back to label)
+        try:
+            pause_opts = ['none', '1sec+', '2sec+', '3sec+']
+            pause_disp = pause_opts[self.pause] if isinstance(self.pause, int) and 0 <= self.pause < len(pause_opts) else str(self.pause)
+            lines.append(f"{t('label_pause')} {pause_disp}")
+        except Exception:
+            pass
+
+        # Speaker detection
+        try:
+            lines.append(f"{t('label_speaker')} {self.speaker_detection}")
+        except Exception:
+            pass
+
+        # Overlapping speech
+        try:
+            lines.append(f"{t('label_overlapping')} {yn(self.overlapping)}")
+        except Exception:
+            pass
+
+        # Disfluencies
+        try:
+            lines.append(f"{t('label_disfluencies')} {yn(self.disfluencies)}")
+        except Exception:
+            pass
+
+        # Timestamps
+        try:
+            lines.append(f"{t('label_timestamps')} {yn(self.timestamps)}")
+        except Exception:
+            pass
+
+        return "\n".join([ln for ln in lines if ln])
+    
+class TranscriptionQueue:
+    """Manages a queue of transcription jobs"""
+    
+    def __init__(self, store: Optional[JobStore] = None):
+        self.jobs: List[TranscriptionJob] = []
+        self.current_job: Optional[TranscriptionJob] = None  # Track currently running job
+        self.store: Optional[JobStore] = store  # keeps the queue on disk, see restore()
+    
+    def add_job(self, job: TranscriptionJob):
+        """Add a job to the queue"""
+        self.jobs.append(job)
+        if self.store is not None:
+            job.store = self.store
+            job.save()
+
+    def remove_job(self, job: TranscriptionJob):
+        """Remove a job from the queue (ValueError if it is not in the queue)"""
+        self.jobs.remove(job)
+        if job.store is not None:
+            job.store = None
+            try:
+                self.store.remove(job.id)
+            except Exception as e:
+                logging.warning(f'Cannot save the job queue: {e}')
+
+    def restore(self, history_days: float = 0) -> int:
+        """Load the jobs of an earlier session from the store. Jobs that were running
+        when the app was closed or crashed are waiting again (and resume from their
+        segment journal), finished jobs older than `history_days` (if > 0) are dropped.
+        Returns the number of repeated jobs."""
+        interrupted = [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION]
+        repeated = self.store.recover([s.value for s in interrupted], JobStatus.WAITING.value)
+        self.store.recover([JobStatus.CANCELING.value], JobStatus.CANCELED.value)
+        if history_days > 0:
+            done = [JobStatus.FINISHED, JobStatus.ERROR, JobStatus.CANCELED]
+            self.store.prune([s.value for s in done], history_days)
+        for job_id, status, data in self.store.load():
+            try:
+                job = TranscriptionJob.from_dict(job_id, status, data)
+            except (ValueError, TypeError) as e:
+                logging.warning(f'Cannot restore job {job_id}: {e}')
+                continue
+            job.store = self.store
+            self.jobs.append(job)
+        return repeated
+
+    def detach_store(self):
+        """Stop writing to the store, e.g. when the app is closed: the jobs that are
+        canceled now are kept as they are and repeated on the next start."""
+        store, self.store = self.store, None
+        for job in self.jobs:
+            job.store = None
+        if store is not None:
+            store.close()
+    
+    def get_waiting_jobs(self) -> List[TranscriptionJob]:
+        """Get all jobs with WAITING status"""
+        return [job for job in self.jobs if job.status == JobStatus.WAITING]
+    
+    def get_running_jobs(self) -> List[TranscriptionJob]:
+        """Get all jobs currently being processed"""
+        return [job for job in self.jobs if job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION, JobStatus.CANCELING]]
+    
+    def get_finished_jobs(self) -> List[TranscriptionJob]:
+        """Get all successfully completed jobs"""
+        return [job for job in self.jobs if job.status == JobStatus.FINISHED]
+    
+    def get_failed_jobs(self) -> List[TranscriptionJob]:
+        """Get all jobs that encountered errors"""
+        return [job for job in self.jobs if job.status == JobStatus.ERROR]
+
+    def get_canceled_jobs(self) -> List[TranscriptionJob]:
+        """Get all jobs that were canceled by the user"""
+        return [job for job in self.jobs if job.status == JobStatus.CANCELED]
+    
+    def has_pending_jobs(self) -> bool:
+        """Check if there are jobs waiting to be processed"""
+        return len(self.get_waiting_jobs()) > 0
+    
+    def is_running(self) -> bool:
+        """Check if any job are currently beeing processed"""
+        return len(self.get_running_jobs()) > 0
+    
+    def get_next_waiting_job(self) -> Optional[TranscriptionJob]:
+        """Get the next job to process"""
+        waiting_jobs = self.get_waiting_jobs()
+        return waiting_jobs[0] if waiting_jobs else None
+    
+    def get_queue_summary(self) -> dict:
+        """Get summary statistics of the queue"""
+        return {
+            'total': len(self.jobs),
+            'waiting': len(self.get_waiting_jobs()),
+            'running': len(self.get_running_jobs()),
+            'finished': len(self.get_finished_jobs()),
+            'errors': len(self.get_failed_jobs()),
+            'canceled': len(self.get_canceled_jobs()),
+        }
+    
+    def is_empty(self) -> bool:
+        """Check if queue is empty"""
+        return len(self.jobs) == 0
+    
+    def has_output_conflict(self, transcript_file: str, ignore_job: Optional[TranscriptionJob] = None) -> bool:
+        """Check if another queue job uses the same output file.
+        Ignores jobs in ERROR, CANCELING, CANCELED and optionally a given job."""
+        try:
+            target = os.path.abspath(transcript_file)
+        except Exception:
+            return False
+        try:
+            for j in self.jobs:
+                try:
+                    if not j or j is ignore_job:
+                        continue
+                    tf = getattr(j, 'transcript_file', None)
+                    if not tf:
+                        continue
+                    if os.path.abspath(tf) == target and j.status not in [JobStatus.ERROR, JobStatus.CANCELING, JobStatus.CANCELED]:
+                        return True
+                except Exception:
+                    continue
+        except Exception:
+            return False
+        return False
+
+
+def create_transcription_job(audio_file=None, transcript_file=None, start_time=None, stop_time=None,
+                           language_name=None, whisper_model_name=None, speaker_detection=None,
+                           overlapping=None, timestamps=None, disfluencies=None, pause=None,
+                           batch_size=None, parallel_workers=None, word_alignment=None,
+                           decoding_profile=None, cli_mode=False) -> TranscriptionJob:
+    """Create a TranscriptionJob with all default values
+    
+    This function handles both CLI and GUI job creation, ensuring all defaults
+    are consistent between both modes.
+    """
+    job = TranscriptionJob()
+    
+    # File paths
+    job.audio_file = audio_file or ''
+    job.transcript_file = transcript_file or ''
+    if job.transcript_file:
+        job.file_ext = os.path.splitext(job.transcript_file)[1][1:]
+    
+    # Time range
+    job.start = start_time if start_time is not None else 0
+    job.stop = stop_time if stop_time is not None else 0
+    
+    # Language - handle both language names and codes
+    if language_name:
+        if language_name in languages.values():
+            # Find language name by code
+            job.language_name = next(name for name, code in languages.items() if code == language_name)
+        elif language_name in languages.keys():
+            # Language name provided directly
+            job.language_name = language_name
+        else:
+            raise ValueError(f"Unknown language: {language_name}")
+    else:
+        job.language_name = 'Auto'
+    
+    # Model: a name (see find_whisper_models()) or the path of the model
+    job.whisper_model = whisper_model_name or 'precise'
+    if not os.path.isdir(job.whisper_model):
+        job.whisper_model = find_whisper_models().get(job.whisper_model, job.whisper_model)
+    
+    # Processing options with defaults
+    job.speaker_detection = speaker_detection if speaker_detection is not None else 'auto'
+    job.overlapping = overlapping if overlapping is not None else True
+    job.timestamps = timestamps if timestamps is not None else False
+    job.disfluencies = disfluencies if disfluencies is not None else True
+    
+    # Pause setting
+    if pause is not None:
+        if isinstance(pause, str):
+            pause_options = ['none', '1sec+', '2sec+', '3sec+']
+            if pause in pause_options:
+                job.pause = pause_options.index(pause)
+            else:
+                job.pause = 1  # default to '1sec+'
+        else:
+            job.pause = pause
+    else:
+        job.pause = 1  # default to '1sec+'
+    
+    # Decoding settings from the profile, explicit settings take precedence
+    job.decoding_profile = decoding_profile or get_config('decoding_profile', 'balanced')
+    profile = get_decoding_profile(job.decoding_profile)
+    job.whisper_beam_size = int(profile['beam_size'])
+    job.whisper_best_of = int(profile['best_of'])
+    temperature = profile['temperature']
+    job.whisper_temperature = [float(x) for x in temperature] if isinstance(temperature, (list, tuple)) else float(temperature)
+    # settings measured by --autotune for this model fill in what the profile leaves open
+    tuned = (config.get('whisper_autotune') or {}).get(os.path.basename(os.path.normpath(job.whisper_model))) or {}
+    compute_type = get_config('whisper_compute_type', 'default')
+    if compute_type == 'default':
+        compute_type = profile['compute_type']
+    if compute_type == 'default':
+        compute_type = tuned.get('compute_type', 'default')
+    job.whisper_compute_type = compute_type
+    job.whisper_threads = int(profile['threads']) or int(tuned.get('threads', 0)) or int(number_threads)
+    if batch_size is None:
+        batch_size = config.get('whisper_batch_size') or profile['batch_size']
+    try:
+        job.whisper_batch_size = max(int(batch_size), 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid batch size: {batch_size}")
+    if parallel_workers is None:
+        parallel_workers = get_config('whisper_parallel_workers', 0)
+    try:
+        job.whisper_parallel_workers = max(int(parallel_workers), 0)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid number of parallel workers: {parallel_workers}")
+    job.timestamp_interval = get_config('timestamp_interval', 60_000)
+    job.timestamp_color = get_config('timestamp_color', '#78909C')
+    job.pause_marker = get_config('pause_seconds_marker', '.')
+    job.auto_save = False if get_config('auto_save', 'True') == 'False' else True
+        
+    job.vad_threshold = float(get_config('voice_activity_detection_threshold', '0.5'))
+    
+    # Platform-specific XPU settings
+    """    
+    if platform.system() == "Darwin":  # MAC
+        xpu = get_config('pyannote_xpu', 'mps' if platform.mac_ver()[0] >= '12.3' else 'cpu')
+        job.pyannote_xpu = 'mps' if xpu == 'mps' else 'cpu'
+    elif platform.system() in ('Windows', 'Linux'):
+        try:
+            cuda_available = torch.cuda.is_available() and get_cuda_device_count() > 0
+        except:
+            cuda_available = False
+        xpu = get_config('pyannote_xpu', 'cuda' if cuda_available else 'cpu')
+        job.pyannote_xpu = 'cuda' if xpu == 'cuda' else 'cpu'
+        whisper_xpu = get_config('whisper_xpu', 'cuda' if cuda_available else 'cpu')
+        job.whisper_xpu = 'cuda' if whisper_xpu == 'cuda' else 'cpu'
+    else:
+        raise Exception('Platform not supported yet.')
+    """    
+    
+    # Check for invalid VTT options
+    if job.file_ext == 'vtt' and (job.pause > 0 or job.overlapping or job.timestamps):
+        if cli_mode:
+            print("Warning: VTT format doesn't support pause markers, overlapping speech, or timestamps. These options will be disabled.")
+        job.pause = 0
+        job.overlapping = False
+        job.timestamps = False
+
+    # Word alignment: 'auto' derives it from the output options above
+    if word_alignment is None:
+        word_alignment = get_config('word_alignment', 'auto')
+    if word_alignment == 'auto':
+        job.word_alignment = job.needed_word_alignment()
+    elif word_alignment in ('off', 'segment', 'word'):
+        job.word_alignment = word_alignment
+    else:
+        raise ValueError(f"Invalid word alignment: {word_alignment}")
+    
+    return job
+
+class WhisperInfo:
+    """Summary of a finished transcription, as reported by the Whisper worker"""
+    __slots__ = ("duration", "language")
+    def __init__(self, d):
+        self.duration = d.get('duration')
+        self.language = d.get('language')
+
+
+@dataclass
+class Segment:
+    """A transcribed segment as reported by the Engine (see Engine.transcribe())"""
+    start: float  # seconds in the audio file
+    end: float
+    text: str
+    speaker: str = ''  # e.g. 'S01', '//S02' for overlapping speech, '' without speaker detection
+    words: list = field(default_factory=list)  # dicts with 'start', 'end', 'word', 'probability'
+
+def find_whisper_models(log: Optional[Callable] = None) -> dict:
+    """ The installed Whisper models: name -> path. Bundled models in <app dir>/models, custom
+    ones in <config dir>/whisper_models. log(msg) is called for custom models that have the
+    same name as a bundled one (and are ignored). """
+    models = {}
+    for models_dir in (os.path.join(app_dir, 'models'), os.path.join(config_dir, 'whisper_models')):
+        if not os.path.isdir(models_dir):
+            continue
+        for entry in os.listdir(models_dir):
+            entry_path = os.path.join(models_dir, entry)
+            if os.path.isdir(entry_path):
+                if entry in models:
+                    if log is not None:
+                        log(t('err_invalid_model', entry))
+                else:
+                    models[entry] = entry_path
+    return models
+
+class EarlyTranscription:
+    """Transcribes the beginning of the audio while ffmpeg is still converting the rest
+    (streaming conversion, see Engine._read_conversion_stream).
+
+    feed() is called after the VAD of each block. It cuts the decoded audio after the last
+    finished speech chunk and passes the new part to the job's Whisper worker, one part at
+    a time (the audio decoded in the meantime goes into the next part). After the conversion,
+    finish() waits for the part in progress; the transcription step then takes over
+    `segments` and continues at sample `end`.
+    """
+
+    def __init__(self, engine: 'Engine', job: 'TranscriptionJob', tmp_audio_file: str,
+                 min_part_seconds: float = 60, sampling_rate: int = 16000):
+        self.engine = engine
+        self.job = job
+        self.tmp_audio_file = tmp_audio_file
+        self.sampling_rate = sampling_rate
+        self.min_part = int(min_part_seconds * sampling_rate)
+        self.segments = []  # with timestamps relative to the full audio
+        self.end = 0  # transcribed up to this sample
+        self.language = None  # detected in the first part (language 'Auto')
+        self.error = None
+        self._queued = 0  # passed on up to this sample
+        self._parts = pyqueue.Queue()
+        self._thread = None
+        self._stopped = False
+
+    def feed(self, pcm: bytearray, decoded: int, speech_chunks: list, min_gap: int):
+        """More audio has been decoded and passed through the VAD.
+        pcm: the audio decoded so far (s16le), decoded: its length in samples,
+        speech_chunks: the VAD result so far, min_gap: minimum pause between two chunks in samples."""
+        if self._stopped or self.error is not None or not self._parts.empty():
+            return
+        # The last chunk may still continue in the next block, cut only after finished ones
+        cut = None
+        for chunk in reversed(speech_chunks):
+            if chunk['end'] <= self._queued:
+                break
+            if chunk['end'] + min_gap <= decoded:
+                cut = chunk['end'] + min_gap // 2
+                break
+        if cut is None or cut - self._queued < self.min_part:
+            return
+        import numpy as np
+        audio = np.frombuffer(bytes(pcm[self._queued * 2:cut * 2]), dtype='<i2').astype(np.float32) / 32768.0
+        self._parts.put((self._queued, cut, audio, utils.clip_speech_chunks(speech_chunks, self._queued, cut)))
+        self._queued = cut
+        if self._thread is None:
+            self._thread = Thread(target=self._run, args=(self.engine.log_file,), daemon=True)
+            self._thread.start()
+
+    def _run(self, log_file):
+        engine, job = self.engine, self.job
+        engine.log_file = log_file
+        while True:
+            part = self._parts.get()
+            if part is None or self._stopped:
+                return
+            start, end, audio, chunks = part
+            segments = []
+            shared_audio = None
+            try:
+                from shared_audio import SharedAudio
+                shared_audio = SharedAudio(audio)
+                info = engine._run_whisper_subprocess_stream(self.tmp_audio_file, job, segments.append,
+                                                             shared_audio.descriptor, speech_chunks=chunks,
+                                                             language=self.language, quiet=True)
+            except Exception as e:
+                self.error = e
+                return
+            finally:
+                if shared_audio is not None:
+                    shared_audio.release()
+            if job.language_name == 'Auto' and self.language is None:
+                self.language = info.language
+            self.segments.extend(utils.shift_segment_times(seg, start / self.sampling_rate) for seg in segments)
+            self.end = end
+            engine.logn(f'Transcribed during the conversion up to '
+                        f'{utils.ms_to_str(job.start + end * 1000 // self.sampling_rate)}', where='file')
+
+    def finish(self):
+        """Take no more parts and wait for the one in progress."""
+        self._stopped = True
+        if self._thread is not None:
+            self._parts.put(None)
+            self._thread.join()
+
+
+class Engine:
+    """Runs transcription jobs without GUI: audio conversion, speaker identification,
+    transcription and rendering of the transcript. The jobs of `queue` are processed by
+    transcription_worker(), single jobs can be run with transcribe().
+
+    Clients are informed through callbacks (all optional, called from worker threads):
+      on_log(txt, tags, link, replace): a message for the user (printed to stdout without
+        callback), replace=True: the text replaces the last line of the log
+      on_progress(job, progress): see set_progress()
+      on_jobs_changed(): the status of a job has changed
+      on_segment(job, segment): a Segment has been transcribed
+    """
+
+    def __init__(self, queue: Optional[TranscriptionQueue] = None, on_log: Optional[Callable] = None,
+                 on_progress: Optional[Callable] = None, on_jobs_changed: Optional[Callable] = None,
+                 on_segment: Optional[Callable] = None):
+        self.queue = queue if queue is not None else TranscriptionQueue()
+        self.on_log = on_log
+        self.on_progress = on_progress
+        self.on_jobs_changed = on_jobs_changed
+        self.on_segment = on_segment
+        self._job_local = local() # per job thread state (log file)
+        self.cancel = False # if set to True, the whole queue will be canceled (single jobs: job.cancel_event)
+        self.jobs_processed = 0
+        self.last_finished_job = None
+        self._segment_listeners = {} # job -> function, see transcribe()
+        # Resident workers per scheduler slot (see TranscriptionJob.slot), created on first use
+        self._whisper_services = {} # slot -> resident Whisper worker
+        self._pyannote_services = {} # slot -> resident diarization worker
+        self._whisper_pools = {} # slot -> resident Whisper workers for parallel transcription of long files
+
+    @property
+    def log_file(self):
+        """ Log file of the job running in the current thread (None outside of jobs) """
+        return getattr(self._job_local, 'log_file', None)
+
+    @log_file.setter
+    def log_file(self, value):
+        self._job_local.log_file = value
+
+    def log(self, txt: str = '', tags: list = [], where: str = 'both', link: str = '', tb: str = '', replace: bool = False) -> None:
+        """ Log a message (where can be 'screen', 'file', or 'both'). 'screen' goes to on_log,
+        'file' to the log file of the job running in the current thread.
+        tb = formatted traceback of the error, only logged to file
+        """
+        if where != 'file':
+            if self.on_log is not None:
+                self.on_log(txt, tags, link, replace)
+            else:
+                print(f'\r{txt}' if replace else txt, end='')
+
+        # Handle file logging if requested
+        if where != 'screen' and self.log_file and not self.log_file.closed:
+            try:
+                if tags == 'error':
+                    txt = f'ERROR: {txt}'
+                if tb != '':
+                    txt = f'{txt}\nTraceback:\n{tb}' 
+                self.log_file.write(txt)
+                self.log_file.flush()
+            except Exception as e:
+                # If we get here, both screen and file logging failed
+                # As a last resort, print to stderr to not lose the error
+                print(f"Critical error - both screen and file logging failed: {str(e)}\nOriginal error: {txt}\nOriginal traceback:\n{tb}", file=sys.stderr)
+
+    def logn(self, txt: str = '', tags: list = [], where: str = 'both', link:str = '', tb: str = '') -> None:
+        """ Log with a newline appended """
+        self.log(f'{txt}\n', tags, where, link, tb)
+
+    def logr(self, txt: str = '', tags: list = [], where: str = 'both', link:str = '', tb: str = '') -> None:
+        """ Replace the last line of the log """
+        self.log(txt, tags, where, link, tb, replace=True)
+
+    def set_progress(self, step, value, speaker_detection='none', job=None):
+        """ Update the progress of a job (step 1: audio conversion, 2: speaker identification,
+        3: transcription, value: percent of the step) and report it to on_progress(job, progress):
+        job: the job whose progress (job.progress) has changed, or None
+        progress: average progress of all running jobs from 0 to 1, negative if nothing runs """
+        progr = -1
+        if step == 1:
+            progr = value * 0.05 / 100
+        elif step == 2:
+            progr = 0.05 # (step 1)
+            progr = progr + (value * 0.45 / 100)
+        elif step == 3:
+            if speaker_detection != 'none':
+                progr = 0.05 + 0.45 # (step 1 + step 2)
+                progr_factor = 0.5
+            else:
+                progr = 0.05 # (step 1)
+                progr_factor = 0.95
+            progr = progr + (value * progr_factor / 100)
+        if progr >= 1:
+            progr = 0.99 # whisper sometimes still needs some time to finish even if the progress is already at 100%. This can be confusing, so we never go above 99%...
+
+        running_jobs = self.queue.get_running_jobs()
+        if job is None and running_jobs:
+            job = running_jobs[0]
+
+        # Update progress of the job
+        if job is not None and progr >= 0:
+            if progr > 0 and abs(progr - job.progress) < 0.01:
+                # stop updating progress bars if the change is less than 1% (0.01)
+                return
+            job.progress = progr
+
+        # The overall progress is the average of all running jobs
+        overall = progr
+        if progr >= 0 and running_jobs:
+            overall = sum(j.progress for j in running_jobs) / len(running_jobs)
+        elif progr < 0 and job is not None:
+            others = [j for j in running_jobs if j is not job]
+            if others:
+                overall = sum(j.progress for j in others) / len(others)
+
+        if self.on_progress is not None:
+            self.on_progress(job if progr >= 0 else None, overall)
+
+    def _jobs_changed(self):
+        if self.on_jobs_changed is not None:
+            self.on_jobs_changed()
+
+    def _segment_done(self, job: TranscriptionJob, seg: dict, speaker: str):
+        """Report a segment that has been added to the transcript of `job`"""
+        listener = self._segment_listeners.get(job)
+        if listener is None and self.on_segment is None:
+            return
+        offset = job.start / 1000 # timestamps in the audio file, not the transcribed range
+        words = [dict(w, start=w['start'] + offset if w.get('start') is not None else None,
+                      end=w['end'] + offset if w.get('end') is not None else None)
+                 for w in seg.get('words') or []]
+        segment = Segment(seg['start'] + offset, seg['end'] + offset, seg['text'],
+                          speaker if job.speaker_detection != 'none' else '', words)
+        if listener is not None:
+            listener(segment)
+        if self.on_segment is not None:
+            self.on_segment(job, segment)
+
+    def stop_queue(self):
+        """Cancel the running jobs and all waiting ones"""
+        for job in self.queue.get_waiting_jobs():
+            job.set_canceled(t('err_user_cancelation'))
+        for job in self.queue.get_running_jobs():
+            if job.status != JobStatus.CANCELING:
+                job.status = JobStatus.CANCELING
+            job.request_cancel()
+        self.cancel = True
+        self._jobs_changed()
+
+    def transcribe(self, job: TranscriptionJob) -> Iterator[Segment]:
+        """Run a single job (outside of the queue, don't mix with transcription_worker())
+        and yield its segments while they are transcribed. The transcript is saved to
+        job.transcript_file as usual. Raises RuntimeError if the job fails or is canceled.
+        Closing the iterator early cancels the job."""
+        segments = pyqueue.Queue()
+        done = object()
+        self._segment_listeners[job] = segments.put
+
+        def run():
+            try:
+                job.cancel_event.clear()
+                job.set_running()
+                self._jobs_changed()
+                self._run_job(job)
+            finally:
+                segments.put(done)
+
+        thread = Thread(target=run, daemon=True)
+        thread.start()
+        try:
+            while True:
+                segment = segments.get()
+                if segment is done:
+                    break
+                yield segment
+        finally:
+            if thread.is_alive():
+                job.request_cancel()
+            thread.join()
+            self._segment_listeners.pop(job, None)
+        if job.status != JobStatus.FINISHED:
+            raise RuntimeError(job.error_message or t('err_user_cancelation'))
+
+    def transcription_worker(self, start_job_index=None, max_jobs=None):
+        """Process transcription jobs from the queue.
+        Up to max_jobs (default: 'max_parallel_jobs' in the config) jobs run at the same time, each in its own thread.
+        A job is only started while the estimated memory and the threads of all running jobs
+        fit into the budgets ('scheduler_memory_mb' and 'scheduler_cores' in the config).
+        Jobs are started in queue order. Returns when the queue is done.
+        Afterwards, jobs_processed and last_finished_job tell what has been transcribed."""
+        queue_start_time = datetime.datetime.now()
+        self.jobs_processed = 0
+        self.last_finished_job = None
+        self.cancel = False
+
+        try:
+            max_jobs = max(int(max_jobs or get_config('max_parallel_jobs', '1')), 1)
+        except ValueError:
+            max_jobs = 1
+        try:
+            core_budget = int(get_config('scheduler_cores', '0')) or os.cpu_count() or int(number_threads)
+        except ValueError:
+            core_budget = os.cpu_count() or int(number_threads)
+        try:
+            memory_budget = float(get_config('scheduler_memory_mb', '0')) or total_memory_mb() * 0.8
+        except ValueError:
+            memory_budget = total_memory_mb() * 0.8
+        pipeline = get_config('pipeline_jobs', 'True') == 'True'
+        stages = {'convert': None, 'diarize': None}  # pipeline stage -> thread
+
+        try:
+            # Log queue summary
+            self.logn()
+            self.logn(t('queue_start'), 'highlight')
+            pending = len(self.queue.get_waiting_jobs())
+            if pending > 0:
+                self.logn(t('queue_start_jobs', total=pending))
+            else:
+                self.logn(t('queue_none_waiting'))                
+
+            running = {}  # job -> thread
+            free_slots = list(range(max_jobs))
+            while True:
+                # Collect finished jobs
+                for running_job, thread in list(running.items()):
+                    if not thread.is_alive():
+                        del running[running_job]
+                        free_slots.append(running_job.slot)
+
+                # Prepare the next waiting jobs while others are running
+                if pipeline and running and not self.cancel:
+                    free_memory = memory_budget - self._memory_in_use(running) if memory_budget > 0 else None
+                    self._advance_pipeline(stages, diarize_slot=max_jobs, free_memory=free_memory)
+
+                # If global cancel was requested (via Stop button), cancel all waiting jobs
+                if self.cancel:
+                    for waiting_job in self.queue.get_waiting_jobs():
+                        waiting_job.set_canceled(t('err_user_cancelation'))
+                        self._jobs_changed()
+                    if not running:
+                        break
+                    time.sleep(0.2)
+                    continue
+
+                # Get next job
+                job = None
+                if start_job_index is not None and start_job_index < len(self.queue.jobs):
+                    job = self.queue.jobs[start_job_index]
+                    if job.status != JobStatus.WAITING:
+                        job = None
+                if job is None:
+                    job = self.queue.get_next_waiting_job()
+                if job is None:
+                    if not running:
+                        break
+                    time.sleep(0.2)
+                    continue
+
+                if not job.memory_mb:
+                    job.memory_mb = self._estimate_job_memory(job)
+                used_cores = sum(j.whisper_threads for j in running)
+                # the job's own prepared audio is part of its estimate
+                used_memory = self._memory_in_use(running) - job.prepared_mb()
+                fits = (not running) or (
+                    used_cores + job.whisper_threads <= core_budget
+                    and (memory_budget <= 0 or used_memory + job.memory_mb <= memory_budget))
+                if not (free_slots and fits):
+                    time.sleep(0.2)
+                    continue
+
+                # Start the job
+                start_job_index = None
+                job.slot = free_slots.pop(0)
+                job.cancel_event.clear()
+                job.set_running()
+                self._jobs_changed()
+                if running:
+                    self.logn(f'Starting job in parallel (slot {job.slot + 1}/{max_jobs}, '
+                              f'estimated memory {job.memory_mb:.0f} MB, {job.whisper_threads} threads)', where='file')
+                thread = Thread(target=self._run_job, args=(job,), daemon=True)
+                running[job] = thread
+                thread.start()
+            
+            # Log final summary
+            final_summary = self.queue.get_queue_summary()
+            self.logn()
+            self.logn(t('queue_complete'), 'highlight')
+            self.logn(t('total_jobs', total=final_summary['total']))
+            self.logn(t('completed', finished=final_summary['finished']))
+            self.logn(t('failed', errors=final_summary['errors']))
+            self.logn(t('canceled_summary', canceled=final_summary['canceled']))
+            
+            # Log total processing time
+            total_time = datetime.datetime.now() - queue_start_time
+            total_seconds = "{:02d}".format(int(total_time.total_seconds() % 60))
+            total_time_str = f'{int(total_time.total_seconds() // 60)}:{total_seconds}'
+            self.logn(t('processing_time', total_time_str=total_time_str))
+            
+        except Exception as e:
+            self.logn(f"Queue processing error: {str(e)}", 'error')
+            traceback_str = traceback.format_exc()
+            self.logn(f"Queue error details: {traceback_str}", where='file')
+        
+        finally:
+            # Drop what the pipeline has prepared for jobs that did not run
+            for thread in stages.values():
+                if thread is not None:
+                    thread.join()
+            for waiting_job in self.queue.jobs:
+                waiting_job.release_prepared()
+                waiting_job.pipeline_stages = set()
+            # Hide progress
+            self.set_progress(0, 0)
+
+    def _run_job(self, job: TranscriptionJob):
+        """Thread target of a single job started by transcription_worker()"""
+        try:
+            self.logn()
+            self.logn(t('start_job', audio_file=os.path.basename(job.audio_file)), 'highlight')
+
+            # Process single job
+            self._process_single_job(job)
+            
+            job.set_finished()
+            self.jobs_processed += 1
+            self.last_finished_job = job
+            self._jobs_changed()
+            
+        except Exception as e:
+            # Distinguish cancellation from real errors
+            error_msg = job.error_message or str(e)
+            if str(e) == t('err_user_cancelation') or self._job_canceled(job):
+                job.set_canceled(t('err_user_cancelation'))
+            else:
+                job.set_error(error_msg)
+            self._jobs_changed()
+            self.logn(error_msg, 'error')
+            traceback_str = job.error_tb or traceback.format_exc()
+            self.logn(f"Job error details: {traceback_str}", where='file')
+            print(f"Job error details: {traceback_str}")
+
+    def _memory_in_use(self, running) -> float:
+        """Estimated memory of the running jobs plus the audio prepared for waiting ones in MB"""
+        return sum(j.memory_mb for j in running) + sum(j.prepared_mb() for j in self.queue.get_waiting_jobs())
+
+    def _advance_pipeline(self, stages: dict, diarize_slot: int, free_memory: Optional[float] = None):
+        """Run the queue as a staged pipeline: while Whisper works on the running jobs, the
+        audio of the next two waiting jobs is converted and the speakers of the next one are
+        identified in advance. Each stage works on one job at a time, so ffmpeg, pyannote and
+        Whisper (which use different resources) can work on different jobs at the same time.
+        Jobs take over the results when they are started (see _process_single_job()).
+        diarize_slot: scheduler slot of the resident pyannote worker used by the pipeline.
+        free_memory: MB left in the scheduler's memory budget (None: no budget). Audio is
+        only converted in advance if it fits."""
+        for name, thread in stages.items():
+            if thread is not None and not thread.is_alive():
+                stages[name] = None
+        waiting = self.queue.get_waiting_jobs()[:2]
+
+        if stages['convert'] is None:
+            for job in waiting:
+                if 'convert' not in job.pipeline_stages:
+                    if free_memory is not None and self._job_duration(job) * 16000 * 4 / (1024 * 1024) > free_memory:
+                        break  # keep the order, try again when memory has been freed
+                    job.pipeline_stages.add('convert')
+                    job.stage_thread = Thread(target=self._pipeline_convert, args=(job,), daemon=True)
+                    stages['convert'] = job.stage_thread
+                    job.stage_thread.start()
+                    break
+
+        if stages['diarize'] is None:
+            for job in waiting:
+                if job.speaker_detection != 'none' and job.prepared is not None \
+                        and 'diarize' not in job.pipeline_stages \
+                        and (job.stage_thread is None or not job.stage_thread.is_alive()):
+                    job.pipeline_stages.add('diarize')
+                    job.stage_thread = Thread(target=self._pipeline_diarize, args=(job, diarize_slot), daemon=True)
+                    stages['diarize'] = job.stage_thread
+                    job.stage_thread.start()
+                    break
+
+    def _pipeline_job_dropped(self, job: TranscriptionJob) -> bool:
+        """True if a job has been canceled or removed from the queue while the pipeline prepared it"""
+        return self._job_canceled(job) or job not in self.queue.jobs \
+            or job.status in (JobStatus.CANCELED, JobStatus.CANCELING)
+
+    def _pipeline_convert(self, job: TranscriptionJob):
+        """Pipeline stage: convert the audio of a waiting job (see _advance_pipeline())"""
+        self.log_file = io.StringIO()  # written to the job's log file when the job starts
+        tmpdir = TemporaryDirectory('noScribe')
+        shared_audio = None
+        try:
+            self.logn(f'Converting the audio in the pipeline ({os.path.basename(job.audio_file)}).', where='file')
+            audio, speech_chunks, shared_audio = self._prepare_audio(
+                job, os.path.join(tmpdir.name, 'tmp_audio.wav'), self._vad_options(job))
+        except Exception:
+            # the job converts the audio again when it is started (and reports errors then)
+            if shared_audio is not None:
+                shared_audio.release()
+            tmpdir.cleanup()
+            return
+        job.prepared = {
+            'tmpdir': tmpdir,
+            'audio': audio,
+            'speech_chunks': speech_chunks,
+            'shared_audio': shared_audio,
+            'diarization': None,
+            'log': self.log_file.getvalue(),
+        }
+        if self._pipeline_job_dropped(job):
+            job.release_prepared()
+
+    def _pipeline_diarize(self, job: TranscriptionJob, slot: int):
+        """Pipeline stage: identify the speakers of a waiting job whose audio has been
+        converted already (see _advance_pipeline())"""
+        prepared = job.prepared
+        self.log_file = io.StringIO()
+        shared_audio = prepared['shared_audio']
+        try:
+            prepared['diarization'] = self._run_diarize_subprocess(
+                os.path.join(prepared['tmpdir'].name, 'tmp_audio.wav'), job,
+                shared_audio.descriptor if shared_audio is not None else None,
+                num_threads=max(1, (os.cpu_count() or int(number_threads)) // 3),
+                in_background=True, slot=slot)
+        except Exception as e:
+            # the job runs the diarization again when it is started (and reports errors then)
+            if not self._job_canceled(job):
+                self.logn(f'Pipeline: cannot identify the speakers in advance: {e}', where='file')
+        prepared['log'] += self.log_file.getvalue()
+        if self._pipeline_job_dropped(job):
+            job.release_prepared()
+
+    def _job_canceled(self, job: TranscriptionJob) -> bool:
+        """True if this job or the whole queue has been canceled"""
+        return self.cancel or job.cancel_event.is_set()
+
+    def _job_duration(self, job: TranscriptionJob) -> float:
+        """Length of the part of the audio the job transcribes in seconds (probed once)"""
+        if not job.duration:
+            duration = probe_duration(job.audio_file)
+            if job.start > 0:
+                duration = max(duration - job.start / 1000, 0)
+            if job.stop > 0:
+                duration = min(duration, (job.stop - job.start) / 1000)
+            job.duration = duration
+        return job.duration
+
+    def _estimate_job_memory(self, job: TranscriptionJob) -> float:
+        """Estimate the peak memory need of a job in MB (for the scheduler)"""
+        from whisper_mp_worker import model_size_mb
+        return utils.estimate_job_memory_mb(model_size_mb(job.whisper_model), self._job_duration(job),
+                                            job.speaker_detection != 'none', job.whisper_parallel_workers)
+
+    def _process_single_job(self, job: TranscriptionJob):
+        """Process a single transcription job"""
+        proc_start_time = datetime.datetime.now()
+        
+        # Take over what the pipeline has prepared for this job (wait if it is still at work)
+        if job.stage_thread is not None:
+            job.stage_thread.join()
+            job.stage_thread = None
+        prepared, job.prepared = job.prepared, None
+        job.pipeline_stages = set()
+
+        if prepared is not None:
+            tmpdir, shared_audio = prepared['tmpdir'], prepared['shared_audio']
+        else:
+            tmpdir, shared_audio = TemporaryDirectory('noScribe'), None
+        tmp_audio_file = os.path.join(tmpdir.name, 'tmp_audio.wav')
+        orig_transcript_file = job.transcript_file
+
+        try:
+            # Create log file
+            if not os.path.exists(f'{config_dir}/log'):
+                os.makedirs(f'{config_dir}/log')
+            self.log_file = open(f'{config_dir}/log/{Path(job.transcript_file).stem}.log', 'w', encoding="utf-8")
+            if prepared is not None:
+                self.log_file.write(prepared['log'])
+
+            # Log job configuration
+            self.logn(f'decoding profile: {job.decoding_profile}', where='file')
+            self.logn(f'whisper beam size: {job.whisper_beam_size}', where='file')
+            self.logn(f'whisper best of: {job.whisper_best_of}', where='file')
+            self.logn(f'whisper temperature: {job.whisper_temperature}', where='file')
+            self.logn(f'whisper compute type: {job.whisper_compute_type}', where='file')
+            self.logn(f'whisper threads: {job.whisper_threads}', where='file')
+            self.logn(f'whisper batch size: {job.whisper_batch_size}', where='file')
+            self.logn(f'whisper parallel workers: {job.whisper_parallel_workers}', where='file')
+            self.logn(f'word alignment: {job.word_alignment}', where='file')
+            self.logn(f'timestamp_interval: {job.timestamp_interval}', where='file')
+            self.logn(f'timestamp_color: {job.timestamp_color}', where='file')
+
+            # Log CPU capabilities
+            self.logn("=== CPU FEATURES ===", where="file")
+            if platform.system() == 'Windows':
+                self.logn("System: Windows", where="file")
+                for key, value in cpufeature.CPUFeature.items():
+                    self.logn('    {:24}: {}'.format(key, value), where="file")
+            elif platform.system() == "Darwin": # = MAC
+                self.logn(f"System: MAC {platform.machine()}", where="file")
+                """
+                if platform.mac_ver()[0] >= '12.3': # MPS needs macOS 12.3+
+                    if job.pyannote_xpu == 'mps':
+                        self.logn("macOS version >= 12.3:\nUsing MPS (with PYTORCH_ENABLE_MPS_FALLBACK enabled)", where="file")
+                    elif job.pyannote_xpu == 'cpu':
+                        self.logn("macOS version >= 12.3:\nUser selected to use CPU (results will be better, but you might wanna make yourself a coffee)", where="file")
+                    else:
+                        self.logn("macOS version >= 12.3:\nInvalid option for 'pyannote_xpu' in config.yml (should be 'mps' or 'cpu')\nYou might wanna change this\nUsing MPS anyway (with PYTORCH_ENABLE_MPS_FALLBACK enabled)", where="file")
+                else:
+                    self.logn("macOS version < 12.3:\nMPS not available: Using CPU\nPerformance might be poor\nConsider updating macOS, if possible", where="file")
+                """
+            try:
+
+                #-------------------------------------------------------
+                # 1) Convert Audio
+
+                # Transcribed before with the same model and options?
+                store, store_key, stored = None, None, None
+                try:
+                    store = open_segment_store()
+                    if store is not None:
+                        store_key = segment_store_key(job)
+                        stored = store.get(store_key, job.word_alignment)
+                except Exception as e:
+                    self.logn(f'Cannot read the segment store: {e}', where='file')
+                    store = None
+
+                # Interrupted before? Then keep the journaled segments and transcribe only the rest.
+                journal, journaled = None, []
+                if stored is None:
+                    try:
+                        journal_cache = open_cache('journal')
+                        if journal_cache is not None:
+                            journal_key = store_key or segment_store_key(job)
+                            journal_cache.evict(keep=journal_key)
+                            journal = SegmentJournal(journal_cache.path(journal_key),
+                                                     {'key': journal_key, 'word_alignment': job.word_alignment})
+                            journaled = journal.read()
+                            journal.open(journaled)
+                    except Exception as e:
+                        self.logn(f'Cannot open the segment journal: {e}', where='file')
+                        journal, journaled = None, []
+
+                try:
+                    parallel_min_duration = float(get_config('whisper_parallel_min_minutes', 30)) * 60
+                except ValueError:
+                    parallel_min_duration = 30 * 60
+
+                # Streaming conversion: start transcribing while ffmpeg is still decoding the rest
+                early = None
+                if (prepared is None and stored is None and not journaled
+                        and get_config('early_transcription', 'True') == 'True'
+                        and get_config('share_decoded_audio', 'True') == 'True'
+                        and not (job.whisper_parallel_workers > 1
+                                 and self._job_duration(job) >= parallel_min_duration)):
+                    early = EarlyTranscription(self, job, tmp_audio_file)
+
+                # VAD settings (speech_chunks are used for pause adjustment and by the workers)
+                vad_parameters = self._vad_options(job)
+
+                sampling_rate = 16000
+                audio = None
+                speech_chunks = None
+                try:
+                    self.logn()
+                    self.logn(t('start_audio_conversion'), 'highlight')
+
+                    if prepared is not None:
+                        # converted by the pipeline while the previous job was running
+                        audio, speech_chunks, shared_audio = prepared['audio'], prepared['speech_chunks'], prepared['shared_audio']
+                        self.logn('Audio has already been converted in the pipeline.', where='file')
+                    else:
+                        try:
+                            audio, speech_chunks, shared_audio = self._prepare_audio(job, tmp_audio_file,
+                                                                                     vad_parameters, early)
+                        finally:
+                            if early is not None:
+                                early.finish()
+                        if early is not None and early.error is not None and not self._job_canceled(job):
+                            self.logn(f'Transcription during the conversion failed: {early.error}', where='file')
+                    self.logn(t('audio_conversion_finished'))
+                    self.set_progress(1, 100, job.speaker_detection, job=job)
+                except Exception as e:
+                    traceback_str = traceback.format_exc()
+                    if journal is not None:
+                        journal.close()
+                    # Distinguish cancel vs. real error during audio conversion
+                    if str(e) == t('err_user_cancelation') or self._job_canceled(job):
+                        job.set_canceled(t('err_user_cancelation'))
+                        self._jobs_changed()
+                        raise Exception(t('err_user_cancelation'))
+                    else:
+                        job.set_error(f"{t('err_converting_audio')}: {e}", traceback_str)
+                        self._jobs_changed()
+                        raise Exception(job.error_message)
+
+                duration = audio.shape[0] / sampling_rate
+                shared_audio_desc = shared_audio.descriptor if shared_audio is not None else None
+
+                #-------------------------------------------------------
+                # 2) Speaker identification (diarization) with pyannote
+
+                # Helper Functions:
+
+                def log_diarization():
+                    # write segments to log file
+                    for segment in diarization:
+                        line = f'{utils.ms_to_str(job.start + segment["start"], include_ms=True)} - {utils.ms_to_str(job.start + segment["end"], include_ms=True)} {segment["label"]}'
+                        self.logn(line, where='file')
+
+                def diarization_failed(e, traceback_str):
+                    if str(e) == t('err_user_cancelation') or self._job_canceled(job):
+                        job.set_canceled(t('err_user_cancelation'))
+                        self._jobs_changed()
+                        raise Exception(t('err_user_cancelation'))
+                    else:
+                        job.set_error(f"{t('err_identifying_speakers')}: {e}", traceback_str)
+                        self._jobs_changed()
+                        raise Exception(job.error_message)
+
+                # Start Diarization:
+
+                diarization = []
+                diarization_thread = None  # diarization running alongside the transcription
+                whisper_threads = job.whisper_threads  # less if the diarization runs at the same time
+                diarization_result = {}
+                diarization_abort = Event()
+                known_speakers = None  # identified by the pipeline or cached from an earlier run
+                if job.speaker_detection != 'none':
+                    if prepared is not None and prepared['diarization'] is not None:
+                        self.logn('Speakers have already been identified in the pipeline.', where='file')
+                        known_speakers = prepared['diarization']
+                    elif stored is not None and str(job.speaker_detection) in stored['diarization']:
+                        known_speakers = stored['diarization'][str(job.speaker_detection)]
+                    else:
+                        known_speakers = self._cached_diarization(job)[2]
+                if known_speakers is not None:
+                    self.logn()
+                    self.logn(t('start_identifiying_speakers'), 'highlight')
+                    diarization = known_speakers
+                    log_diarization()
+                    self.logn()
+                    self.set_progress(2, 100, job.speaker_detection, job=job)
+
+                elif job.speaker_detection != 'none' and get_config('concurrent_diarization', 'True') == 'True':
+                    # Run pyannote and whisper at the same time and split the cores between them.
+                    # The transcript segments are buffered until the speakers are known.
+                    self.logn()
+                    self.logn(t('start_identifiying_speakers'), 'highlight')
+                    self.logn(t('loading_pyannote'))
+                    # (the job keeps its whole budget, the scheduler counts it for both)
+                    pyannote_threads = max(1, job.whisper_threads // 3)
+                    whisper_threads = max(1, job.whisper_threads - pyannote_threads)
+                    self.logn(f'Concurrent diarization, threads: pyannote {pyannote_threads}, '
+                              f'whisper {whisper_threads}', where='file')
+
+                    log_file = self.log_file
+
+                    def diarize_in_background():
+                        self.log_file = log_file
+                        try:
+                            diarization_result['segments'] = self._run_diarize_subprocess(
+                                tmp_audio_file, job, shared_audio_desc, num_threads=pyannote_threads, in_background=True,
+                                abort=diarization_abort)
+                        except Exception as e:
+                            diarization_result['error'] = e
+                            diarization_result['trace'] = traceback.format_exc()
+
+                    diarization_thread = Thread(target=diarize_in_background, daemon=True)
+                    diarization_thread.start()
+
+                elif job.speaker_detection != 'none':
+                    try:
+                        job.status = JobStatus.SPEAKER_IDENTIFICATION
+                        self._jobs_changed()
+
+                        self.logn()
+                        self.logn(t('start_identifiying_speakers'), 'highlight')
+                        self.logn(t('loading_pyannote'))
+                        # self.set_progress(1, 100, job.speaker_detection)
+
+                        diarization = self._run_diarize_subprocess(tmp_audio_file, job, shared_audio_desc)
+                        log_diarization()
+                        self.logn()
+
+                    except Exception as e:
+                        diarization_failed(e, traceback.format_exc())
+
+                #-------------------------------------------------------
+                # 3) Transcribe with faster-whisper
+
+                job.status = JobStatus.TRANSCRIPTION
+                self._jobs_changed()
+
+                self.logn()
+                self.logn(t('start_transcription'), 'highlight')
+                self.logn(t('loading_whisper'))
+
+                # VAD data for pause adjustment, usually already computed during the conversion
+                if speech_chunks is None:
+                    from faster_whisper.vad import get_speech_timestamps
+                    speech_chunks = get_speech_timestamps(audio, vad_parameters)
+
+                # The transcript document (and what is shown in the log while it grows)
+                renderer = TranscriptRenderer(job, diarization, speech_chunks, duration, sampling_rate,
+                                              log=self.log, logn=self.logn)
+                save_doc = renderer.save
+
+                def on_segment(seg):
+                    renderer.diarization = diarization
+                    renderer.add_segment(seg)
+                    self._segment_done(job, seg, renderer.speaker)
+
+                    # auto save periodically
+                    if job.auto_save:
+                        if (datetime.datetime.now() - renderer.last_save).total_seconds() > 5:
+                            save_doc()
+                            job.has_partial_transcript = True
+
+                    # per-segment progress based on total duration
+                    try:
+                        progr = round((seg['end']/duration) * 100)
+                        self.set_progress(3, progr, job.speaker_detection, job=job)
+                    except Exception:
+                        pass
+                
+                pending_segments = []  # transcribed while the diarization is still running
+                preview = None  # autosaved transcript of pending_segments, without speaker labels
+
+                def finish_diarization():
+                    # wait for the background diarization, then render the buffered segments
+                    nonlocal diarization, diarization_thread
+                    if diarization_thread is None:
+                        return
+                    while diarization_thread.is_alive():
+                        diarization_thread.join(timeout=0.1)
+                    diarization_thread = None
+                    if 'error' in diarization_result:
+                        diarization_failed(diarization_result['error'], diarization_result.get('trace', ''))
+                    diarization = diarization_result.get('segments', [])
+                    log_diarization()
+                    self.logn(f'Speakers identified, rendering {len(pending_segments)} buffered segments.', where='file')
+                    for seg in pending_segments:
+                        on_segment(seg)
+                    pending_segments.clear()
+
+                transcribed_segments = []  # raw segments, for the segment store
+
+                def on_transcribed_segment(seg, replayed=False):
+                    nonlocal preview
+                    transcribed_segments.append(seg)
+                    if journal is not None and not replayed:
+                        journal.append(seg)
+                    if diarization_thread is not None:
+                        if diarization_thread.is_alive() or self._job_canceled(job):
+                            pending_segments.append(seg)
+                            if job.auto_save:
+                                # the speakers are not known yet, auto save the text without them
+                                if preview is None:
+                                    preview = TranscriptRenderer(job, [], speech_chunks, duration, sampling_rate)
+                                preview.add_segment(seg)
+                                if (datetime.datetime.now() - preview.last_save).total_seconds() > 5:
+                                    preview.save()
+                                    job.has_partial_transcript = True
+                            try:
+                                self.set_progress(3, round((seg['end'] / duration) * 100), job.speaker_detection, job=job)
+                            except Exception:
+                                pass
+                            return
+                        finish_diarization()
+                    on_segment(seg)
+
+                try:
+                    # The worker reuses our VAD result instead of running Silero again
+                    if stored is not None:
+                        # same audio, model and options as an earlier run: only render it again
+                        self.logn('Using the stored transcription of an earlier run (same audio, model and options).')
+                        for seg in stored['segments']:
+                            if self._job_canceled(job):
+                                raise Exception(t('err_user_cancelation'))
+                            on_transcribed_segment(seg)
+                    elif journaled or (early is not None and early.end > 0):
+                        if journaled:
+                            # interrupted run: continue after the last journaled segment
+                            resume_sample = min(int(journaled[-1]['end'] * sampling_rate), audio.shape[0])
+                            self.logn(f'Resuming the interrupted transcription at {utils.ms_to_str(job.start + resume_sample * 1000 // sampling_rate)}.')
+                            done_segments, replayed, language = journaled, True, None
+                        else:
+                            # the beginning was transcribed during the conversion: continue after it
+                            resume_sample = min(early.end, audio.shape[0])
+                            done_segments, replayed, language = early.segments, False, early.language
+                        for seg in done_segments:
+                            if self._job_canceled(job):
+                                raise Exception(t('err_user_cancelation'))
+                            on_transcribed_segment(seg, replayed=replayed)
+                        rest_chunks = None
+                        if speech_chunks is not None:
+                            rest_chunks = utils.clip_speech_chunks(speech_chunks, resume_sample, audio.shape[0])
+                        if rest_chunks != [] and resume_sample < audio.shape[0]:
+                            self._run_whisper_subprocess_stream(tmp_audio_file, job, on_transcribed_segment,
+                                                                shared_audio_desc, speech_chunks=rest_chunks,
+                                                                audio_range=(resume_sample, audio.shape[0]),
+                                                                threads=whisper_threads, language=language)
+                    elif speech_chunks == []:
+                        # the VAD found no speech, no need to load the model
+                        self.logn('No speech found in the audio.')
+                    elif job.whisper_parallel_workers > 1 and speech_chunks and duration >= parallel_min_duration:
+                        # long recording: transcribe parts in parallel processes
+                        self._run_whisper_parallel(tmp_audio_file, job, on_transcribed_segment, shared_audio_desc,
+                                                   speech_chunks, audio.shape[0], threads=whisper_threads)
+                    else:
+                        self._run_whisper_subprocess_stream(tmp_audio_file, job, on_transcribed_segment,
+                                                            shared_audio_desc, speech_chunks=speech_chunks,
+                                                            threads=whisper_threads)
+                    if diarization_thread is not None:
+                        self.logn('Waiting for the speaker identification to finish...', where='file')
+                        finish_diarization()
+
+                    if store is not None and (stored is None or job.speaker_detection != 'none'):
+                        # keep the transcription, so it can be rendered again without the models
+                        try:
+                            store.put(store_key, {
+                                'audio_file': job.audio_file,
+                                'start': job.start,
+                                'stop': job.stop,
+                                'model': os.path.basename(os.path.normpath(job.whisper_model)),
+                                'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                                'word_alignment': stored['word_alignment'] if stored is not None else job.word_alignment,
+                                'duration': duration,
+                                'speech_chunks': speech_chunks,
+                                'segments': stored['segments'] if stored is not None else transcribed_segments,
+                                'diarization': {str(job.speaker_detection): diarization} if job.speaker_detection != 'none' else {},
+                            })
+                        except Exception as e:
+                            self.logn(f'Cannot add the transcription to the segment store: {e}', where='file')
+                    if journal is not None:
+                        journal.remove()
+                        journal = None
+                    # if self.cancel:
+                    #    raise Exception(t('err_user_cancelation')) 
+                    
+                    job.has_partial_transcript = False # transcript is finished
+                    self.logn()
+                    self.logn()
+                    self.logn(t('transcription_finished'), 'highlight')
+                finally:
+                    if diarization_thread is not None:
+                        # transcription failed or canceled, stop the diarization too
+                        diarization_abort.set()
+                        diarization_thread.join()
+                    if journal is not None:
+                        # interrupted: keep the journal, a repeated job resumes from it
+                        try:
+                            journal.close()
+                        except Exception:
+                            pass
+                    if not renderer.first_segment:
+                        save_doc()
+                        job.has_partial_transcript = job.status != JobStatus.FINISHED
+                    elif preview is not None:
+                        # stopped before the speakers were identified
+                        preview.save()
+                        job.has_partial_transcript = True
+                    else:
+                        job.has_partial_transcript = False
+                    if job.transcript_file != orig_transcript_file: # used alternative filename because saving under the initial name failed
+                        self.log(t('rescue_saving'))
+                        self.logn(job.transcript_file, link=f'file://{job.transcript_file}')
+                    else:
+                        self.log(t('transcription_saved'))
+                        self.logn(job.transcript_file, link=f'file://{job.transcript_file}')
+
+                # log duration of the whole process
+                proc_time = datetime.datetime.now() - proc_start_time
+                proc_seconds = "{:02d}".format(int(proc_time.total_seconds() % 60))
+                proc_time_str = f'{int(proc_time.total_seconds() // 60)}:{proc_seconds}' 
+                self.logn(t('trancription_time', duration=proc_time_str)) 
+            finally:
+                self.log_file.close()
+                self.log_file = None
+
+        finally:
+            # hide progress
+            self.set_progress(0, 0, job=job)
+            audio = None
+            if shared_audio is not None:
+                shared_audio.release()
+            tmpdir.cleanup()
+
+    def _get_whisper_service(self, slot: int = 0) -> ResidentWorker:
+        """Get the resident Whisper worker of a scheduler slot, create it on first use."""
+        if slot not in self._whisper_services:
+            from whisper_mp_worker import whisper_service_entrypoint
+            try:
+                cache_budget_mb = float(get_config('whisper_model_cache_mb', '4096'))
+            except ValueError:
+                cache_budget_mb = 4096.0
+            name = 'noScribe whisper' if slot == 0 else f'noScribe whisper (slot {slot + 1})'
+            self._whisper_services[slot] = ResidentWorker(whisper_service_entrypoint, args=(cache_budget_mb,),
+                                                          name=name)
+        return self._whisper_services[slot]
+
+    def _get_pyannote_service(self, slot: int = 0) -> ResidentWorker:
+        """Get the resident diarization worker of a scheduler slot, create it on first use."""
+        if slot not in self._pyannote_services:
+            from pyannote_mp_worker import pyannote_service_entrypoint
+            name = 'noScribe pyannote' if slot == 0 else f'noScribe pyannote (slot {slot + 1})'
+            self._pyannote_services[slot] = ResidentWorker(pyannote_service_entrypoint, name=name)
+        return self._pyannote_services[slot]
+
+    def stop_services(self):
+        """Shut down the resident worker processes (if running)."""
+        services = list(self._whisper_services.values()) + list(self._pyannote_services.values())
+        for pool in self._whisper_pools.values():
+            services += pool
+        for service in services:
+            if service is not None:
+                try:
+                    service.stop()
+                except Exception:
+                    pass
+
+    def _prepare_audio(self, job, tmp_audio_file: str, vad_parameters,
+                       early: Optional[EarlyTranscription] = None) -> tuple:
+        """Convert the job's audio and decode it once (16kHz mono after ffmpeg conversion).
+        The samples are shared with the worker processes through shared memory,
+        so they don't need to decode the file again.
+        early: transcribes the decoded audio while ffmpeg is still running (streaming conversion only).
+        Returns (audio, speech_chunks, shared_audio), shared_audio is None if the audio
+        cannot be shared; `tmp_audio_file` exists in that case."""
+        speech_chunks = None
+        cache, key = None, None
+        # Input that is already 16kHz mono PCM doesn't need ffmpeg at all
+        audio = self._read_pcm_wav(job.audio_file, job.start, job.stop)
+        if audio is not None:
+            self.logn('Input is 16kHz mono PCM, skipping ffmpeg.', where='file')
+        else:
+            # Audio converted by an earlier job (same file content and range)
+            cache = open_cache('audio')
+            if cache is not None:
+                try:
+                    key = utils.cache_key(job.fingerprint(), job.start, job.stop)
+                    cached = cache.get(key)
+                except OSError:
+                    cache = cached = None
+                if cached is not None:
+                    audio = self._read_pcm_wav(cached)
+                    if audio is not None:
+                        self.logn(f'Using converted audio from the cache: {cached}', where='file')
+                        cache = None  # nothing to store
+        if audio is None:
+            audio, speech_chunks = self._convert_audio(job, tmp_audio_file, vad_parameters, early)
+            if audio is None:
+                from faster_whisper.audio import decode_audio
+                audio = decode_audio(tmp_audio_file, sampling_rate=16000)
+            if cache is not None:
+                self._store_converted_audio(cache, key, tmp_audio_file, audio)
+        shared_audio = None
+        if get_config('share_decoded_audio', 'True') == 'True':
+            try:
+                from shared_audio import SharedAudio
+                shared_audio = SharedAudio(audio)
+                audio = shared_audio.array
+            except Exception as e:
+                self.logn(f'Cannot share decoded audio, workers will decode it themselves: {e}', where='file')
+        if shared_audio is None and not os.path.exists(tmp_audio_file):
+            # the workers need a file to read the audio from
+            self._write_pcm_wav(tmp_audio_file, audio)
+        return audio, speech_chunks, shared_audio
+
+    def _store_converted_audio(self, cache: DiskCache, key: str, tmp_audio_file: str, audio: 'np.ndarray'):
+        """Add converted audio to the cache. Errors are only logged, the cache is optional."""
+        try:
+            if os.path.exists(tmp_audio_file):
+                cache.put_file(key, tmp_audio_file)
+            else:
+                tmp = cache.new_file()
+                try:
+                    self._write_pcm_wav(tmp, audio)
+                    cache.put_file(key, tmp, move=True)
+                except Exception:
+                    if os.path.exists(tmp):
+                        os.remove(tmp)
+                    raise
+        except Exception as e:
+            self.logn(f'Cannot add the converted audio to the cache: {e}', where='file')
+
+    def _vad_options(self, job) -> 'VadOptions':
+        """Voice activity detection settings of the job"""
+        from faster_whisper.vad import VadOptions
+        try:
+            job.vad_threshold = float(config['voice_activity_detection_threshold'])
+        except Exception:
+            config['voice_activity_detection_threshold'] = '0.5'
+            job.vad_threshold = 0.5
+        try:
+            return VadOptions(min_silence_duration_ms=500,
+                              threshold=job.vad_threshold,
+                              speech_pad_ms=0)
+        except TypeError:
+            return VadOptions(min_silence_duration_ms=500,
+                              onset=job.vad_threshold,
+                              speech_pad_ms=0)
+
+    def _convert_audio(self, job, tmp_audio_file: str, vad_parameters,
+                       early: Optional[EarlyTranscription] = None) -> tuple:
+        """Convert the job's audio to 16kHz mono with ffmpeg (see _prepare_audio for `early`).
+        Returns (audio, speech_chunks). audio is None if ffmpeg wrote `tmp_audio_file`
+        instead, speech_chunks is None if the VAD did not run during the conversion."""
+        speech_chunks = None
+        # Streaming: ffmpeg writes raw PCM to a pipe, no temporary wav file
+        streaming = get_config('streaming_conversion', 'True') == 'True'
+    
+        if int(job.stop) > 0: # transcribe only part of the audio
+            end_pos_cmd = f'-to {job.stop}ms'
+        else: # tranbscribe until the end
+            end_pos_cmd = ''
+
+        output_cmd = '-f s16le pipe:1' if streaming else f'"{tmp_audio_file}"'
+        arguments = f' -loglevel warning -hwaccel auto -y -ss {job.start}ms {end_pos_cmd} -i \"{job.audio_file}\" -ar 16000 -ac 1 -c:a pcm_s16le {output_cmd}'
+        if platform.system() == 'Windows':
+            ffmpeg_path = os.path.join(app_dir, 'ffmpeg.exe')
+            ffmpeg_cmd = ffmpeg_path + arguments
+        elif platform.system() == "Darwin":  # = MAC
+            ffmpeg_path = os.path.join(app_dir, 'ffmpeg')
+            ffmpeg_cmd = shlex.split(ffmpeg_path + arguments)
+        elif platform.system() == "Linux":
+            # TODO: Use system ffmpeg if available
+            ffmpeg_path = os.path.join(app_dir, 'ffmpeg-linux-x86_64')
+            ffmpeg_cmd = shlex.split(ffmpeg_path + arguments)
+        else:
+            raise Exception('Platform not supported yet.')
+
+        if streaming:
+            self.logn(ffmpeg_cmd, where='file')
+            popen_kwargs = {}
+            if platform.system() == 'Windows':
+                startupinfo = STARTUPINFO()
+                startupinfo.dwFlags |= STARTF_USESHOWWINDOW
+                popen_kwargs['startupinfo'] = startupinfo
+            ffmpeg_proc = Popen(ffmpeg_cmd, stdout=PIPE, stderr=DEVNULL, **popen_kwargs)
+            job.ffmpeg_proc = ffmpeg_proc
+            try:
+                audio, speech_chunks = self._read_conversion_stream(job, ffmpeg_proc, vad_parameters, early)
+            finally:
+                job.ffmpeg_proc = None
+            if self._job_canceled(job):
+                raise Exception(t('err_user_cancelation'))
+            if ffmpeg_proc.returncode and ffmpeg_proc.returncode > 0:
+                raise Exception(t('err_ffmpeg'))
+        else:
+            self.logn(ffmpeg_cmd, where='file')
+
+            if platform.system() == 'Windows':
+                # (suppresses the terminal, see: https://stackoverflow.com/questions/1813872/running-a-process-in-pythonw-with-popen-without-a-console)
+                startupinfo = STARTUPINFO()
+                startupinfo.dwFlags |= STARTF_USESHOWWINDOW
+                ffmpeg_proc = Popen(
+                    ffmpeg_cmd,
+                    stdout=DEVNULL,
+                    stderr=STDOUT,
+                    universal_newlines=True,
+                    encoding='utf-8',
+                    startupinfo=startupinfo
+                )
+            elif platform.system() in ("Darwin", "Linux"):
+                ffmpeg_proc = Popen(
+                    ffmpeg_cmd,
+                    stdout=DEVNULL,
+                    stderr=STDOUT,
+                    universal_newlines=True,
+                    encoding='utf-8'
+                )
+
+            # Track process for external cancel/close handling
+            job.ffmpeg_proc = ffmpeg_proc
+
+            try:
+                # Poll loop to allow responsive cancel during conversion
+                while True:
+                    rc = ffmpeg_proc.poll()
+                    if rc is not None:
+                        break
+                    if self._job_canceled(job):
+                        try:
+                            ffmpeg_proc.terminate()
+                        except Exception:
+                            pass
+                        # Ensure process does not linger
+                        try:
+                            ffmpeg_proc.wait(timeout=1.0)
+                        except Exception:
+                            try:
+                                ffmpeg_proc.kill()
+                            except Exception:
+                                pass
+                        raise Exception(t('err_user_cancelation'))
+                    time.sleep(0.1)
+
+                if ffmpeg_proc.returncode and ffmpeg_proc.returncode > 0:
+                    raise Exception(t('err_ffmpeg'))
+            finally:
+                job.ffmpeg_proc = None
+        return audio, speech_chunks
+
+    def _read_pcm_wav(self, path: str, start_ms: int = 0, stop_ms: int = 0) -> Optional['np.ndarray']:
+        """Read an audio file directly if it is already a 16kHz mono 16-bit PCM wav file
+        (and cut it to start_ms/stop_ms, 0 = until the end). Returns None for every other
+        input, which then needs to be converted by ffmpeg."""
+        try:
+            with wave.open(path, 'rb') as wav:
+                if (wav.getframerate() != 16000 or wav.getnchannels() != 1
+                        or wav.getsampwidth() != 2 or wav.getcomptype() != 'NONE'):
+                    return None
+                start = min(int(start_ms) * 16, wav.getnframes())
+                stop = int(stop_ms) * 16 if int(stop_ms) > 0 else wav.getnframes()
+                wav.setpos(start)
+                frames = wav.readframes(max(min(stop, wav.getnframes()) - start, 0))
+        except (wave.Error, EOFError, OSError):
+            return None
+        import numpy as np
+        return np.frombuffer(frames, dtype='<i2').astype(np.float32) / 32768.0
+
+    def _write_pcm_wav(self, path: str, audio: 'np.ndarray'):
+        """Write decoded audio (float32, 16kHz mono) as a 16-bit PCM wav file."""
+        import numpy as np
+        with wave.open(path, 'wb') as wav:
+            wav.setnchannels(1)
+            wav.setsampwidth(2)
+            wav.setframerate(16000)
+            wav.writeframes((np.clip(audio, -1.0, 32767 / 32768) * 32768).astype('<i2').tobytes())
+
+    def _read_conversion_stream(self, job, ffmpeg_proc, vad_parameters,
+                                early: Optional[EarlyTranscription] = None, block_seconds: int = 60):
+        """Read the raw PCM output of ffmpeg (s16le, 16kHz mono) from its stdout into a growing buffer.
+        The VAD runs in a background thread on every completed block of `block_seconds` while
+        ffmpeg is still decoding the rest, and passes the audio on to `early` for transcription.
+        Returns the audio (float32) and the speech chunks (None if the VAD failed, it is run
+        again on the whole audio then)."""
+        import numpy as np
+        from faster_whisper.vad import get_speech_timestamps
+        sampling_rate = 16000
+        block_bytes = block_seconds * sampling_rate * 2
+        pcm = bytearray()
+        speech_chunks = []
+        vad_failed = False
+        vad_q = pyqueue.Queue()
+        min_gap = vad_parameters.min_silence_duration_ms * sampling_rate // 1000
+        log_file = self.log_file
+
+        def vad_worker():
+            nonlocal vad_failed
+            self.log_file = log_file
+            while True:
+                item = vad_q.get()
+                if item is None:
+                    return
+                offset, block = item
+                if vad_failed:
+                    continue
+                try:
+                    block = np.frombuffer(block, dtype='<i2').astype(np.float32) / 32768.0
+                    utils.append_speech_chunks(speech_chunks, get_speech_timestamps(block, vad_parameters),
+                                               offset, min_gap)
+                except Exception as e:
+                    vad_failed = True
+                    self.logn(f'VAD during conversion failed: {e}', where='file')
+                    continue
+                if early is not None and ffmpeg_proc.returncode is None:
+                    # (not after the end of the conversion, the transcription step takes over there)
+                    try:
+                        early.feed(pcm, offset + len(block), speech_chunks, min_gap)
+                    except Exception as e:
+                        early.error = e
+
+        vad_thread = Thread(target=vad_worker, daemon=True)
+        vad_thread.start()
+        vad_pos = 0  # bytes
+        try:
+            while True:
+                data = ffmpeg_proc.stdout.read(256 * 1024)
+                if not data:
+                    break
+                pcm += data
+                while len(pcm) - vad_pos >= block_bytes:
+                    vad_q.put((vad_pos // 2, bytes(pcm[vad_pos:vad_pos + block_bytes])))
+                    vad_pos += block_bytes
+                if self._job_canceled(job):
+                    ffmpeg_proc.terminate()
+                    break
+            ffmpeg_proc.wait()
+            pcm = pcm[:len(pcm) - len(pcm) % 2]
+            if len(pcm) > vad_pos:
+                vad_q.put((vad_pos // 2, bytes(pcm[vad_pos:])))
+        finally:
+            vad_q.put(None)
+            ffmpeg_proc.stdout.close()
+        vad_thread.join()
+        audio = np.frombuffer(pcm, dtype='<i2').astype(np.float32) / 32768.0
+        return audio, (None if vad_failed else speech_chunks)
+
+    def _whisper_args(self, tmp_audio_file: str, job, shared_audio: Optional[dict] = None,
+                      speech_chunks: Optional[list] = None, threads: Optional[int] = None,
+                      language: Optional[str] = None) -> dict:
+        """Build the job description for the Whisper worker (see whisper_mp_worker.py).
+        threads: CPU threads for Whisper (default: job.whisper_threads).
+        language: language code detected in an earlier part of the audio (instead of 'Auto')."""
+        # Language code for non-auto/multilingual
+        language_code = None
+        if language and job.language_name == 'Auto':
+            language_code = language
+        elif job.language_name not in ('Auto', 'Multilingual'):
+            try:
+                language_code = languages[job.language_name]
+            except Exception:
+                language_code = None
+
+        # VAD threshold from config
+        try:
+            vad_threshold = float(config.get('voice_activity_detection_threshold', '0.5'))
+        except Exception:
+            vad_threshold = 0.5
+
+        args = {
+            "model_name_or_path": job.whisper_model,
+            "device": 'cpu' if force_whisper_cpu else 'auto',
+            "compute_type": job.whisper_compute_type,
+            "cpu_threads": threads or job.whisper_threads,
+            "local_files_only": True,
+            "audio_path": tmp_audio_file,
+            "shared_audio": shared_audio,
+            "language_name": language if language and job.language_name == 'Auto' else job.language_name,
+            "language_code": language_code,
+            "disfluencies": job.disfluencies,
+            "beam_size": job.whisper_beam_size,
+            "best_of": job.whisper_best_of,
+            "temperature": job.whisper_temperature,
+            "batch_size": job.whisper_batch_size,
+            "word_timestamps": job.word_alignment == 'word',
+            "without_timestamps": job.word_alignment == 'off',
+            "vad_filter": True,
+            "vad_threshold": vad_threshold,
+            "speech_chunks": speech_chunks,
+            "locale": app_locale,
+        }
+        return args
+
+    def _run_whisper_subprocess_stream(self, tmp_audio_file: str, job, on_segment, shared_audio: Optional[dict] = None,
+                                       speech_chunks: Optional[list] = None, audio_range: Optional[tuple] = None,
+                                       threads: Optional[int] = None, language: Optional[str] = None,
+                                       quiet: bool = False):
+        """Run Faster-Whisper in a subprocess (the resident worker by default) and stream segments.
+        Calls on_segment(dict) for each segment streamed by the child.
+        shared_audio: descriptor of the decoded audio in shared memory (see shared_audio.py),
+        if given, the child uses it instead of decoding tmp_audio_file.
+        speech_chunks: VAD result (speech chunks in samples, without padding), if given,
+        the child uses it instead of running the VAD again.
+        audio_range: (start, end) in samples to transcribe only a part of the audio, speech_chunks
+        must then be relative to start (see utils.clip_speech_chunks). Timestamps stay absolute.
+        threads: CPU threads for Whisper (default: job.whisper_threads).
+        language: language code detected in an earlier part (see _whisper_args).
+        quiet: no progress and only errors on the screen (parts transcribed during the conversion).
+        Returns a simple info object (duration and detected language).
+        """
+        args = self._whisper_args(tmp_audio_file, job, shared_audio, speech_chunks, threads, language)
+        if audio_range is not None:
+            args['audio_range'] = audio_range
+
+        persistent = get_config('whisper_persistent_worker', 'True') == 'True'
+        if persistent:
+            # Reuse the resident worker (keeps models loaded between jobs)
+            service = self._get_whisper_service(job.slot)
+            restarted = service.ensure_running()
+            if restarted and service.starts > 1:
+                self.logn('Whisper worker (re)started.', where='file')
+            job_id = service.submit(args)
+            proc = service.proc
+            q = service.resp_q
+        else:
+            # Spawn child process using spawn start method
+            ctx = mp.get_context("spawn")
+            q = ctx.Queue()
+            from whisper_mp_worker import whisper_proc_entrypoint
+            proc = ctx.Process(target=whisper_proc_entrypoint, args=(args, q))
+            proc.start()
+            job_id = None
+        # Expose to allow cancel to terminate the child
+        job.mp_proc = proc
+
+        info = None
+        segments_received = False
+        resubmitted = False
+        job_ok = False
+        try:
+            while True:
+                try:
+                    msg = q.get(timeout=0.1)
+                except pyqueue.Empty:
+                    if self._job_canceled(job):
+                        # User requested cancel; terminate child
+                        try:
+                            proc.terminate()
+                        except Exception:
+                            pass
+                        raise Exception(t('err_user_cancelation'))
+                    try:
+                        alive = proc.is_alive()
+                    except ValueError: # already closed by a cancel from the queue table
+                        alive = False
+                    if not alive:
+                        if persistent and not segments_received and not resubmitted:
+                            # The resident worker crashed before this job produced anything:
+                            # restart it transparently and try once more.
+                            self.logn('Whisper worker exited unexpectedly, restarting.', where='file')
+                            resubmitted = True
+                            service.terminate()
+                            job_id = service.submit(args)
+                            proc = service.proc
+                            q = service.resp_q
+                            job.mp_proc = proc
+                            continue
+                        # Process died without sending result
+                        try:
+                            exitcode = proc.exitcode
+                        except ValueError:
+                            exitcode = None
+                        self.logn(f"Transcription worker exited unexpectedly (code {exitcode}).", 'error')
+                        raise Exception('Subprocess terminated unexpectedly')
+                    continue
+
+                if not isinstance(msg, dict) or msg.get('job_id') != job_id:
+                    continue # stale message from an earlier job of the resident worker
+                mtype = msg.get("type")
+                if mtype == "log":
+                    level = msg.get("level", "info")
+                    txt = msg.get("msg", "")
+                    if level == 'error':
+                        self.logn(txt, 'error')
+                    elif level == 'debug' or quiet:
+                        self.logn(txt, where='file')
+                    else:
+                        self.logn(txt)
+                elif mtype == "progress":
+                    pct = msg.get("pct")
+                    detail = msg.get("detail")
+                    try:
+                        if pct is not None and not quiet:
+                            self.set_progress(3, float(pct), job.speaker_detection, job=job)
+                    except Exception:
+                        pass
+                elif mtype == "segments":
+                    segments_received = True
+                    try:
+                        for seg in utils.unpack_segments(msg["packed"]):
+                            on_segment(seg)
+                    except Exception as e:
+                        # If on_segment fails, stop child and raise
+                        try:
+                            proc.terminate()
+                        except Exception:
+                            pass
+                        raise
+                elif mtype == "result":
+                    if msg.get("ok"):
+                        info = msg.get("info", {})
+                    else:
+                        err = msg.get('error', 'Transcription failed')
+                        trc = msg.get('trace')
+                        self.logn(f"Transcription failed: {err}", 'error')
+                        if trc:
+                            self.logn(trc, where='file')
+                        # the job failed, but the resident worker itself is still healthy 
+                        job_ok = True
+                        raise Exception(err)
+                    job_ok = True
+                    break
+                # keep looping until we get a result
+        finally:
+            if persistent:
+                if not job_ok:
+                    # canceled or crashed mid-job: drop the worker, it is restarted with the next job
+                    service.terminate()
+            else:
+                try:
+                    proc.join(timeout=0.2)
+                except Exception:
+                    pass
+                if proc.is_alive():
+                    try:
+                        proc.terminate()
+                    except Exception:
+                        pass
+                try:
+                    proc.close()
+                except Exception:
+                    pass
+            # Clear exposed handles
+            job.mp_proc = None
+
+        return WhisperInfo(info or {})
+
+    def _get_whisper_pool(self, size: int, slot: int = 0) -> List[ResidentWorker]:
+        """Get `size` resident Whisper workers of a scheduler slot for parallel chunked transcription."""
+        from whisper_mp_worker import whisper_service_entrypoint
+        try:
+            cache_budget_mb = float(get_config('whisper_model_cache_mb', '4096'))
+        except ValueError:
+            cache_budget_mb = 4096.0
+        pool = self._whisper_pools.setdefault(slot, [])
+        while len(pool) < size:
+            pool.append(ResidentWorker(whisper_service_entrypoint, args=(cache_budget_mb,),
+                                       name=f'noScribe whisper {slot + 1}.{len(pool) + 1}'))
+        return pool[:size]
+
+    def _run_whisper_parallel(self, tmp_audio_file: str, job, on_segment, shared_audio: Optional[dict],
+                              speech_chunks: list, total_samples: int, threads: Optional[int] = None):
+        """Split the audio at pauses and transcribe the parts in parallel worker processes.
+        The segments are passed to on_segment(dict) in order and with absolute timestamps,
+        just as if they came from a single run of _run_whisper_subprocess_stream().
+        threads: CPU threads of all workers together (default: job.whisper_threads).
+        """
+        sampling_rate = 16000
+        parts = utils.split_at_pauses(speech_chunks, total_samples, job.whisper_parallel_workers,
+                                      min_pause=sampling_rate)
+        if len(parts) < 2:
+            return self._run_whisper_subprocess_stream(tmp_audio_file, job, on_segment, shared_audio, speech_chunks,
+                                                       threads=threads)
+        n = len(parts)
+        self.logn(f'Parallel transcription: {n} parts', where='file')
+
+        # The thread budgets of all workers sum up to the job's thread budget
+        cores = threads or job.whisper_threads
+        part_threads = [max(1, cores // n + (1 if i < cores % n else 0)) for i in range(n)]
+        pool = self._get_whisper_pool(n, job.slot)
+        base_args = self._whisper_args(tmp_audio_file, job, shared_audio, speech_chunks)
+
+        def check_cancel():
+            if self._job_canceled(job):
+                for w in pool:
+                    w.terminate()
+                raise Exception(t('err_user_cancelation'))
+
+        def wait_result(worker, job_id, on_msg=None):
+            # Wait for the result of a single request, forwarding segments to on_msg
+            while True:
+                check_cancel()
+                try:
+                    msg = worker.get(timeout=0.1)
+                except pyqueue.Empty:
+                    if not worker.is_alive():
+                        raise Exception('Subprocess terminated unexpectedly')
+                    continue
+                if isinstance(msg, dict) and msg.get('job_id') == job_id:
+                    if msg.get('type') == 'result':
+                        return msg
+                    elif on_msg is not None:
+                        on_msg(msg)
+
+        def raise_failed(msg):
+            err = msg.get('error', 'Transcription failed')
+            self.logn(f"Transcription failed: {err}", 'error')
+            if msg.get('trace'):
+                self.logn(msg.get('trace'), where='file')
+            raise Exception(err)
+
+        try:
+            # Detect the language once, so that all parts are transcribed in the same language
+            if job.language_name == 'Auto':
+                args = dict(base_args, cpu_threads=part_threads[0], detect_language_only=True)
+                msg = wait_result(pool[0], pool[0].submit(args), 
+                                  lambda m: self.logn(m.get('msg', '')) if m.get('type') == 'log' and m.get('level') != 'debug' else None)
+                if not msg.get('ok'):
+                    raise_failed(msg)
+                lang = (msg.get('info') or {}).get('language')
+                if lang:
+                    base_args['language_name'] = lang
+                    base_args['language_code'] = lang
+
+            job_ids = []
+            for i, part in enumerate(parts):
+                part_chunks = [
+                    {'start': c['start'] - part['start'], 'end': c['end'] - part['start']}
+                    for c in speech_chunks if c['start'] >= part['start'] and c['end'] <= part['end']
+                ]
+                args = dict(base_args, cpu_threads=part_threads[i], audio_range=(part['start'], part['end']),
+                            speech_chunks=part_chunks)
+                job_ids.append(pool[i].submit(args))
+
+            # Collect the streamed segments. Segments of the part currently "on air" are passed on
+            # directly, those of later parts are buffered until all parts before them are done.
+            buffers = [[] for _ in parts]
+            done = [False] * n
+            current = 0
+            while current < n:
+                check_cancel()
+                got_msg = False
+                for i in range(current, n):
+                    if done[i]:
+                        continue
+                    try:
+                        msg = pool[i].get(timeout=0)
+                    except pyqueue.Empty:
+                        if not pool[i].is_alive():
+                            self.logn(f"Transcription worker {i + 1} exited unexpectedly.", 'error')
+                            raise Exception('Subprocess terminated unexpectedly')
+                        continue
+                    got_msg = True
+                    if not isinstance(msg, dict) or msg.get('job_id') != job_ids[i]:
+                        continue
+                    mtype = msg.get('type')
+                    if mtype == 'log':
+                        if msg.get('level') == 'error':
+                            self.logn(msg.get('msg', ''), 'error')
+                        else:
+                            self.logn(f'[{i + 1}/{n}] {msg.get("msg", "")}', where='file')
+                    elif mtype == 'segments':
+                        segs = utils.unpack_segments(msg['packed'])
+                        if i == current:
+                            for seg in segs:
+                                on_segment(seg)
+                        else:
+                            buffers[i].extend(segs)
+                    elif mtype == 'result':
+                        if not msg.get('ok'):
+                            raise_failed(msg)
+                        done[i] = True
+                        while current < n and done[current]:
+                            current += 1
+                            if current < n:
+                                for seg in buffers[current]:
+                                    on_segment(seg)
+                                buffers[current] = []
+                if not got_msg:
+                    time.sleep(0.05)
+        except BaseException:
+            # canceled or failed: drop all workers, they are restarted with the next job
+            for w in pool:
+                w.terminate()
+            raise
+
+        return WhisperInfo({'duration': total_samples / sampling_rate})
+
+    def _run_diarize_subprocess(self, tmp_audio_file: str, job, shared_audio: Optional[dict] = None,
+                                num_threads: int = 0, in_background: bool = False, abort: Optional[Event] = None,
+                                slot: Optional[int] = None):
+        """Run diarization in a subprocess (the resident worker by default) and return list of segments.
+        Streams child logs/progress back to GUI and honors cancel.
+        shared_audio: descriptor of the decoded audio in shared memory (see shared_audio.py).
+        num_threads: CPU threads for pyannote (0 = torch default).
+        in_background: diarization runs in a separate thread alongside the transcription, 
+        progress is only logged to file and the process is not registered for cancel handling
+        (it is canceled through the job's cancellation token or `abort`).
+        slot: scheduler slot of the resident worker to use (default: the job's slot).
+        Results are cached on disk (see CACHES), so the speakers are not identified again
+        if a job is repeated with other transcription options.
+        """
+        cache, cache_key, cached = self._cached_diarization(job)
+        if cached is not None:
+            return cached
+
+        args = {
+            "device": 'cpu' if force_pyannote_cpu else '',
+            "audio_path": tmp_audio_file,
+            "shared_audio": shared_audio,
+            "num_speakers": (int(job.speaker_detection) if str(job.speaker_detection).isdigit() else None),
+            "num_threads": num_threads,
+        }
+        persistent = get_config('pyannote_persistent_worker', 'True') == 'True'
+        if persistent:
+            # Reuse the resident worker (keeps the pipeline loaded between jobs)
+            service = self._get_pyannote_service(job.slot if slot is None else slot)
+            job_id = service.submit(args)
+            proc = service.proc
+            q = service.resp_q
+        else:
+            ctx = mp.get_context("spawn")
+            q = ctx.Queue()
+            from pyannote_mp_worker import pyannote_proc_entrypoint
+            proc = ctx.Process(target=pyannote_proc_entrypoint, args=(args, q))
+            proc.start()
+            job_id = None
+        # Keep handles for cancel
+        if not in_background:
+            job.mp_proc = proc
+
+        diarization = None
+        resubmitted = False
+        job_ok = False
+        try:
+            while True:
+                try:
+                    msg = q.get(timeout=0.1)
+                except pyqueue.Empty:
+                    if self._job_canceled(job) or (abort is not None and abort.is_set()):
+                        try:
+                            proc.terminate()
+                        except Exception:
+                            pass
+                        raise Exception(t('err_user_cancelation'))
+                    try:
+                        alive = proc.is_alive()
+                    except ValueError: # already closed by a cancel from the queue table
+                        alive = False
+                    if not alive:
+                        if persistent and not resubmitted:
+                            # The resident worker crashed: restart it transparently and try once more.
+                            self.logn('Diarization worker exited unexpectedly, restarting.', where='file')
+                            resubmitted = True
+                            service.terminate()
+                            job_id = service.submit(args)
+                            proc = service.proc
+                            q = service.resp_q
+                            if not in_background:
+                                job.mp_proc = proc
+                            continue
+                        try:
+                            exitcode = proc.exitcode
+                        except ValueError:
+                            exitcode = None
+                        self.logn(f"Diarization worker exited unexpectedly (code {exitcode}). UI remains responsive.", 'error')
+                        raise Exception('Subprocess terminated unexpectedly')
+                    continue
+
+                if not isinstance(msg, dict) or msg.get('job_id') != job_id:
+                    continue # stale message from an earlier job of the resident worker
+                mtype = msg.get("type")
+                if mtype == "log":
+                    txt = msg.get("msg", "")
+                    self.logn('PyAnnote ' + txt, where='file')
+                elif mtype == "progress":
+                    step_name = str(msg.get("step", ""))
+                    progress_percent = int(msg.get("pct", 0))
+                    if in_background:
+                        continue
+                    self.logr(f'{step_name}: {progress_percent}%')
+                    if step_name == 'segmentation':
+                        self.set_progress(2, progress_percent * 0.3, job.speaker_detection, job=job)
+                    elif step_name == 'embeddings':
+                        self.set_progress(2, 30 + (progress_percent * 0.7), job.speaker_detection, job=job)
+                elif mtype == "result":
+                    job_ok = True
+                    if msg.get("ok"):
+                        diarization = utils.unpack_diarization(msg["packed"])
+                        self.logn(f'PyAnnote pipeline load time: {msg.get("load_time", 0.0):.1f}s, '
+                                  f'diarization time: {msg.get("job_time", 0.0):.1f}s', where='file')
+                    else:
+                        err = msg.get('error', 'Diarization failed')
+                        trc = msg.get('trace')
+                        self.logn(f"PyAnnote error: {err}", 'error')
+                        if trc:
+                            self.logn(trc, where='file')
+                        raise Exception(err)
+                    break
+
+        finally:
+            if persistent:
+                if not job_ok:
+                    # canceled or crashed mid-job: drop the worker, it is restarted with the next job
+                    service.terminate()
+            else:
+                try:
+                    proc.join(timeout=0.2)
+                except Exception:
+                    pass
+                if proc.is_alive():
+                    try:
+                        proc.terminate()
+                    except Exception:
+                        pass
+                try:
+                    proc.close()
+                except Exception:
+                    pass
+            if not in_background:
+                job.mp_proc = None
+
+        if cache_key is not None and diarization is not None:
+            try:
+                cache.put_bytes(cache_key, json.dumps({
+                    'audio_file': job.audio_file,
+                    'start': job.start,
+                    'stop': job.stop,
+                    'num_speakers': args['num_speakers'],
+                    'created': datetime.datetime.now().isoformat(timespec='seconds'),
+                    'segments': diarization,
+                }).encode('utf-8'))
+            except Exception as e:
+                self.logn(f'Cannot add the speaker segments to the cache: {e}', where='file')
+
+        return diarization or []
+
+    def _cached_diarization(self, job) -> tuple:
+        """Look up the job's speaker segments in the diarization cache.
+        Returns (cache, key, segments), segments is None if not cached, cache and key
+        are None if the cache is disabled or cannot be used."""
+        cache = open_cache('diarization')
+        if cache is None:
+            return None, None, None
+        try:
+            key = diarization_cache_key(job)
+            cached = cache.get_bytes(key)
+            if cached is None:
+                return cache, key, None
+            segments = json.loads(cached)['segments']
+        except Exception as e:
+            self.logn(f'Cannot read the diarization cache: {e}', where='file')
+            return None, None, None
+        self.logn(f'Using speaker segments from the cache: {cache.path(key)}', where='file')
+        return cache, key, segments
+
+
+def transcribe(job: TranscriptionJob, **callbacks) -> Iterator[Segment]:
+    """Transcribe a single job with a new Engine (see Engine.transcribe()), the worker
+    processes are shut down afterwards. callbacks: see Engine."""
+    engine = Engine(**callbacks)
+    try:
+        yield from engine.transcribe(job)
+    finally:
+        engine.stop_services()
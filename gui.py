@@ -0,0 +1,1660 @@
+"""
+The main window of noScribe (customtkinter).
+
+Only imported when the GUI is shown (see noScribe.py), the command line modes
+run without loading Tk, customtkinter or PIL. The transcription itself is done
+by the `Engine` (engine.py), the window is a client of it.
+"""
+
+import sys
+import os
+import tkinter as tk
+import customtkinter as ctk
+from customtkinter.windows.widgets.scaling import CTkScalingBaseClass
+from CTkToolTips import CTkToolTip
+from tkHyperlinkManager import HyperlinkManager
+import webbrowser
+from functools import partial
+from PIL import Image
+import platform
+from subprocess import run, Popen
+from threading import Thread
+from pathlib import Path
+import re
+import json
+from typing import Optional
+
+import utils
+import startup_profile
+from job_store import JobStore
+from engine import (app_version, app_year, app_dir, config, config_dir, get_config, save_config,
+                    force_pyannote_cpu, force_whisper_cpu, t, languages, decoding_profile_names,
+                    JobStatus, TranscriptionJob, TranscriptionQueue, create_transcription_job,
+                    find_whisper_models, Engine)
+
+ctk.set_appearance_mode('dark')
+ctk.set_default_color_theme('blue')
+
+def version_higher(version1, version2, subversion_level=99) -> int:
+    """Will return 
+    1 if version1 is higher
+    2 if version2 is higher
+    0  if both are equal 
+    
+    subversion_level: Adjusts how deep suversions are compared. 
+                      If subversion_level = 1, "0.7.3" and "0.7.4" will be equal, because the comparison
+                      stops after the first level of subversions ("0.7").  
+                      Default: 99
+    """
+    version1_elems = version1.split('.')
+    version2_elems = version2.split('.')
+    # make both versions the same length
+    elem_num = max(len(version1_elems), len(version2_elems))
+    while len(version1_elems) < elem_num:
+        version1_elems.append('0')
+    while len(version1_elems) < elem_num:
+        version1_elems.append('0')
+    for i in range(elem_num):
+        if int(version1_elems[i]) > int(version2_elems[i]):
+            return 1
+        elif int(version2_elems[i]) > int(version1_elems[i]):
+            return 2
+        if i >= subversion_level:
+            break
+    # must be completly equal
+    return 0
+    
+
+class TimeEntry(ctk.CTkEntry): # special Entry box to enter time in the format hh:mm:ss
+                               # based on https://stackoverflow.com/questions/63622880/how-to-make-python-automatically-put-colon-in-the-format-of-time-hhmmss
+    def __init__(self, master, **kwargs):
+        ctk.CTkEntry.__init__(self, master, **kwargs)
+        vcmd = self.register(self.validate)
+
+        self.bind('<Key>', self.format)
+        self.configure(validate="all", validatecommand=(vcmd, '%P'))
+
+        self.valid = re.compile(r'^\d{0,2}(:\d{0,2}(:\d{0,2})?)?$', re.I)
+
+    def validate(self, text):
+        if text == '':
+            return True
+        elif ''.join(text.split(':')).isnumeric():
+            return not self.valid.match(text) is None
+        else:
+            return False
+
+    def format(self, event):
+        if event.keysym not in ['BackSpace', 'Shift_L', 'Shift_R', 'Control_L', 'Control_R']:
+            i = self.index('insert')
+            if i in [2, 5]:
+                if event.char != ':':
+                    if self.get()[i:i+1] != ':':
+                        self.insert(i, ':')
+
+class JobEntryFrame(ctk.CTkFrame, CTkScalingBaseClass):
+    """A custom frame that can display a progress bar as its background with text overlays"""
+    
+    def __init__(self, master, progress=0.0, progress_color=None, **kwargs):
+        ctk.CTkFrame.__init__(self, master, **kwargs)
+        CTkScalingBaseClass.__init__(self, scaling_type="widget")
+        if not progress_color:
+            progress_color = ctk.ThemeManager.theme['CTkProgressBar']['progress_color'][1]
+        
+        self.progress = progress
+        self.progress_color = progress_color
+        self.base_color = self._fg_color
+        self.show_progress = False  # Only show progress during processing
+        
+        # Store text content
+        self.name_text = ""
+        self.status_text = ""
+        self.status_color = "lightgray"
+        
+        # Create a canvas to draw the progress background and text
+        self.progress_canvas = tk.Canvas(self, highlightthickness=0)
+        self.progress_canvas.place(x=0, y=0, relwidth=1, relheight=1)
+        
+        # Forward mouse events from canvas to frame for CTkToolTip functionality
+        self.progress_canvas.bind("<Enter>", self._on_canvas_enter)
+        self.progress_canvas.bind("<Leave>", self._on_canvas_leave)
+        
+        # Bind to configure event to redraw when size changes
+        self.bind('<Configure>', self._on_configure)
+        
+        # Update the progress display
+        self._update_progress_display()
+    
+    def destroy(self):
+        """Override destroy to properly clean up scaling callbacks"""
+        CTkScalingBaseClass.destroy(self)
+        ctk.CTkFrame.destroy(self)
+    
+    def set_progress(self, progress, show_progress=True):
+        """Set the progress value (0.0 to 1.0) and whether to show progress bar"""
+        self.progress = max(0.0, min(1.0, progress))
+        self.show_progress = show_progress
+        self._update_progress_display()
+    
+    def set_name_text(self, text):
+        """Set the name text to display"""
+        self.name_text = text
+        self._update_progress_display()
+    
+    def set_status_text(self, text, color="lightgray"):
+        """Set the status text and color to display"""
+        self.status_text = text
+        self.status_color = color
+        self._update_progress_display()
+    
+    def bind_click(self, callback):
+        """Bind click event to the canvas"""
+        self.progress_canvas.bind("<Button-1>", callback)
+    
+    def unbind_click(self):
+        """Unbind click event from the canvas"""
+        self.progress_canvas.unbind("<Button-1>")
+    
+    def configure_cursor(self, cursor):
+        """Configure cursor for the canvas"""
+        self.progress_canvas.configure(cursor=cursor)
+            
+    def _on_configure(self, event=None):
+        """Handle resize events"""
+        self._update_progress_display()
+    
+    def _get_scaled_font_size(self):
+        """Calculate font size based on frame height and use CustomTkinter's scaling"""
+        try:
+            font = ctk.CTkFont()
+            scaled_font = self._apply_font_scaling(font)
+            return scaled_font[1]
+        except:
+            return 13  # Fallback
+    
+    def _on_canvas_enter(self, event):
+        """Forward canvas Enter event to frame for CTkToolTip"""
+        # Generate a synthetic Enter event for the frame
+        self.event_generate("<Enter>")
+    
+    def _on_canvas_leave(self, event):
+        """Forward canvas Leave event to frame for CTkToolTip"""
+        # Generate a synthetic Leave event for the frame
+        self.event_generate("<Leave>")
+    
+    def _update_progress_display(self):
+        """Update the progress bar display and text"""
+        if not self.progress_canvas.winfo_exists():
+            return
+            
+        # Clear the canvas
+        self.progress_canvas.delete("all")
+        
+        # Get canvas dimensions
+        width = self.progress_canvas.winfo_width()
+        height = self.progress_canvas.winfo_height()
+        
+        if width <= 1 or height <= 1:
+            # Canvas not ready yet
+            self.after(10, self._update_progress_display)
+            return
+        
+        # Calculate button area width to avoid overlap (1 button = 30px + padding)
+        # Reserve space for up to 3 buttons (X, ⟲/✔, ✔)
+        button_area_width = 3 * self._apply_widget_scaling(30 + 5)
+               
+        # Draw base background
+        base_color = self.base_color[1] if isinstance(self.base_color, tuple) else self.base_color
+        self.progress_canvas.configure(bg=base_color)
+        
+        # Draw progress bar only if show_progress is True and there's progress
+        if self.show_progress and self.progress > 0:
+            progress_width = int((width - button_area_width) * self.progress)
+            self.progress_canvas.create_rectangle(
+                0, 0, progress_width, height,
+                fill=self.progress_color,
+                outline=""
+            )
+        
+        # Calculate font size based on screen scaling
+        font_size = self._get_scaled_font_size()
+                
+        # Draw text overlays
+        if self.name_text:
+            self.progress_canvas.create_text(
+                10, height // 2,
+                text=self.name_text,
+                anchor="w",
+                fill="lightgray",
+                font=("", font_size)
+            )
+        
+        if self.status_text:
+            # Position status text to avoid button overlap
+            status_x = width - button_area_width - self._apply_widget_scaling(5)
+            self.progress_canvas.create_text(
+                status_x, height // 2,
+                text=self.status_text,
+                anchor="e",
+                fill=self.status_color,
+                font=("", font_size)
+            )
+
+class App(ctk.CTk):
+    def __init__(self):
+        super().__init__()
+
+        self.protocol("WM_DELETE_WINDOW", self.on_closing)
+        
+        self.user_models_dir = os.path.join(config_dir, 'whisper_models')
+        self.whisper_model_paths = {} # see get_whisper_models()
+        
+        self.engine = Engine(on_log=self._show_log, on_progress=self._show_progress,
+                             on_jobs_changed=self.update_queue_table)
+        self.queue = self.engine.queue
+        self.audio_files_list = []
+        self.transcript_files_list = []
+        self.current_progress = -1
+        # Track background activity for robust shutdown
+        self._worker_threads = []
+        self._shutting_down = False
+
+        # configure window
+        self.title('noScribe - ' + t('app_header'))
+        if platform.system() in ("Darwin", "Linux"):
+            self.geometry(f"{1100}x{765}")
+        else:
+            self.geometry(f"{1100}x{690}")
+        if platform.system() in ("Darwin", "Windows"):
+            self.iconbitmap(os.path.join(app_dir, 'noScribeLogo.ico'))
+        if platform.system() == "Linux":
+            if hasattr(sys, "_MEIPASS"):
+                self.iconphoto(True, tk.PhotoImage(file=os.path.join(sys._MEIPASS, "noScribeLogo.png")))
+            else:
+                self.iconphoto(True, tk.PhotoImage(file='noScribeLogo.png'))
+
+        # header
+        self.frame_header = ctk.CTkFrame(self, height=100)
+        self.frame_header.pack(padx=0, pady=0, anchor='nw', fill='x')
+
+        self.frame_header_logo = ctk.CTkFrame(self.frame_header, fg_color='transparent')
+        self.frame_header_logo.pack(anchor='w', side='left')
+
+        # logo
+        self.logo_label = ctk.CTkLabel(self.frame_header_logo, text="noScribe", font=ctk.CTkFont(size=42, weight="bold"))
+        self.logo_label.pack(padx=20, pady=[40, 0], anchor='w')
+
+        # sub header
+        self.header_label = ctk.CTkLabel(self.frame_header_logo, text=t('app_header'), font=ctk.CTkFont(size=16, weight="bold"))
+        self.header_label.pack(padx=20, pady=[0, 20], anchor='w')
+        # graphic
+        self.header_graphic = ctk.CTkImage(dark_image=Image.open(os.path.join(app_dir, 'graphic_sw.png')), size=(926,119))
+        self.header_graphic_label = ctk.CTkLabel(self.frame_header, image=self.header_graphic, text='')
+        self.header_graphic_label.pack(anchor='ne', side='right', padx=[30,30])
+
+        # main window
+        self.frame_main = ctk.CTkFrame(self)
+        self.frame_main.pack(padx=0, pady=0, anchor='nw', expand=True, fill='both')
+
+        # create sidebar frame for options
+        self.sidebar_frame = ctk.CTkFrame(self.frame_main, width=300, corner_radius=0, fg_color='transparent')
+        self.sidebar_frame.pack(padx=0, pady=0, fill='y', expand=False, side='left')
+
+        # create options scrollable frame
+        self.scrollable_options = ctk.CTkScrollableFrame(self.sidebar_frame, width=300, corner_radius=0, fg_color='transparent')
+        self.scrollable_options.pack(padx=0, pady=0, anchor='w', fill='both', expand=True)
+        self.bind('<Configure>', self.on_resize) # Bind the configure event of options_frame to a check_scrollbar requirement function
+        
+        # input audio file
+        self.label_audio_file = ctk.CTkLabel(self.scrollable_options, text=t('label_audio_file'))
+        self.label_audio_file.pack(padx=20, pady=[20,0], anchor='w')
+
+        self.frame_audio_file = ctk.CTkFrame(self.scrollable_options, width=260, height=33, corner_radius=8, border_width=2)
+        self.frame_audio_file.pack(padx=20, pady=[0,10], anchor='w')
+
+        self.button_audio_file_name = ctk.CTkButton(self.frame_audio_file, width=200, corner_radius=8, bg_color='transparent', 
+                                                    fg_color='transparent', hover_color=self.frame_audio_file._bg_color, 
+                                                    border_width=0, anchor='w',  
+                                                    text=t('label_audio_file_name'), command=self.button_audio_file_event)
+        self.button_audio_file_name.place(x=3, y=3)
+
+        self.button_audio_file = ctk.CTkButton(self.frame_audio_file, width=45, height=29, text='📂', command=self.button_audio_file_event)
+        self.button_audio_file.place(x=213, y=2)
+
+        # input transcript file name
+        self.label_transcript_file = ctk.CTkLabel(self.scrollable_options, text=t('label_transcript_file'))
+        self.label_transcript_file.pack(padx=20, pady=[10,0], anchor='w')
+
+        self.frame_transcript_file = ctk.CTkFrame(self.scrollable_options, width=260, height=33, corner_radius=8, border_width=2)
+        self.frame_transcript_file.pack(padx=20, pady=[0,10], anchor='w')
+
+        self.button_transcript_file_name = ctk.CTkButton(self.frame_transcript_file, width=200, corner_radius=8, bg_color='transparent', 
+                                                    fg_color='transparent', hover_color=self.frame_transcript_file._bg_color, 
+                                                    border_width=0, anchor='w',  
+                                                    text=t('label_transcript_file_name'), command=self.button_transcript_file_event)
+        self.button_transcript_file_name.place(x=3, y=3)
+
+        self.button_transcript_file = ctk.CTkButton(self.frame_transcript_file, width=45, height=29, text='📂', command=self.button_transcript_file_event)
+        self.button_transcript_file.place(x=213, y=2)
+
+        # Options grid
+        self.frame_options = ctk.CTkFrame(self.scrollable_options, width=250, fg_color='transparent')
+        self.frame_options.pack_propagate(False)
+        self.frame_options.pack(padx=20, pady=10, anchor='w', fill='x')
+
+        # self.frame_options.grid_configure .resizable(width=False, height=True)
+        self.frame_options.grid_columnconfigure(0, weight=1, minsize=0)
+        self.frame_options.grid_columnconfigure(1, weight=0)
+
+        # Start/stop
+        self.label_start = ctk.CTkLabel(self.frame_options, text=t('label_start'))
+        self.label_start.grid(column=0, row=0, sticky='w', pady=[0,5])
+
+        self.entry_start = TimeEntry(self.frame_options, width=100)
+        self.entry_start.grid(column='1', row='0', sticky='e', pady=[0,5])
+        self.entry_start.insert(0, '00:00:00')
+
+        self.label_stop = ctk.CTkLabel(self.frame_options, text=t('label_stop'))
+        self.label_stop.grid(column=0, row=1, sticky='w', pady=[5,10])
+
+        self.entry_stop = TimeEntry(self.frame_options, width=100)
+        self.entry_stop.grid(column='1', row='1', sticky='e', pady=[5,10])
+
+        # language
+        self.label_language = ctk.CTkLabel(self.frame_options, text=t('label_language'))
+        self.label_language.grid(column=0, row=2, sticky='w', pady=5)
+
+        self.option_menu_language = ctk.CTkOptionMenu(self.frame_options, width=100, values=list(languages.keys()), dynamic_resizing=False)
+        self.option_menu_language.grid(column=1, row=2, sticky='e', pady=5)
+        last_language = get_config('last_language', 'auto')
+        if last_language in languages.keys():
+            self.option_menu_language.set(last_language)
+        else:
+            self.option_menu_language.set('Auto')
+        
+        # Whisper Model Selection   
+        class CustomCTkOptionMenu(ctk.CTkOptionMenu):
+            # Custom version that reads available models on drop down
+            def __init__(self, noScribe_parent, master, width = 140, height = 28, corner_radius = None, bg_color = "transparent", fg_color = None, button_color = None, button_hover_color = None, text_color = None, text_color_disabled = None, dropdown_fg_color = None, dropdown_hover_color = None, dropdown_text_color = None, font = None, dropdown_font = None, values = None, variable = None, state = tk.NORMAL, hover = True, command = None, dynamic_resizing = True, anchor = "w", **kwargs):
+                super().__init__(master, width, height, corner_radius, bg_color, fg_color, button_color, button_hover_color, text_color, text_color_disabled, dropdown_fg_color, dropdown_hover_color, dropdown_text_color, font, dropdown_font, values, variable, state, hover, command, dynamic_resizing, anchor, **kwargs)
+                self.noScribe_parent = noScribe_parent
+                self.old_value = ''
+
+            def _clicked(self, event=0):
+                self.old_value = self.get()
+                self._values = self.noScribe_parent.get_whisper_models()
+                self._values.append('--------------------')
+                self._values.append(t('label_add_custom_models'))
+                self._dropdown_menu.configure(values=self._values)
+                super()._clicked(event)
+                
+            def _dropdown_callback(self, value: str):
+                if value == self._values[-2]:  # divider
+                    return
+                if value == self._values[-1]:  # Add custom model
+                    # show custom model folder
+                    path = self.noScribe_parent.user_models_dir
+                    try:
+                        os_type = platform.system()
+                        if os_type == "Windows":
+                            os.startfile(path)
+                        elif os_type == "Darwin":
+                            run(["open", path])
+                        elif os_type == "Linux":
+                            run(["xdg-open", path])
+                        else:
+                            raise OSError(f"Unsupported operating system: {os_type}")
+                    except Exception as e:
+                        self.noScribe_parent.logn(f"Failed to open folder: {e}")
+                else:
+                    super()._dropdown_callback(value)
+        
+        self.label_whisper_model = ctk.CTkLabel(self.frame_options, text=t('label_whisper_model'))
+        self.label_whisper_model.grid(column=0, row=3, sticky='w', pady=5)
+
+        # The model folders are scanned after the window is shown (see _load_whisper_models())
+        last_whisper_model = get_config('last_whisper_model', 'precise')
+        self.option_menu_whisper_model = CustomCTkOptionMenu(self, 
+                                                       self.frame_options, 
+                                                       width=100,
+                                                       values=[last_whisper_model],
+                                                       dynamic_resizing=False)
+        self.option_menu_whisper_model.grid(column=1, row=3, sticky='e', pady=5)
+        self.option_menu_whisper_model.set(last_whisper_model)
+
+        # Mark pauses
+        self.label_pause = ctk.CTkLabel(self.frame_options, text=t('label_pause'))
+        self.label_pause.grid(column=0, row=4, sticky='w', pady=5)
+
+        self.option_menu_pause = ctk.CTkOptionMenu(self.frame_options, width=100, values=['none', '1sec+', '2sec+', '3sec+'])
+        self.option_menu_pause.grid(column=1, row=4, sticky='e', pady=5)
+        self.option_menu_pause.set(get_config('last_pause', '1sec+'))
+
+        # Speaker Detection (Diarization)
+        self.label_speaker = ctk.CTkLabel(self.frame_options, text=t('label_speaker'))
+        self.label_speaker.grid(column=0, row=5, sticky='w', pady=5)
+
+        self.option_menu_speaker = ctk.CTkOptionMenu(self.frame_options, width=100, values=['none', 'auto', '1', '2', '3', '4', '5', '6', '7', '8', '9', '10'])
+        self.option_menu_speaker.grid(column=1, row=5, sticky='e', pady=5)
+        self.option_menu_speaker.set(get_config('last_speaker', 'auto'))
+
+        # Overlapping Speech (Diarization)
+        self.label_overlapping = ctk.CTkLabel(self.frame_options, text=t('label_overlapping'))
+        self.label_overlapping.grid(column=0, row=6, sticky='w', pady=5)
+
+        self.check_box_overlapping = ctk.CTkCheckBox(self.frame_options, text = '')
+        self.check_box_overlapping.grid(column=1, row=6, sticky='e', pady=5)
+        overlapping = config.get('last_overlapping', True)
+        if overlapping:
+            self.check_box_overlapping.select()
+        else:
+            self.check_box_overlapping.deselect()
+            
+        # Disfluencies
+        self.label_disfluencies = ctk.CTkLabel(self.frame_options, text=t('label_disfluencies'))
+        self.label_disfluencies.grid(column=0, row=7, sticky='w', pady=5)
+
+        self.check_box_disfluencies = ctk.CTkCheckBox(self.frame_options, text = '')
+        self.check_box_disfluencies.grid(column=1, row=7, sticky='e', pady=5)
+        check_box_disfluencies = config.get('last_disfluencies', True)
+        if check_box_disfluencies:
+            self.check_box_disfluencies.select()
+        else:
+            self.check_box_disfluencies.deselect()
+
+        # Timestamps in text
+        self.label_timestamps = ctk.CTkLabel(self.frame_options, text=t('label_timestamps'))
+        self.label_timestamps.grid(column=0, row=8, sticky='w', pady=5)
+
+        self.check_box_timestamps = ctk.CTkCheckBox(self.frame_options, text = '')
+        self.check_box_timestamps.grid(column=1, row=8, sticky='e', pady=5)
+        check_box_timestamps = config.get('last_timestamps', False)
+        if check_box_timestamps:
+            self.check_box_timestamps.select()
+        else:
+            self.check_box_timestamps.deselect()
+        
+        # Decoding profile (speed vs. accuracy)
+        self.label_profile = ctk.CTkLabel(self.frame_options, text=t('label_decoding_profile'))
+        self.label_profile.grid(column=0, row=9, sticky='w', pady=5)
+
+        profiles = decoding_profile_names()
+        self.option_menu_profile = ctk.CTkOptionMenu(self.frame_options, width=100, values=profiles, dynamic_resizing=False)
+        self.option_menu_profile.grid(column=1, row=9, sticky='e', pady=5)
+        last_profile = get_config('last_decoding_profile', get_config('decoding_profile', 'balanced'))
+        self.option_menu_profile.set(last_profile if last_profile in profiles else 'balanced')
+
+        # Start control: single CTkOptionMenu styled like a button
+        # Create a container so we can show/hide as one control
+        self.start_button_container = ctk.CTkFrame(self.sidebar_frame, fg_color='transparent')
+        self.start_button_container.pack(padx=[30,30], pady=[20,30], expand=False, fill='x', anchor='sw')
+
+        class StartActionOptionMenu(ctk.CTkOptionMenu):
+            """A full-width option menu that looks like a button.
+            - Left-click (main area) runs Start immediately.
+            - Clicking the arrow opens a dropdown with 'Send to queue'.
+            """
+            def __init__(self, noScribe_parent, master, **kwargs):
+                # Style to match CTkButton
+                btn_theme = ctk.ThemeManager.theme.get('CTkButton', {})
+                kwargs.setdefault('height', 42)
+                kwargs.setdefault('dynamic_resizing', False)
+                kwargs.setdefault('anchor', 'center')
+                kwargs.setdefault('fg_color', btn_theme.get('fg_color'))
+                kwargs.setdefault('button_color', btn_theme.get('hover_color'))
+                kwargs.setdefault('button_hover_color', btn_theme.get('hover_color'))
+
+                super().__init__(master, values=['Start'], **kwargs)
+                self.noScribe_parent = noScribe_parent
+                try:
+                    self.set(t('start_button'))
+                except Exception:
+                    self.set('Start')
+                # Bind click on the text label to run Start immediately
+                try:
+                    self._text_label.bind("<Button-1>", self._on_text_label_click)
+                except Exception:
+                    pass
+
+            def _clicked(self, event=None):
+                # Open dropdown with the single queue action for non-text-label clicks
+                try:
+                    self._values = [t('send_queue'), t('start_queue')]
+                    self._dropdown_menu.configure(values=self._values)
+                except Exception:
+                    pass
+                super()._clicked(event)
+
+            def _dropdown_callback(self, value: str):
+                if value == t('send_queue'):
+                    try:
+                        self.noScribe_parent.create_job(enqueue=True)
+                    finally:
+                        try:
+                            self.set(t('start_button'))
+                        except Exception:
+                            self.set('Start')
+                elif value == t('start_queue'):
+                    try:
+                        self.noScribe_parent.create_job(enqueue=False)
+                    finally:
+                        try:
+                            self.set(t('start_button'))
+                        except Exception:
+                            self.set('Start')
+                else:
+                    super()._dropdown_callback(value)
+
+            def _on_text_label_click(self, event):
+                try:
+                    self.noScribe_parent.create_job(enqueue=False)
+                except Exception:
+                    pass
+                return "break"
+
+        self.start_action_menu = StartActionOptionMenu(self, self.start_button_container)
+        self.start_action_menu.pack(padx=[0,0], fill='x', expand=True)
+        
+        # create queue view and log textbox
+        self.frame_right = ctk.CTkFrame(self.frame_main, corner_radius=0, fg_color='transparent')
+        self.frame_right.pack(padx=0, pady=0, fill='both', expand=True, side='top')
+        
+        self.tabview = ctk.CTkTabview(self.frame_right, anchor="nw", border_width=0, fg_color='transparent', corner_radius=0,
+                                      command=self.on_tab_changed)
+        self.tabview.pack(padx=[10,30], pady=[0,30], fill='both', expand=True, side='top')
+        self.tab_log = self.tabview.add(t("tab_log")) 
+        self.tab_queue = self.tabview.add(t("tab_queue")) 
+        self.tabview.set(t("tab_log"))  # set currently visible tab
+
+        self.log_frame = ctk.CTkFrame(self.tab_log, fg_color='transparent', border_width=1, corner_radius=0)
+        self.log_frame.pack(padx=0, pady=0, expand=True, fill='both')
+        self.log_textbox = ctk.CTkTextbox(self.log_frame, wrap='word', state="disabled", font=("",16), text_color="lightgray", bg_color='transparent', fg_color='transparent')
+        self.log_textbox.tag_config('highlight', foreground='darkorange')
+        self.log_textbox.tag_config('error', foreground='yellow')
+        self.log_textbox.pack(padx=5, pady=5, expand=True, fill='both')
+        self.log_len = 0
+        
+        self.log_progress_frame = ctk.CTkFrame(self.log_frame, fg_color='transparent')
+        self.log_progress_frame.pack(padx=10, pady=10, fill='x', expand=False, anchor='center') 
+        self.log_edit_btn = ctk.CTkButton(
+            self.log_progress_frame,
+            text=t('editor_button'),
+            width=100,
+            fg_color=self.log_textbox._scrollbar_button_color,            
+            command=lambda: self.launch_editor()
+        )
+        self.log_edit_btn.pack(side='right', padx=(0, 0), pady=0)
+        self.log_stop_btn = ctk.CTkButton(
+            self.log_progress_frame,
+            text=t('stop_button'),
+            fg_color='darkred',
+            hover_color='darkred',
+            width=100,
+            state=ctk.DISABLED,
+            command=lambda: self.on_queue_stop()
+        )
+        self.log_stop_btn.pack(side='right', padx=(0, 10), pady=0)
+
+        self.log_progress_bar = ctk.CTkProgressBar(self.log_progress_frame, mode='determinate', fg_color="gray17")
+        self.log_progress_bar.set(0)
+        
+        self.hyperlink = HyperlinkManager(self.log_textbox._textbox)
+
+        # The contents of the queue tab are built after the window is shown (see _build_queue_tab())
+        self.queue_row_widgets = {} # Mapping for diff-based queue rows (job_key -> widgets)
+        self._queue_tab_built = False
+
+        self.update_scrollbar_visibility()        
+
+        self.logn(t('welcome_message'), 'highlight')
+        self.log(t('welcome_credits', v=app_version, y=app_year))
+        self.logn('https://github.com/kaixxx/noScribe', link='https://github.com/kaixxx/noScribe#readme')
+        self.logn(t('welcome_instructions'))
+        
+        # Everything that is not visible at first is done after the first frame (see _on_first_frame()),
+        # so that the window appears as fast as possible
+        self._deferred_init = [self._build_queue_tab, self._load_whisper_models, self._check_for_update]
+        self._first_frame_ms = None
+        self.bind('<Map>', self._on_first_frame, add='+')
+            
+    # Deferred parts of the window
+
+    def _on_first_frame(self, event=None):
+        """ The main window is on screen: measure the time it took, then build the rest """
+        if self._first_frame_ms is not None:
+            return
+        self.update_idletasks() # draw the window
+        self._first_frame_ms = startup_profile.elapsed() * 1000
+        startup_profile.mark('first frame')
+        self.after(10, self._run_deferred_init)
+
+    def _run_deferred_init(self):
+        """ Do the next step of _deferred_init, one per event loop turn to keep the window responsive """
+        if self._deferred_init:
+            step = self._deferred_init.pop(0)
+            try:
+                step()
+            except Exception as e:
+                self.logn(f'Error while setting up the window: {e}', 'error')
+            self.after(1, self._run_deferred_init)
+        else:
+            startup_profile.mark('window complete')
+            print(f'Main window shown after {self._first_frame_ms:.0f} ms, '
+                  f'complete after {startup_profile.elapsed() * 1000:.0f} ms')
+
+    def _build_queue_tab(self):
+        """ Create the contents of the queue tab (on first display or after the first frame) """
+        if self._queue_tab_built:
+            return
+        self._queue_tab_built = True
+        
+        self.queue_frame = ctk.CTkFrame(self.tab_queue, fg_color='transparent', border_width=1, corner_radius=0)
+        self.queue_frame.pack(padx=0, pady=0, expand=True, fill='both')        
+        self.queue_frame = ctk.CTkFrame(self.queue_frame, fg_color='transparent')
+        self.queue_frame.pack(padx=5, pady=5, fill='both', expand=True)
+                
+        # Scrollable frame for queue entries
+        self.queue_scrollable = ctk.CTkScrollableFrame(self.queue_frame, bg_color='transparent', fg_color='transparent')
+        self.queue_scrollable.pack(fill='both', expand=True, padx=0, pady=(0, 0))
+
+        # Controls row at the bottom of the queue tab
+        self.queue_controls_frame = ctk.CTkFrame(self.queue_frame, fg_color='transparent')
+        self.queue_controls_frame.pack(fill='x', side='bottom', padx=0, pady=(0, 0))
+
+        self.queue_edit_btn = ctk.CTkButton(
+            self.queue_controls_frame,
+            text=t('editor_button'),
+            width=100,
+            fg_color=self.log_textbox._scrollbar_button_color,            
+            command=lambda: self.launch_editor()
+        )
+        self.queue_edit_btn.pack(side='right', padx=(0, 5), pady=5)
+
+        self.queue_stop_btn = ctk.CTkButton(
+            self.queue_controls_frame,
+            text=t('stop_button'),
+            fg_color='darkred',
+            hover_color='darkred',
+            width=100,
+            command=lambda: self.on_queue_stop()
+        )
+        self.queue_stop_btn.pack(side='right', padx=(0, 10), pady=5)
+
+        self.queue_run_btn = ctk.CTkButton(
+            self.queue_controls_frame,
+            text=t('queue_run_button'),
+            width=100,
+            command=lambda: self.on_queue_run()
+        )
+        self.queue_run_btn.pack(side='right', padx=(0, 10), pady=5)
+
+        self.update_queue_table()
+
+    def on_tab_changed(self):
+        if self.tabview.get() == self.tabview._name_list[1]:
+            self._build_queue_tab()
+
+    def show_queue_tab(self):
+        self._build_queue_tab()
+        self.tabview.set(self.tabview._name_list[1])
+
+    def _load_whisper_models(self):
+        """ Scan the model folders and fill the model menu (after the first frame) """
+        os.makedirs(self.user_models_dir, exist_ok=True)
+        whisper_models_readme = os.path.join(self.user_models_dir, 'readme.txt')
+        if not os.path.exists(whisper_models_readme):
+            with open(whisper_models_readme, 'w') as file:
+                file.write('You can download custom Whisper-models for the transcription into this folder. \n' 
+                           'See here for more information: https://github.com/kaixxx/noScribe/wiki/Add-custom-Whisper-models-for-transcription')            
+        models = self.get_whisper_models()
+        self.option_menu_whisper_model.configure(values=models)
+        if self.option_menu_whisper_model.get() not in models and len(models) > 0:
+            self.option_menu_whisper_model.set(models[0])
+
+    def _check_for_update(self):
+        """ Look for a new release in the background (the request may take a while) """
+        if get_config('check_for_update', 'True') == 'True':
+            Thread(target=self._show_new_release, daemon=True).start()
+
+    def _show_new_release(self):
+        import urllib.request
+        try:
+            latest_release = json.loads(urllib.request.urlopen(
+                urllib.request.Request('https://api.github.com/repos/kaixxx/noScribe/releases/latest',
+                headers={'Accept': 'application/vnd.github.v3+json'},),
+                timeout=2).read())
+            latest_release_version = str(latest_release['tag_name']).lstrip('v')
+            if version_higher(latest_release_version, app_version, subversion_level=1) == 1:
+                # Only major release changes like 0.6 ->_0.7 (subversion_level 1) are indicated in the
+                # UI, not smaller subversion like 0.7.3 -> 0.7.4
+                self.logn(t('new_release', v=latest_release_version), 'highlight')
+                self.logn(str(latest_release['body'])) # release info
+                self.log(t('new_release_download'))
+                self.logn(str(latest_release['html_url']), link=str(latest_release['html_url']))
+                self.logn()
+        except:
+            pass
+
+    # Events and Methods
+
+    def get_whisper_models(self):
+        self.whisper_model_paths = find_whisper_models(log=lambda msg: self.logn(msg, 'error'))
+        return list(self.whisper_model_paths.keys())
+    
+    def on_whisper_model_selected(self, value):
+        print(self.option_menu_whisper_model.old_value)
+        print(value)
+        
+    def on_resize(self, event):
+        self.update_scrollbar_visibility()
+
+    def update_scrollbar_visibility(self):
+        # Get the size of the scroll region and current canvas size
+        canvas = self.scrollable_options._parent_canvas  
+        scroll_region_height = canvas.bbox("all")[3]
+        canvas_height = canvas.winfo_height()        
+        
+        scrollbar = self.scrollable_options._scrollbar
+
+        if scroll_region_height > canvas_height:
+            scrollbar.grid()
+        else:
+            scrollbar.grid_remove()  # Hide the scrollbar if not needed    
+                        
+    def restore_queue(self):
+        """Keep the queue in <config dir>/queue.sqlite and load the jobs of the last session
+        (GUI only, see 'persistent_queue' in the config). Jobs that were interrupted are waiting again."""
+        if get_config('persistent_queue', 'True') != 'True':
+            return
+        try:
+            self.queue.store = JobStore(os.path.join(config_dir, 'queue.sqlite'))
+            try:
+                history_days = float(get_config('queue_history_days', 30))
+            except ValueError:
+                history_days = 30
+            repeated = self.queue.restore(history_days)
+        except Exception as e:
+            self.logn(f'Cannot restore the job queue: {e}', 'error')
+            self.queue.detach_store()
+            return
+        if self.queue.jobs:
+            waiting = len(self.queue.get_waiting_jobs())
+            self.logn(f'Job queue restored: {len(self.queue.jobs)} jobs, {waiting} waiting '
+                      f'({repeated} interrupted jobs will be repeated).')
+            self.update_queue_table()
+
+    def update_queue_table(self):
+        """Update the queue table by diffing: update existing rows, add new ones, remove missing."""
+        if not self._queue_tab_built:
+            return # the whole table is created with the tab
+        current_keys = []
+        for i in range(len(self.queue.jobs)):
+            job = self.queue.jobs[i]
+            job_key = id(job)
+            current_keys.append(job_key)
+
+            # Compute display values
+            audio_name = os.path.basename(job.audio_file) if job.audio_file else "No file"
+            status_color = "lightgray"
+            job_tooltip = ''
+            if job.status == JobStatus.WAITING:
+                status_color = "gray"
+                job_tooltip = t('job_tt_waiting')
+            elif job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION]:
+                status_color = "orange"
+                audio_name = '\u23F5 ' + audio_name
+                job_tooltip = t('job_tt_running')
+            elif job.status == JobStatus.CANCELING:
+                status_color = "yellow"
+                audio_name = '\u23F5 ' + audio_name
+                job_tooltip = t('job_tt_canceling')
+            elif job.status == JobStatus.CANCELED:
+                status_color = "yellow"
+                job_tooltip = t('job_tt_canceled')
+            elif job.status == JobStatus.FINISHED:
+                status_color = "lightgreen"
+                job_tooltip = t('job_tt_finished')
+            elif job.status == JobStatus.ERROR:
+                status_color = "yellow"
+                msg = job.error_message if job.error_message else ''
+                job_tooltip = t('job_tt_error', error_msg=msg)
+
+            # Append a real, concise summary of the job's options
+            try:
+                job_tooltip += '\n\n' + job.format_summary()
+            except Exception:
+                pass
+
+            status_text = t(str(job.status.value))
+            
+            btn_color = ctk.ThemeManager.theme['CTkScrollbar']['button_color']
+
+            if hasattr(self, 'queue_row_widgets') and job_key in self.queue_row_widgets:
+                # Update existing row
+                row = self.queue_row_widgets[job_key]
+                # Update text directly on the JobEntryFrame canvas
+                row['frame'].set_name_text(audio_name)
+                row['frame'].set_status_text(status_text, status_color)
+                
+                # Update progress bar visibility based on job status
+                is_processing = job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION]
+                if is_processing:
+                    row['frame'].set_progress(job.progress, show_progress=True)
+                else:
+                    row['frame'].set_progress(0.0, show_progress=False)
+
+                # Add repeat button for status ERROR and CANCELED only
+                try:
+                    if job.status in [JobStatus.ERROR, JobStatus.CANCELED]:
+                        if 'repeat_btn' not in row or row['repeat_btn'] is None:
+                            repeat_btn = ctk.CTkButton(
+                                row['frame'],
+                                text='⟲',
+                                width=24,
+                                height=20,
+                                fg_color=btn_color,
+                                hover_color='darkred',
+                                command=lambda j=job: self._on_queue_row_repeat(j)
+                            )
+                            repeat_btn.pack(side='right', padx=(0, 4), pady=5)
+                            row['repeat_btn'] = repeat_btn
+                            row['repeat_tt'] = CTkToolTip(repeat_btn, text=t('queue_tt_repeat_job')) 
+                        else:
+                            if not row['repeat_btn'].winfo_ismapped():
+                                row['repeat_btn'].pack(side='right', padx=(0, 4), pady=2)
+                            row['repeat_btn'].configure(state=ctk.NORMAL, command=lambda j=job: self._on_queue_row_repeat(j))
+                    else:
+                        # hide the repeat button if it exists for other states
+                        if 'repeat_btn' in row and row['repeat_btn'] is not None:
+                            if row['repeat_btn'].winfo_ismapped():
+                                row['repeat_btn'].pack_forget()
+                except Exception:
+                    pass
+
+                # Cancel button for running jobs
+                if 'cancel_btn' in row and row['cancel_btn'] is not None:
+                    try:
+                        row['cancel_btn'].configure(command=lambda j=job: self._on_queue_row_action(j))
+                        # Color: red if running, gray otherwise
+                        if job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION]:
+                            row['cancel_btn'].configure(fg_color='darkred', hover_color='darkred')
+                        else:
+                            row['cancel_btn'].configure(fg_color=btn_color, hover_color='darkred')
+                        # Make sure it is visible
+                        if not row['cancel_btn'].winfo_ismapped():
+                            row['cancel_btn'].pack(side='right', padx=(0, 6), pady=2)
+                        # Update tooltip on the X button to reflect current status
+                        if job.status == JobStatus.WAITING:
+                            cancel_tt_text = t('queue_tt_remove_waiting')
+                        elif job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION, JobStatus.CANCELING]:
+                            cancel_tt_text = t('queue_tt_remove_entry')
+                        else:
+                            cancel_tt_text = t('queue_tt_remove_entry')
+                        if 'cancel_tt' in row and row['cancel_tt'] is not None:
+                            try:
+                                row['cancel_tt'].set_text(cancel_tt_text)
+                            except Exception:
+                                pass
+                    except Exception:
+                        pass
+
+                # Add "open partial" button for failed jobs with partial HTML transcript
+                try:
+                    if job.status in [JobStatus.ERROR, JobStatus.CANCELED] and getattr(job, 'has_partial_transcript', False):
+                        if 'partial_btn' not in row or row['partial_btn'] is None:
+                            partial_btn = ctk.CTkButton(
+                                row['frame'],
+                                text='✔',
+                                width=24,
+                                height=20,
+                                fg_color=btn_color,
+                                hover_color='darkred',
+                                command=lambda j=job: self._on_queue_row_open_partial(j)
+                            )
+                            partial_btn.pack(side='right', padx=(0, 4), pady=5)
+                            row['partial_btn'] = partial_btn
+                            row['partial_tt'] = CTkToolTip(partial_btn, text=t('queue_tt_open_partial_job')) 
+                        else:
+                            if not row['partial_btn'].winfo_ismapped():
+                                row['partial_btn'].pack(side='right', padx=(0, 4), pady=2)
+                            row['partial_btn'].configure(state=ctk.NORMAL, command=lambda j=job: self._on_queue_row_open_partial(j))
+                    else:
+                        # hide the partial button otherwise
+                        if 'partial_btn' in row and row['partial_btn'] is not None and row['partial_btn'].winfo_ismapped():
+                            row['partial_btn'].pack_forget()
+                except Exception:
+                    pass
+
+                # Add edit button for finished jobs
+                try:
+                    if job.status == JobStatus.FINISHED:
+                        if 'edit_btn' not in row or row['edit_btn'] is None:
+                            edit_btn = ctk.CTkButton(
+                                row['frame'],
+                                text='✔',
+                                width=24,
+                                height=20,
+                                fg_color=btn_color,
+                                hover_color='darkred',
+                                command=lambda j=job: self._on_queue_row_edit(j)
+                            )
+                            edit_btn.pack(side='right', padx=(0, 4), pady=5)
+                            row['edit_btn'] = edit_btn
+                            row['edit_tt'] = CTkToolTip(edit_btn, text=t('queue_tt_edit_job')) 
+                        else:
+                            if not row['edit_btn'].winfo_ismapped():
+                                row['edit_btn'].pack(side='right', padx=(0, 4), pady=2)
+                            row['edit_btn'].configure(state=ctk.NORMAL, command=lambda j=job: self._on_queue_row_edit(j))
+                    else:
+                        # hide the edit button if it exists for other states
+                        if 'edit_btn' in row and row['edit_btn'] is not None:
+                            if row['edit_btn'].winfo_ismapped():
+                                row['edit_btn'].pack_forget()
+                except Exception:
+                    pass
+
+                row['status'] = job.status
+                row['tooltip_text'] = job_tooltip
+                # Update tooltip messages if available
+                if 'tooltips' in row:
+                    for tt in row['tooltips']:
+                        tt.set_text(job_tooltip)
+            else:
+                # Create new row with progress bar background
+                fg_color = ctk.ThemeManager.theme['CTkSegmentedButton']['unselected_color'][1]
+                entry_frame = JobEntryFrame(self.queue_scrollable, progress=job.progress, progress_color=None, fg_color=fg_color)
+                entry_frame.pack(fill='x', padx=(0, 5), pady=2)
+                
+                # Set the text directly on the JobEntryFrame canvas
+                entry_frame.set_name_text(audio_name)
+                entry_frame.set_status_text(status_text, status_color)
+                
+                # Set progress bar visibility based on job status
+                is_processing = job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION]
+                if is_processing:
+                    entry_frame.set_progress(job.progress, show_progress=True)
+                else:
+                    entry_frame.set_progress(0.0, show_progress=False)
+
+                # Add small action buttons to job row
+                # X Button
+                cancel_btn = ctk.CTkButton(
+                    entry_frame,
+                    text='X',
+                    width=24,
+                    height=20,
+                    fg_color=('darkred' if job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION] else btn_color),
+                    hover_color=('darkred'),
+                    command=lambda j=job: self._on_queue_row_action(j)
+                )
+                cancel_btn.pack(side='right', padx=(0, 6), pady=5)   
+                # Tooltip for X button per status
+                if job.status == JobStatus.WAITING:
+                    cancel_tt_text = t('queue_tt_remove_waiting')
+                elif job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION]:
+                    cancel_tt_text = t('queue_tt_cancel_running')
+                else:
+                    cancel_tt_text = t('queue_tt_remove_entry')
+                cancel_tt = CTkToolTip(cancel_btn, text=cancel_tt_text)
+                
+                # Repeat button (job status canceled or error only)                               
+                repeat_btn = None
+                repeat_tt = None
+                if job.status in [JobStatus.ERROR, JobStatus.CANCELED]:
+                    repeat_btn = ctk.CTkButton(
+                        entry_frame,
+                        text='⟲',
+                        width=24,
+                        height=20,
+                        fg_color=btn_color,
+                        hover_color=('darkred'),
+                        command=lambda j=job: self._on_queue_row_repeat(j)
+                    )
+                    repeat_btn.pack(side='right', padx=(0, 4), pady=5)
+                    repeat_tt = CTkToolTip(repeat_btn, text=t('queue_tt_repeat_job'))
+
+                # Open partial button (failed job with partial transcript, HTML only)
+                partial_btn = None
+                partial_tt = None
+                if job.status in [JobStatus.ERROR, JobStatus.CANCELED] and getattr(job, 'has_partial_transcript', False):
+                    partial_btn = ctk.CTkButton(
+                        entry_frame,
+                        text='✔',
+                        width=24,
+                        height=20,
+                        fg_color=btn_color,
+                        hover_color='darkred',
+                        command=lambda j=job: self._on_queue_row_open_partial(j)
+                    )
+                    partial_btn.pack(side='right', padx=(0, 4), pady=5)
+                    partial_tt = CTkToolTip(partial_btn, text=t('queue_tt_open_partial_job'))
+
+                # Edit button (finished jobs only)
+                edit_btn = None
+                edit_tt = None
+                if job.status == JobStatus.FINISHED:
+                    edit_btn = ctk.CTkButton(
+                        entry_frame,
+                        text='✔',
+                        width=24,
+                        height=20,
+                        fg_color=btn_color,
+                        hover_color='darkred',
+                        command=lambda j=job: self._on_queue_row_edit(j)
+                    )
+                    edit_btn.pack(side='right', padx=(0, 4), pady=5)
+                    edit_tt = CTkToolTip(edit_btn, text=t('queue_tt_edit_job'))                 
+
+                # Row tooltip (create once per row)
+                tt_frame = CTkToolTip(entry_frame, text=job_tooltip) #, bg_color='gray')
+
+                if not hasattr(self, 'queue_row_widgets'):
+                    self.queue_row_widgets = {}
+                self.queue_row_widgets[job_key] = {
+                    'frame': entry_frame,
+                    'status': job.status,
+                    'tooltip_text': job_tooltip,
+                    'tooltips': [tt_frame],
+                    'cancel_btn': cancel_btn,
+                    'cancel_tt': cancel_tt,
+                    'repeat_btn': repeat_btn,
+                    'repeat_tt': repeat_tt,
+                    'partial_btn': partial_btn,
+                    'partial_tt': partial_tt,
+                    'edit_btn': edit_btn,
+                    'edit_tt': edit_tt
+                }
+
+        # Remove rows no longer present
+        if hasattr(self, 'queue_row_widgets'):
+            to_remove = [key for key in list(self.queue_row_widgets.keys()) if key not in current_keys]
+            for key in to_remove:
+                row = self.queue_row_widgets.pop(key)
+                if row['frame'].winfo_exists():
+                    row['frame'].destroy()
+                    
+        # Udate queue tab title
+        new_name = f'{t("tab_queue")} ({len(self.queue.jobs) - len(self.queue.get_waiting_jobs()) - len(self.queue.get_running_jobs())}/{len(self.queue.jobs)})'
+        old_name = self.tabview._name_list[1]
+        if new_name != old_name:
+            self.tabview.rename(old_name, new_name)
+            if self.tabview.get() == old_name:
+                self.tabview.set(new_name)
+        # Update controls state
+        try:
+            self.update_queue_controls()
+        except Exception:
+            pass
+
+    def update_queue_controls(self):
+        """Enable/disable and label the queue control buttons based on state."""
+        try:
+            has_running = len(self.queue.get_running_jobs()) > 0
+            has_pending = self.queue.has_pending_jobs()
+
+            # Run button: enabled only if there are pending jobs and nothing is running
+            self.queue_run_btn.configure(text=t('queue_run_button'))
+            if (not has_running) and has_pending:
+                self.queue_run_btn.configure(state=ctk.NORMAL)
+            else:
+                self.queue_run_btn.configure(state=ctk.DISABLED)
+
+            # Stop button: enabled if something is running or pending
+            if has_running or has_pending:
+                self.queue_stop_btn.configure(state=ctk.NORMAL)
+            else:
+                self.queue_stop_btn.configure(state=ctk.DISABLED)
+        except Exception:
+            pass
+
+    def on_queue_run(self):
+        """Start processing pending jobs if idle."""
+        try:
+            has_running = len(self.queue.get_running_jobs()) > 0
+            has_pending = self.queue.has_pending_jobs()
+            if (not has_running) and has_pending:
+                wkr = Thread(target=self.transcription_worker, args=(), daemon=True)
+                self._worker_threads.append(wkr)
+                wkr.start()
+            self.update_queue_controls()
+        except Exception:
+            pass
+
+    def on_queue_stop(self, ask_before_canceling=True) -> bool:
+        """Ask for confirmation, then cancel running job and mark all pending jobs as canceled.
+        Returns False if user does not confirm cancelation."""
+        try:
+            if (ask_before_canceling and
+                   (self.queue.is_running() or self.queue.has_pending_jobs()) and 
+                   not tk.messagebox.askyesno(title='noScribe', message=t('queue_cancel_all_confirm'))):
+                return False
+            self.engine.stop_queue()
+        except Exception:
+            pass
+        return True
+
+    def _on_queue_row_action(self, job: TranscriptionJob):
+        """Handle click on the small X button for a job row."""
+        try:
+            if job.status == JobStatus.WAITING:
+                # Confirm deletion of waiting job
+                if tk.messagebox.askyesno(title='noScribe', message=t('queue_remove_waiting')):
+                    try:
+                        self.queue.remove_job(job)
+                    except ValueError:
+                        pass
+                    # stop the pipeline stages that are preparing the job
+                    job.request_cancel()
+                    if job.stage_thread is None or not job.stage_thread.is_alive():
+                        job.release_prepared()
+                    self.update_queue_table()
+            elif job.status in [JobStatus.AUDIO_CONVERSION, JobStatus.SPEAKER_IDENTIFICATION, JobStatus.TRANSCRIPTION]:
+                # Confirm cancel of running job
+                if tk.messagebox.askyesno(title='noScribe', message=t('transcription_canceled')):
+                    self.logn()
+                    self.logn(t('start_canceling'))
+                    self.update()
+                    # reflect canceling state in queue immediately
+                    try:
+                        job.status = JobStatus.CANCELING
+                        self.update_queue_table()
+                    except Exception:
+                        pass
+                    # Only cancel this job, not the entire queue (other jobs may be running in parallel)
+                    job.request_cancel()
+            else:
+                # Finished, canceling or error -> remove from list after confirmation
+                if tk.messagebox.askyesno(title='noScribe', message=t('queue_remove_entry')):
+                    try:
+                        self.queue.remove_job(job)
+                    except ValueError:
+                        pass
+                    self.update_queue_table()
+        except Exception as e:
+            # Log any UI handling error silently
+            self.logn(f'Queue action error: {e}', 'error')
+
+    def _on_queue_row_repeat(self, job: TranscriptionJob):
+        """Repeat a job: set to WAITING if others are running, else start immediately."""
+        try:
+            if job.status not in [JobStatus.ERROR, JobStatus.CANCELED]:
+                return
+            # Confirm override if output file conflicts with other jobs (ignore this job itself)
+            if not self.confirm_output_override(job.transcript_file, ignore_job=job):
+                return
+            # reset job timing and messages
+            job.error_message = None
+            job.error_tb = None
+            job.started_at = None
+            job.finished_at = None
+            job.audio_fingerprint = '' # the file may have changed since
+            job.status = JobStatus.WAITING
+            self.update_queue_table()
+
+            has_running = len(self.queue.get_running_jobs()) > 0
+            if has_running:
+                return
+
+            # no running jobs: start this one immediately
+            try:
+                start_idx = self.queue.jobs.index(job)
+            except ValueError:
+                start_idx = None
+            if start_idx is not None:
+                wkr = Thread(target=self.transcription_worker, kwargs={"start_job_index": start_idx}, daemon=True)
+                self._worker_threads.append(wkr)
+                wkr.start()
+        except Exception as e:
+            self.logn(f'Queue repeat error: {e}', 'error')
+    
+    def _on_queue_row_edit(self, job: TranscriptionJob):
+        self.openLink(f'file://{job.transcript_file}')
+
+    def _on_queue_row_open_partial(self, job: TranscriptionJob):
+        """Open the partial transcript file (HTML in editor, TXT/VTT via default app)."""
+        try:
+            path = getattr(job, 'transcript_file', '') or ''
+            if not path or not os.path.exists(path):
+                try:
+                    self.logn(t('err_partial_not_found'), 'error')
+                except Exception:
+                    pass
+                try:
+                    tk.messagebox.showerror(title='noScribe', message=t('err_partial_not_found'))
+                except Exception:
+                    pass
+                return
+            try:
+                self.logn(t('log_open_partial', file=path))
+            except Exception:
+                pass
+            self.openLink(f'file://{path}')
+        except Exception:
+            pass
+
+    def launch_editor(self, file=''):
+        # Launch the editor in a seperate process so that in can stay running even if noScribe quits.
+        # Source: https://stackoverflow.com/questions/13243807/popen-waiting-for-child-process-even-when-the-immediate-child-has-terminated/13256908#13256908 
+        # set system/version dependent "start_new_session" analogs
+  
+        if file == '':
+            # get last finished job (if any)
+            jobs = self.queue.get_finished_jobs()
+            if len(jobs) > 0:
+                file = jobs[-1].transcript_file
+            
+        if file == '':
+            # no file or finished job to open
+            if not tk.messagebox.askyesno(title='noScribe', message=t('err_editor_no_file')):
+                return
+
+        ext = os.path.splitext(file)[1][1:]
+        if file != '' and ext != 'html':
+            # wrong format
+            file = ''
+            if not tk.messagebox.askyesno(title='noScribe', message=t('err_editor_invalid_format')):
+                return
+
+        program: str = None
+        if platform.system() == 'Windows':
+            program = os.path.join(app_dir, 'noScribeEdit', 'noScribeEdit.exe')
+        elif platform.system() == "Darwin": # = MAC
+            # use local copy in development, installed one if used as an app:
+            program = os.path.join(app_dir, 'noScribeEdit', 'noScribeEdit')
+            if not os.path.exists(program):
+                program = os.path.join(os.sep, 'Applications', 'noScribeEdit.app', 'Contents', 'MacOS', 'noScribeEdit')
+        elif platform.system() == "Linux":
+            if hasattr(sys, "_MEIPASS"):
+                program = os.path.join(sys._MEIPASS, 'noScribeEdit', "noScribeEdit")
+            else:
+                program = os.path.join(app_dir, 'noScribeEdit', "noScribeEdit.py")
+        kwargs = {}
+        if platform.system() == 'Windows':
+            # from msdn [1]
+            CREATE_NEW_PROCESS_GROUP = 0x00000200  # note: could get it from subprocess
+            DETACHED_PROCESS = 0x00000008          # 0x8 | 0x200 == 0x208
+            kwargs.update(creationflags=DETACHED_PROCESS | CREATE_NEW_PROCESS_GROUP)  
+        else:  # should work on all POSIX systems, Linux and macOS 
+            kwargs.update(start_new_session=True)
+
+        if program is not None and os.path.exists(program):
+            popenargs = [program]
+            if platform.system() == "Linux" and not hasattr(sys, "_MEIPASS"): # only do this, if you run as python script; Linux python vs. executable needs refinement
+                popenargs = [sys.executable, program]
+            if file != '':
+                popenargs.append(file)
+            Popen(popenargs, **kwargs)
+        else:
+            self.logn(t('err_noScribeEdit_not_found'), 'error')
+
+    def openLink(self, link: str) -> None:
+        if link.startswith('file://') and link.endswith('.html'):
+            self.launch_editor(link[7:])
+        else: 
+            webbrowser.open(link)
+    
+    def log(self, txt: str = '', tags: list = [], where: str = 'both', link: str = '', tb: str = '') -> None:
+        """ Log to main window and/or the log file of the current job (where can be 'screen', 'file', or 'both') 
+        tb = formatted traceback of the error, only logged to file
+        """
+        self.engine.log(txt, tags, where, link, tb)
+
+    def logn(self, txt: str = '', tags: list = [], where: str = 'both', link:str = '', tb: str = '') -> None:
+        """ Log with a newline appended """
+        self.log(f'{txt}\n', tags, where, link, tb)
+
+    def _show_log(self, txt: str, tags: list, link: str, replace: bool = False) -> None:
+        """ Show a log message in the main window (see Engine.on_log) """
+        if txt[:-1] != t('welcome_instructions'):
+            print(txt, end='')            
+        if hasattr(self, 'log_textbox') and self.log_textbox.winfo_exists():
+            try:
+                self.log_textbox.configure(state=tk.NORMAL)
+                if replace: # replace the last line
+                    tmp_txt = self.log_textbox.get("end-1c linestart", "end-1c")
+                    self.log_textbox.delete("end-1c linestart", "end-1c")
+                    self.log_len -= len(tmp_txt)
+                # To prevent slowing down the UI, limit the content of log_textbox to max 5000 characters
+                if self.log_len > 5000:
+                   self.log_textbox.delete("1.0", f"1.0 + {self.log_len - 3000} chars") # keep the last 3000
+                   self.log_len = 3000 
+                   
+                if link:
+                    tags = tags + self.hyperlink.add(partial(self.openLink, link))
+                                  
+                self.log_textbox.insert(tk.END, txt, tags)
+                self.log_textbox.yview_moveto(1)  # Scroll to last line
+                self.log_len += len(txt)
+                
+                # Schedule disabling the textbox in the main thread
+                self.log_textbox.after(0, lambda: self.log_textbox.configure(state=tk.DISABLED))
+            except Exception as e:
+                # Log screen errors only to file to prevent recursion
+                self.engine.log(f"Error updating log_textbox: {str(e)}\nOriginal error: {txt}", tags='error', where='file')
+
+
+    def create_default_transcript_names(self, dir=None):
+        self.transcript_files_list = []
+        if 'last_filetype' not in config:
+            config['last_filetype'] = 'html'
+
+        # Collect audio file names.
+        for f in self.audio_files_list:
+            f = Path(f)
+            if dir:
+                self.transcript_files_list.append(Path(dir) / f'{f.stem}.{config['last_filetype']}')
+            else:
+                self.transcript_files_list.append(f'{f.with_name(f.stem)}.{config['last_filetype']}')
+
+        # Ensure to not override anything and that we have unique file names.
+        # Make sure here that every file is a `Path`.
+        self.transcript_files_list = utils.create_unique_filenames([Path(x) for x in self.transcript_files_list])
+
+        if len(self.transcript_files_list) > 1:
+            self.button_transcript_file_name.configure(text=t('multiple_audio_files'))
+        elif len(self.transcript_files_list) == 1:
+            self.button_transcript_file_name.configure(text=self.transcript_files_list[0].name)
+        else:
+            self.button_transcript_file_name.configure(text='')
+
+        self.logn()
+        log_msg = t('log_transcript_filename')
+        for fn in self.transcript_files_list:
+            log_msg += f'\n{fn}'
+        self.logn(log_msg)
+
+    def button_audio_file_event(self):
+        fn = tk.filedialog.askopenfilename(initialdir=os.path.dirname(self.audio_files_list[0] if len(self.audio_files_list) > 0 else ''), 
+                                           initialfile=" ".join(f'"{os.path.basename(path)}"' for path in self.audio_files_list),  
+                                           multiple=True)
+        if fn and len(fn) > 0:
+            self.audio_files_list = fn
+            msg = t('log_audio_file_selected')
+            for f in fn:
+                msg += f'\n{f}'
+            self.logn()
+            self.logn(msg)
+            if len(fn) == 1:
+                self.button_audio_file_name.configure(text=os.path.basename(self.audio_files_list[0]))
+            else:
+                self.button_audio_file_name.configure(text=t('multiple_audio_files'))
+            self.create_default_transcript_names()
+
+    def button_transcript_file_event(self):
+        if len(self.audio_files_list) == 0:
+            # select audio first
+            tk.messagebox.showerror(title='noScribe', message=t('err_no_audio_file'))
+            return                    
+        if len(self.transcript_files_list) > 0:
+            _initialdir = os.path.dirname(self.transcript_files_list[0])
+            _initialfile = os.path.basename(self.transcript_files_list[0])
+        else:
+            _initialdir = ''
+            _initialfile = ''            
+        if not ('last_filetype' in config):
+            config['last_filetype'] = 'html'
+        filetypes = [
+            ('noScribe Transcript','*.html'), 
+            ('Text only','*.txt'),
+            ('WebVTT Subtitles (also for EXMARaLDA)', '*.vtt')
+        ]
+        for i, ft in enumerate(filetypes):
+            if ft[1] == f'*.{config["last_filetype"]}':
+                filetypes.insert(0, filetypes.pop(i))
+                break
+        
+        if len(self.audio_files_list) > 1:
+            # multiple audio files, select an output directory
+            tk.messagebox.showinfo(title='noScribe', message=t('output_dir_selection'))
+            dir = tk.filedialog.askdirectory(title="noScribe", initialdir=_initialdir)
+            if dir:
+                self.create_default_transcript_names(dir)
+            else:
+                return
+        else:
+            # single audio file, select an output file name
+            fn = tk.filedialog.asksaveasfilename(initialdir=_initialdir, initialfile=_initialfile, 
+                                                filetypes=filetypes, 
+                                                defaultextension=config['last_filetype'])
+            if fn:
+                self.transcript_files_list = [fn]
+                self.button_transcript_file_name.configure(text=os.path.basename(fn))
+                config['last_filetype'] = os.path.splitext(fn)[1][1:]
+            else:
+                return
+        
+        self.logn()
+        log_msg = t('log_transcript_filename')
+        for fn in self.transcript_files_list:
+            log_msg += f'\n{fn}'
+        self.logn(log_msg)
+        
+    def _show_progress(self, job, progress):
+        """ Update the progress bars (see Engine.on_progress): the one of `job` in the queue table
+        and the main bar, which shows the average of all running jobs """
+        if job is not None:
+            # Update the progress bar background for this job
+            job_key = id(job)
+            if hasattr(self, 'queue_row_widgets') and job_key in self.queue_row_widgets:
+                row = self.queue_row_widgets[job_key]
+                if hasattr(row['frame'], 'set_progress'):
+                    row['frame'].set_progress(job.progress)
+
+        if abs(progress - self.current_progress) < 0.01:
+            return
+        self.current_progress = progress
+        
+        # Update log_progress_bar
+        if self.current_progress > 0:
+            self.log_progress_bar.set(self.current_progress)
+            if not self.log_progress_bar.winfo_ismapped():
+                self.log_progress_bar.pack(padx=(0,10), pady=0, expand=True, fill='x', anchor='sw', side='left')
+                self.log_stop_btn.configure(state=ctk.NORMAL)
+        else:
+            self.log_progress_bar.set(0)
+            if self.log_progress_bar.winfo_ismapped():
+                self.log_progress_bar.pack_forget()
+                self.log_stop_btn.configure(state=ctk.DISABLED)
+
+
+    def collect_transcription_options(self) -> TranscriptionQueue:
+        """Collect all transcription options from UI and config and creates a 
+        TranscriptionQueue for each audio file"""
+        # Validate required inputs
+        if len(self.audio_files_list) == 0:
+            raise ValueError(t('err_no_audio_file'))
+        
+        if len(self.transcript_files_list) == 0:
+            raise ValueError(t('err_no_transcript_file'))
+        
+        # Parse time range from UI
+        start_time = None
+        val = self.entry_start.get()
+        if val != '':
+            start_time = utils.str_to_ms(val)
+        
+        stop_time = None
+        val = self.entry_stop.get()
+        if val != '':
+            stop_time = utils.str_to_ms(val)
+        
+        # Get whisper model path
+        sel_whisper_model = self.option_menu_whisper_model.get()
+        if sel_whisper_model not in self.whisper_model_paths.keys():
+            self.get_whisper_models() # not scanned yet or the model was added since
+        if sel_whisper_model not in self.whisper_model_paths.keys():
+            raise FileNotFoundError(f"The whisper model '{sel_whisper_model}' does not exist.")
+        whisper_model_path = self.whisper_model_paths[sel_whisper_model]
+        
+        queue = TranscriptionQueue()
+        if len(self.audio_files_list) != len(self.transcript_files_list):
+            self.create_default_transcript_names()
+        
+        for i in range(len(self.audio_files_list)):
+            job = create_transcription_job(
+                audio_file=self.audio_files_list[i],
+                transcript_file=self.transcript_files_list[i],
+                start_time=start_time,
+                stop_time=stop_time,
+                language_name=self.option_menu_language.get(),
+                whisper_model_name=whisper_model_path,  # Pass the full path
+                speaker_detection=self.option_menu_speaker.get(),
+                overlapping=self.check_box_overlapping.get(),
+                timestamps=self.check_box_timestamps.get(),
+                disfluencies=self.check_box_disfluencies.get(),
+                pause=self.option_menu_pause.get(),  # Pass string value
+                decoding_profile=self.option_menu_profile.get(),
+                cli_mode=False
+            )
+            # Handle VTT format warnings in GUI mode
+            if job.file_ext == 'vtt' and (job.pause > 0 or job.overlapping or job.timestamps):
+                self.logn()
+                self.logn(t('err_vtt_invalid_options'), 'error')
+            
+            queue.add_job(job)
+        
+        return queue
+
+    def transcription_worker(self, start_job_index=None, max_jobs=None):
+        """Process the jobs of the queue (see Engine.transcription_worker()), then open the
+        transcript in the editor (single job) or show the queue (several jobs)."""
+        self.engine.transcription_worker(start_job_index, max_jobs)
+        try:
+            # open editor if only a single file was processed
+            job = self.engine.last_finished_job
+            if self.engine.jobs_processed == 1 \
+                    and job \
+                    and job.file_ext == 'html' \
+                    and job.status == JobStatus.FINISHED \
+                    and get_config('auto_edit_transcript', 'True') == 'True':
+                self.launch_editor(job.transcript_file)
+            elif self.engine.jobs_processed > 1:
+                # if more than one job has been processed, switch to queue tab for an overview 
+                self.show_queue_tab()
+        except Exception as e:
+            self.logn(f"Queue processing error: {str(e)}", 'error')
+        try:
+            self.update_queue_controls()
+        except Exception:
+            pass
+
+            
+    def create_job(self, enqueue=False):
+        try:
+            show_queue_tab = enqueue
+            # Collect transcription options from UI
+            new_queue = self.collect_transcription_options()
+            
+            # Confirm override if output file conflicts with jobs in queue
+            for job in new_queue.jobs:
+                if self.queue.has_output_conflict(job.transcript_file):
+                    if not self.confirm_output_override(job.transcript_file):
+                        return
+                    else:
+                        break
+
+            # Add the jobs to the queue
+            for job in new_queue.jobs:
+                self.queue.add_job(job)            
+                if not enqueue and not self.queue.is_running(): # Start transcription worker with the queue
+                    wkr = Thread(target=self.transcription_worker, kwargs={"start_job_index": len(self.queue.jobs) - 1}, daemon=True)
+                    self._worker_threads.append(wkr)
+                    wkr.start()
+                    enqueue = True
+                else: # just add it to the queue
+                    show_queue_tab = True
+                    self.logn()
+                    self.logn(t('queue_added_job', audio_file=os.path.basename(job.audio_file)), 'highlight')
+            
+            self.update_queue_table()
+            if show_queue_tab:
+                try:
+                    self.show_queue_tab() # Switch to queue tab for visual feedback
+                except Exception:
+                    pass
+                            
+        except (ValueError, FileNotFoundError) as e:
+            # Handle validation errors from collect_transcription_options
+            self.logn(str(e), 'error')
+            tk.messagebox.showerror(title='noScribe', message=str(e))
+        except Exception as e:
+            # Handle unexpected errors
+            self.logn(f'Error starting transcription: {str(e)}', 'error')
+            tk.messagebox.showerror(title='noScribe', message=f'Error starting transcription: {str(e)}')
+
+    def confirm_output_override(self, transcript_file: str, ignore_job: Optional[TranscriptionJob] = None) -> bool:
+        """Prompt the user if a conflicting output file is found. Returns True to proceed."""
+        try:
+            if self.queue.has_output_conflict(transcript_file, ignore_job=ignore_job):
+                msg = t('output_override')
+                return tk.messagebox.askyesno(title='noScribe', message=msg)
+        except Exception:
+            pass
+        return True
+
+    
+    def on_closing(self):
+        # (see: https://stackoverflow.com/questions/111155/how-do-i-handle-the-window-close-event-in-tkinter)
+        #if messagebox.askokcancel("Quit", "Do you want to quit?"):
+
+        # Stop all running jobs:
+        try:
+            if self.queue.store is not None:
+                # The queue is kept on disk: waiting jobs stay waiting and running ones
+                # are repeated on the next start, so only ask if a job is interrupted.
+                if (self.queue.is_running() and
+                        not tk.messagebox.askyesno(title='noScribe', message=t('queue_cancel_all_confirm'))):
+                    return
+                self.queue.detach_store()
+                self.on_queue_stop(ask_before_canceling=False)
+            elif not self.on_queue_stop(ask_before_canceling=True):
+                return # user has aborted cancelation of waiting jobs
+        except:
+            pass
+
+        # Signal shutdown and try to stop background activity gracefully
+        self._shutting_down = True
+        self.engine.cancel = True
+        try:
+            # Terminate the child processes (diarization/whisper/ffmpeg) of all running jobs
+            for job in self.queue.get_running_jobs():
+                try:
+                    job.request_cancel()
+                except Exception:
+                    pass
+
+            # Shut down resident workers
+            self.engine.stop_services()
+
+            # Join worker threads briefly to give them a chance to exit
+            try:
+                for th in list(getattr(self, "_worker_threads", [])):
+                    try:
+                        th.join(timeout=2.0)
+                    except Exception:
+                        pass
+            except Exception:
+                pass
+        except Exception:
+            pass
+
+        # remember some settings for the next run
+        try:
+            config['last_language'] = self.option_menu_language.get()
+            config['last_speaker'] = self.option_menu_speaker.get()
+            config['last_whisper_model'] = self.option_menu_whisper_model.get()
+            config['last_pause'] = self.option_menu_pause.get()
+            config['last_overlapping'] = self.check_box_overlapping.get()
+            config['last_timestamps'] = self.check_box_timestamps.get()
+            config['last_disfluencies'] = self.check_box_disfluencies.get()
+            config['last_decoding_profile'] = self.option_menu_profile.get()
+            config['force_pyannote_cpu'] = str(force_pyannote_cpu)
+            config['force_whisper_cpu'] = str(force_whisper_cpu)
+
+            save_config()
+        finally:
+            try:
+                self.quit()
+            except Exception:
+                pass
+            self.destroy()
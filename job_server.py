@@ -0,0 +1,314 @@
+"""
+Local HTTP API for the transcription queue (python noScribe.py --serve).
+
+Other programs submit jobs to a running noScribe instead of starting it per
+file, so the resident workers with their loaded models are reused from one
+job to the next, and can follow the transcription while it runs:
+
+    POST   /jobs                 submit a job, JSON body with "audio_file",
+                                 "transcript_file" and the other parameters of
+                                 create_transcription_job() -> 201, the job
+    GET    /jobs                 all jobs of the queue
+    GET    /jobs/<id>            one job
+    POST   /jobs/<id>/cancel     cancel a waiting or running job
+    DELETE /jobs/<id>            remove a finished, failed or canceled job
+    GET    /jobs/<id>/segments   the transcribed segments as Server-Sent Events
+                                 ("segment", "status", and "end" when the job is
+                                 done), also those transcribed before the request.
+                                 Reconnecting clients send Last-Event-ID.
+    GET    /models               the installed Whisper models
+
+The server only listens on localhost. Every request needs the header
+"Authorization: Bearer <token>", the token is in <config dir>/server_token
+(readable for the current user only), so other users of the same computer
+cannot use it.
+"""
+
+import dataclasses
+import json
+import os
+import re
+import secrets
+import traceback
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Condition, Event, Thread
+
+import utils
+from engine import (Engine, JobStatus, TranscriptionJob, create_transcription_job,
+                    find_whisper_models, config_dir, t)
+
+# Parameters of create_transcription_job() that can be given when submitting a job
+JOB_OPTIONS = (
+    'audio_file', 'transcript_file', 'start_time', 'stop_time', 'language_name', 'whisper_model_name',
+    'speaker_detection', 'overlapping', 'timestamps', 'disfluencies', 'pause', 'batch_size',
+    'parallel_workers', 'word_alignment', 'decoding_profile',
+)
+
+DONE = (JobStatus.FINISHED, JobStatus.ERROR, JobStatus.CANCELED)
+
+KEEPALIVE_SECONDS = 15
+
+
+class RequestError(Exception):
+    """A request that cannot be handled, answered with `status` and the message"""
+
+    def __init__(self, status: HTTPStatus, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def job_info(job: TranscriptionJob) -> dict:
+    """The job as returned by the API: its settings (see TranscriptionJob.to_dict())
+    with "id", "status" and "progress" (0 to 1)"""
+    return dict(job.to_dict(), id=job.id, status=job.status.value, progress=round(job.progress, 3))
+
+
+def read_token(path: str) -> str:
+    """The access token in `path`, a new one is created if the file does not exist"""
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            token = f.read().strip()
+        if token:
+            return token
+    except OSError:
+        pass
+    token = secrets.token_urlsafe(32)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(token)
+    return token
+
+
+class JobServer(ThreadingHTTPServer):
+    """
+    Serves the queue of `engine` on http://127.0.0.1:`port`. A dispatcher thread
+    runs Engine.transcription_worker() whenever there are waiting jobs, with up to
+    `max_jobs` jobs at the same time (default: 'max_parallel_jobs' in the config).
+    The transcribed segments of every job are kept in memory until it is removed.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, engine: Engine, port: int = 8765, token: str = None, max_jobs: int = None):
+        super().__init__(('127.0.0.1', port), JobRequestHandler)
+        self.engine = engine
+        self.token = token or read_token(os.path.join(config_dir, 'server_token'))
+        self.max_jobs = max_jobs
+        self.changed = Condition()  # notified on every new segment and status change
+        self.segments = {}  # job id -> segments as dicts
+        self._wakeup = Event()
+        self._closing = False
+        engine.on_segment = self._on_segment
+        engine.on_jobs_changed = self._on_jobs_changed
+        self._dispatcher = Thread(target=self._dispatch, daemon=True)
+        self._dispatcher.start()
+
+    # Queue
+
+    def submit(self, options: dict) -> TranscriptionJob:
+        """Create a job from the parameters of create_transcription_job() and add it to the queue"""
+        unknown = sorted(set(options) - set(JOB_OPTIONS))
+        if unknown:
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Unknown options: {', '.join(unknown)}")
+        for name in ('audio_file', 'transcript_file'):
+            if not options.get(name):
+                raise RequestError(HTTPStatus.BAD_REQUEST, f'"{name}" is missing')
+        options = dict(options)
+        options['audio_file'] = os.path.abspath(options['audio_file'])
+        options['transcript_file'] = os.path.abspath(options['transcript_file'])
+        if not os.path.isfile(options['audio_file']):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Audio file '{options['audio_file']}' not found")
+        for name in ('start_time', 'stop_time'):
+            if isinstance(options.get(name), str):  # "hh:mm:ss"
+                try:
+                    options[name] = utils.str_to_ms(options[name])
+                except ValueError:
+                    raise RequestError(HTTPStatus.BAD_REQUEST, f'Invalid {name}: {options[name]}')
+        try:
+            job = create_transcription_job(**options)
+        except (ValueError, TypeError) as e:
+            raise RequestError(HTTPStatus.BAD_REQUEST, str(e))
+        if not os.path.isdir(job.whisper_model):
+            raise RequestError(HTTPStatus.BAD_REQUEST, f"Model '{job.whisper_model}' not found "
+                                                       f"(available: {', '.join(find_whisper_models())})")
+        if job.file_ext not in ('html', 'txt', 'vtt'):
+            raise RequestError(HTTPStatus.BAD_REQUEST, 'The transcript_file must end with .html, .txt or .vtt')
+        with self.changed:
+            if self.engine.queue.has_output_conflict(job.transcript_file):
+                raise RequestError(HTTPStatus.CONFLICT, f"Another job writes to '{job.transcript_file}'")
+            try:
+                os.makedirs(os.path.dirname(job.transcript_file), exist_ok=True)
+            except OSError as e:
+                raise RequestError(HTTPStatus.BAD_REQUEST, str(e))
+            self.segments[job.id] = []
+            self.engine.queue.add_job(job)
+        self._wakeup.set()
+        return job
+
+    def find_job(self, job_id: str) -> TranscriptionJob:
+        for job in list(self.engine.queue.jobs):
+            if job.id == job_id:
+                return job
+        raise RequestError(HTTPStatus.NOT_FOUND, f'No job {job_id}')
+
+    def cancel(self, job: TranscriptionJob):
+        if job.status == JobStatus.WAITING:
+            job.set_canceled(t('err_user_cancelation'))
+        elif job.status not in DONE:
+            if job.status != JobStatus.CANCELING:
+                job.status = JobStatus.CANCELING
+            job.request_cancel()
+        self._on_jobs_changed()
+
+    def remove(self, job: TranscriptionJob):
+        if job.status not in DONE:
+            raise RequestError(HTTPStatus.CONFLICT, 'The job is not done, cancel it first')
+        with self.changed:
+            self.engine.queue.remove_job(job)
+            self.segments.pop(job.id, None)
+            self.changed.notify_all()
+
+    def server_close(self):
+        """Cancel all jobs and wait until they have stopped (call shutdown() before
+        if serve_forever() runs in another thread)"""
+        self._closing = True
+        self.engine.stop_queue()
+        self._wakeup.set()
+        self._dispatcher.join()
+        super().server_close()
+
+    def _dispatch(self):
+        while True:
+            self._wakeup.wait()
+            self._wakeup.clear()
+            if self._closing:
+                return
+            while self.engine.queue.has_pending_jobs() and not self._closing:
+                self.engine.transcription_worker(max_jobs=self.max_jobs)
+
+    def _on_segment(self, job, segment):
+        with self.changed:
+            self.segments.setdefault(job.id, []).append(dataclasses.asdict(segment))
+            self.changed.notify_all()
+
+    def _on_jobs_changed(self):
+        with self.changed:
+            self.changed.notify_all()
+
+
+class JobRequestHandler(BaseHTTPRequestHandler):
+    server: JobServer
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        self._handle('GET')
+
+    def do_POST(self):
+        self._handle('POST')
+
+    def do_DELETE(self):
+        self._handle('DELETE')
+
+    def _handle(self, method: str):
+        self._responded = False
+        try:
+            if not secrets.compare_digest(self.headers.get('Authorization', '').encode('utf-8'),
+                                          f'Bearer {self.server.token}'.encode('utf-8')):
+                raise RequestError(HTTPStatus.UNAUTHORIZED, 'Missing or wrong access token')
+            path = self.path.split('?', 1)[0].rstrip('/')
+            m = re.fullmatch(r'/jobs/([0-9a-f]+)(/cancel|/segments)?', path)
+            if method == 'GET' and path == '/models':
+                self._send_json(HTTPStatus.OK, sorted(find_whisper_models()))
+            elif method == 'GET' and path == '/jobs':
+                self._send_json(HTTPStatus.OK, [job_info(job) for job in list(self.server.engine.queue.jobs)])
+            elif method == 'POST' and path == '/jobs':
+                job = self.server.submit(self._read_json())
+                self._send_json(HTTPStatus.CREATED, job_info(job))
+            elif m and method == 'GET' and m.group(2) is None:
+                self._send_json(HTTPStatus.OK, job_info(self.server.find_job(m.group(1))))
+            elif m and method == 'POST' and m.group(2) == '/cancel':
+                job = self.server.find_job(m.group(1))
+                self.server.cancel(job)
+                self._send_json(HTTPStatus.OK, job_info(job))
+            elif m and method == 'DELETE' and m.group(2) is None:
+                self.server.remove(self.server.find_job(m.group(1)))
+                self._send_json(HTTPStatus.OK, {'removed': m.group(1)})
+            elif m and method == 'GET' and m.group(2) == '/segments':
+                self._stream_segments(self.server.find_job(m.group(1)))
+            else:
+                raise RequestError(HTTPStatus.NOT_FOUND, f'No such endpoint: {method} {path}')
+        except RequestError as e:
+            self._send_error(e.status, str(e))
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+        except Exception as e:
+            self.log_error('%s', traceback.format_exc())
+            if self._responded:
+                self.close_connection = True
+            else:
+                self._send_error(HTTPStatus.INTERNAL_SERVER_ERROR, f'{type(e).__name__}: {e}')
+
+    def _read_json(self) -> dict:
+        try:
+            length = int(self.headers.get('Content-Length') or 0)
+            data = json.loads(self.rfile.read(length) or b'{}')
+        except ValueError:
+            raise RequestError(HTTPStatus.BAD_REQUEST, 'The body is not valid JSON')
+        if not isinstance(data, dict):
+            raise RequestError(HTTPStatus.BAD_REQUEST, 'The body must be a JSON object')
+        return data
+
+    def _send_json(self, status: HTTPStatus, data, close: bool = False):
+        body = json.dumps(data, ensure_ascii=False).encode('utf-8')
+        self._responded = True
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        if close:
+            self.send_header('Connection', 'close')
+            self.close_connection = True
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_error(self, status: HTTPStatus, message: str):
+        # The body of the request may not have been read, so it cannot be followed by another
+        # request on this connection
+        self._send_json(status, {'error': message}, close=True)
+
+    def _stream_segments(self, job: TranscriptionJob):
+        """Send the segments of `job` as they come in, until the job is done"""
+        try:
+            sent = int(self.headers.get('Last-Event-ID', -1)) + 1
+        except ValueError:
+            sent = 0
+        self._responded = True
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', 'text/event-stream; charset=utf-8')
+        self.send_header('Cache-Control', 'no-cache')
+        self.send_header('Connection', 'close')
+        self.end_headers()
+        self.close_connection = True
+        status = None
+        changed = self.server.changed
+        while True:
+            with changed:
+                segments = self.server.segments.get(job.id, [])
+                if len(segments) <= sent and job.status == status:
+                    changed.wait(KEEPALIVE_SECONDS)
+                segments = self.server.segments.get(job.id, [])
+                new, sent = list(enumerate(segments[sent:], sent)), max(len(segments), sent)
+                removed = job.id not in self.server.segments
+            events = []
+            for index, segment in new:
+                events.append(f'id: {index}\nevent: segment\ndata: {json.dumps(segment, ensure_ascii=False)}\n\n')
+            if job.status != status:
+                status = job.status
+                events.append(f'event: status\ndata: {json.dumps(job_info(job), ensure_ascii=False)}\n\n')
+            if status in DONE or removed:
+                events.append(f'event: end\ndata: {json.dumps(job_info(job), ensure_ascii=False)}\n\n')
+            self.wfile.write(''.join(events).encode('utf-8') if events else b': keepalive\n\n')
+            self.wfile.flush()
+            if status in DONE or removed:
+                return
@@ -0,0 +1,94 @@
+"""
+Durable storage of the transcription queue.
+
+The jobs of the queue are kept in a SQLite database in the config folder, one
+row per job with its status and settings. Every status change is written in
+its own transaction, so after closing the app or a crash the queue can be
+restored as it was: waiting jobs are waiting again, jobs that were running
+are repeated (see `TranscriptionQueue` in engine.py).
+"""
+
+import json
+import sqlite3
+import time
+from threading import Lock
+
+SCHEMA_VERSION = 1
+
+
+class JobStore:
+    """
+    Jobs as rows of (id, position, status, data), in queue order.
+
+    "data" is a JSON dict with the settings and results of the job (see
+    `TranscriptionJob.to_dict()`), the store does not interpret it. Jobs are
+    saved from several threads, the connection is shared and guarded by a lock.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS jobs ('
+                ' id TEXT PRIMARY KEY,'
+                ' position INTEGER NOT NULL,'
+                ' status TEXT NOT NULL,'
+                ' data TEXT NOT NULL,'
+                ' updated REAL NOT NULL)')
+            self._conn.execute(f'PRAGMA user_version={SCHEMA_VERSION}')
+
+    def save(self, job_id: str, status: str, data: dict):
+        """Insert or update a job. New jobs are added at the end of the queue."""
+        with self._lock, self._conn:
+            self._conn.execute(
+                'INSERT INTO jobs (id, position, status, data, updated) '
+                'VALUES (?, (SELECT COALESCE(MAX(position), 0) + 1 FROM jobs), ?, ?, ?) '
+                'ON CONFLICT(id) DO UPDATE SET status=excluded.status, data=excluded.data, updated=excluded.updated',
+                (job_id, status, json.dumps(data, ensure_ascii=False), time.time()))
+
+    def remove(self, job_id: str):
+        with self._lock, self._conn:
+            self._conn.execute('DELETE FROM jobs WHERE id=?', (job_id,))
+
+    def load(self) -> list:
+        """All jobs as (id, status, data) tuples in queue order. Rows with damaged
+        data are skipped."""
+        with self._lock:
+            rows = self._conn.execute('SELECT id, status, data FROM jobs ORDER BY position').fetchall()
+        ret = []
+        for job_id, status, data in rows:
+            try:
+                ret.append((job_id, status, json.loads(data)))
+            except ValueError:
+                continue
+        return ret
+
+    def recover(self, interrupted: list, retry_status: str) -> int:
+        """Set all jobs with one of the `interrupted` statuses (running when the app
+        was closed or crashed) to `retry_status`. Returns the number of jobs."""
+        if not interrupted:
+            return 0
+        marks = ','.join('?' * len(interrupted))
+        with self._lock, self._conn:
+            cur = self._conn.execute(f'UPDATE jobs SET status=?, updated=? WHERE status IN ({marks})',
+                                     (retry_status, time.time(), *interrupted))
+            return cur.rowcount
+
+    def prune(self, statuses: list, max_age_days: float) -> int:
+        """Remove jobs with one of `statuses` (finished ones) that have not changed
+        for `max_age_days`. Returns the number of removed jobs."""
+        if not statuses:
+            return 0
+        marks = ','.join('?' * len(statuses))
+        with self._lock, self._conn:
+            cur = self._conn.execute(f'DELETE FROM jobs WHERE status IN ({marks}) AND updated < ?',
+                                     (*statuses, time.time() - max_age_days * 86400))
+            return cur.rowcount
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
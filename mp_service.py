@@ -0,0 +1,128 @@
+"""
+Long-lived worker processes: the parent-side handle and the child-side helpers.
+
+A resident worker is a spawned child process that stays alive between jobs
+and receives its work over a request queue. This lets expensive state (loaded
+models, imported libraries) survive from one job of the queue to the next.
+"""
+
+import itertools
+import multiprocessing as mp
+import queue as pyqueue
+
+
+class ResidentWorker:
+    """
+    Owns a resident child process and its request/response queues.
+
+    The child is started lazily by `submit()` and restarted transparently if
+    it is found dead (crashed, or terminated by a cancel). The child target is
+    called as `target(req_q, resp_q, *args)` and must loop over `req_q` until
+    it receives `None`. Every request carries a unique `job_id` which the
+    child is expected to echo in all messages belonging to that job.
+    """
+
+    def __init__(self, target, args: tuple = (), name: str = 'noScribe worker'):
+        self._target = target
+        self._args = args
+        self._name = name
+        self._ctx = mp.get_context("spawn")
+        self._job_ids = itertools.count(1)
+        self.proc = None
+        self.req_q = None
+        self.resp_q = None
+        self.starts = 0  # number of times the child process has been (re)started
+
+    def is_alive(self) -> bool:
+        """Check if the child process is up. Closed or never started counts as dead."""
+        if self.proc is None:
+            return False
+        try:
+            return self.proc.is_alive()
+        except ValueError:
+            # process object has already been closed (e.g. by a cancel)
+            return False
+
+    def ensure_running(self) -> bool:
+        """Start the child process if it is not running.
+        Returns True if a new process had to be started."""
+        if self.is_alive():
+            return False
+        self._cleanup()
+        self.req_q = self._ctx.Queue()
+        self.resp_q = self._ctx.Queue()
+        self.proc = self._ctx.Process(target=self._target, args=(self.req_q, self.resp_q) + tuple(self._args),
+                                      name=self._name, daemon=True)
+        self.proc.start()
+        self.starts += 1
+        return True
+
+    def submit(self, args: dict) -> int:
+        """Send a job to the child (starting it if needed) and return its job id."""
+        self.ensure_running()
+        job_id = next(self._job_ids)
+        request = dict(args)
+        request['job_id'] = job_id
+        self.req_q.put(request)
+        return job_id
+
+    def get(self, timeout: float = 0.1):
+        """Get the next message from the child. Raises queue.Empty on timeout."""
+        if self.resp_q is None:
+            raise pyqueue.Empty
+        return self.resp_q.get(timeout=timeout)
+
+    def terminate(self):
+        """Kill the child immediately. It will be restarted by the next `submit()`."""
+        if self.is_alive():
+            try:
+                self.proc.terminate()
+            except Exception:
+                pass
+            try:
+                self.proc.join(timeout=1.0)
+            except Exception:
+                pass
+        self._cleanup()
+
+    def stop(self, timeout: float = 2.0):
+        """Ask the child to exit gracefully, terminate it if it does not react in time."""
+        if self.is_alive():
+            try:
+                self.req_q.put(None)
+                self.proc.join(timeout=timeout)
+            except Exception:
+                pass
+        self.terminate()
+
+    def _cleanup(self):
+        if self.proc is not None:
+            try:
+                self.proc.close()
+            except Exception:
+                pass
+        for q in (self.req_q, self.resp_q):
+            if q is not None:
+                try:
+                    q.close()
+                    q.cancel_join_thread()
+                except Exception:
+                    pass
+        self.proc = None
+        self.req_q = None
+        self.resp_q = None
+
+
+class JobQueue:
+    """
+    Child side: wraps the response queue and tags every message with the job id
+    of the request that is being processed (see `ResidentWorker`).
+    """
+
+    def __init__(self, q, job_id):
+        self._q = q
+        self._job_id = job_id
+
+    def put(self, msg):
+        msg['job_id'] = self._job_id
+        self._q.put(msg)
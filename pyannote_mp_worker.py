@@ -1,8 +1,8 @@
+import gc
 import os
 import platform
+import time
 import traceback
-from dataclasses import asdict, is_dataclass
-import os
 
 if platform.system() == "Darwin" and platform.machine() == "x86_64":
     os.environ.setdefault("OMP_NUM_THREADS", "1")
@@ -10,114 +10,220 @@ if platform.system() == "Darwin" and platform.machine() == "x86_64":
     os.environ.setdefault("MKL_THREADING_LAYER", "GNU")
     os.environ.setdefault("KMP_DUPLICATE_LIB_OK", "TRUE")  # temp workaround for iomp5 dup
 
+import utils
+from mp_service import JobQueue
+
+app_dir = os.path.abspath(os.path.dirname(__file__))
+
+
+def _resolve_device(requested: str) -> str:
+    """Map the requested device ('cpu' or '' for automatic) to the actual torch device."""
+    import torch
+    device = requested
+    if device != 'cpu':
+        if platform.system() == "Darwin":  # MAC
+            device = 'mps' if platform.mac_ver()[0] >= '12.3' and torch.backends.mps.is_available() else 'cpu'
+        elif platform.system() in ('Windows', 'Linux'):
+            try:
+                device = 'cuda' if torch.cuda.is_available() and torch.cuda.device_count() > 0 else 'cpu'
+            except:
+                device = 'cpu'
+        else:
+            raise Exception('Platform not supported yet.')
+    return device
+
+
+def _build_pipeline(device: str):
+    """Load the pyannote pipeline from the bundled config and move it to `device`."""
+    import yaml
+    import torch
+    from pyannote.audio import Pipeline
+    from tempfile import TemporaryDirectory
+
+    # Expand relative model paths to absolute paths inside app folder
+    with open(os.path.join(app_dir, 'pyannote', 'pyannote_config.yaml'), 'r') as yaml_file:
+        pyannote_config = yaml.safe_load(yaml_file)
+    pyannote_config['pipeline']['params']['embedding'] = os.path.join(
+        app_dir, *pyannote_config['pipeline']['params']['embedding'].split("/"))
+    pyannote_config['pipeline']['params']['segmentation'] = os.path.join(
+        app_dir, *pyannote_config['pipeline']['params']['segmentation'].split("/"))
+
+    with TemporaryDirectory('noScribe_diarize') as tmpdir:
+        tmp_cfg = os.path.join(tmpdir, 'pyannote_config_macOS.yaml')
+        with open(tmp_cfg, 'w') as yaml_file:
+            yaml.safe_dump(pyannote_config, yaml_file)
+        pipeline = Pipeline.from_pretrained(tmp_cfg)
+    pipeline.to(torch.device(device))
+    return pipeline
+
+
+def _set_num_threads(num_threads: int, default: int):
+    """Limit torch to `num_threads` for this job (0 = `default`), e.g. to share the
+    cores with a Whisper worker running at the same time."""
+    import torch
+    if platform.system() == "Darwin" and platform.machine() == "x86_64":
+        return  # fixed to 1, see below
+    torch.set_num_threads(num_threads if num_threads and num_threads > 0 else default)
+
+
+def _diarize(pipeline, args: dict, q) -> list:
+    """Run an already loaded pipeline on the job's audio, report progress to `q`.
+    The audio is taken from the shared memory block in `args["shared_audio"]` if
+    given, else loaded from `args["audio_path"]`."""
+
+    class SimpleProgressHook:
+        def __init__(self):
+            self.step_name = None
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def __call__(self, step_name, step_artifact, file=None, total=None, completed=None):
+            if completed is None:
+                completed = total = 1
+            pct = int(completed / total * 100) if total else 100
+            if pct > 100:
+                pct = 100
+            try:
+                q.put({"type": "progress", "step": str(step_name), "pct": pct})
+            except Exception:
+                pass
+
+    num_speakers = args.get("num_speakers")
+    shared = args.get("shared_audio")
+    shm = None
+    if shared:
+        # Decoded once by the parent, attach zero-copy and hand the waveform to pyannote
+        import torch
+        from shared_audio import attach_shared_audio
+        shm, audio = attach_shared_audio(shared)
+        audio_input = {
+            "waveform": torch.from_numpy(audio).unsqueeze(0),  # (channel, time)
+            "sample_rate": args.get("sample_rate", 16000),
+        }
+    else:
+        audio_input = args.get("audio_path")
+        if not os.path.exists(audio_input):
+            raise FileNotFoundError(audio_input)
+
+    seg_list = []
+    try:
+        with SimpleProgressHook() as hook:
+            if num_speakers is not None:
+                diarization = pipeline(audio_input, hook=hook, num_speakers=num_speakers)
+            else:
+                diarization = pipeline(audio_input, hook=hook)
+    finally:
+        if shm is not None:
+            from shared_audio import detach_shared_audio
+            audio = audio_input = None
+            gc.collect()
+            detach_shared_audio(shm)
+
+    for segment, _, label in diarization.itertracks(yield_label=True):
+        seg_list.append({
+            'start': int(segment.start * 1000),
+            'end': int((segment.start + segment.duration) * 1000),
+            'label': label,
+        })
+    return seg_list
+
+
+def _put_error(q, e):
+    try:
+        q.put({
+            "type": "result",
+            "ok": False,
+            "error": f"{type(e).__name__}: {e}",
+            "trace": traceback.format_exc(),
+        })
+    except Exception:
+        pass
+
+
 def pyannote_proc_entrypoint(args: dict, q):
     """Runs diarization in a child process and streams progress/logs.
     Messages:
       {"type":"log","level":"info|warn|error|debug","msg":str}
       {"type":"progress","step":str,"pct":int}
-      {"type":"result","ok":True,"segments":[{"start":ms,"end":ms,"label":str}]}
+      {"type":"result","ok":True,"packed":{...},"load_time":float,"job_time":float}
+       (packed segments [{"start":ms,"end":ms,"label":str}], see utils.pack_diarization)
       {"type":"result","ok":False,"error":str,"trace":str}
     """
     try:
-        import yaml
         import torch
         if platform.system() == "Darwin" and platform.machine() == "x86_64":
-           torch.set_num_threads(1)        
-        from pyannote.audio import Pipeline
-        from tempfile import TemporaryDirectory
+           torch.set_num_threads(1)
 
-        def plog(level, msg):
-            try:
-                q.put({"type": "log", "level": level, "msg": str(msg)})
-            except Exception:
-                pass
+        _set_num_threads(args.get("num_threads", 0), torch.get_num_threads())
 
-        class SimpleProgressHook:
-            def __init__(self):
-                self.step_name = None
-
-            def __enter__(self):
-                return self
-
-            def __exit__(self, *exc):
-                return False
-
-            def __call__(self, step_name, step_artifact, file=None, total=None, completed=None):
-                if completed is None:
-                    completed = total = 1
-                pct = int(completed / total * 100) if total else 100
-                if pct > 100:
-                    pct = 100
-                try:
-                    q.put({"type": "progress", "step": str(step_name), "pct": pct})
-                except Exception:
-                    pass
-
-        audio_file = args.get("audio_path")
-        num_speakers = args.get("num_speakers")
-        app_dir = os.path.abspath(os.path.dirname(__file__))
-        if not os.path.exists(audio_file):
-            raise FileNotFoundError(audio_file)
-
-        plog("debug", "Subprocess (diarize) started. Initializing PyAnnote pipeline...")
-        
-        # determine xpu
-        device = args.get("device", "")
-        if device != 'cpu':
-            if platform.system() == "Darwin":  # MAC
-                device = 'mps' if platform.mac_ver()[0] >= '12.3' and torch.backends.mps.is_available() else 'cpu'
-            elif platform.system() in ('Windows', 'Linux'):
-                try:
-                    device = 'cuda' if torch.cuda.is_available() and torch.cuda.device_count() > 0 else 'cpu'
-                except:
-                    device = 'cpu'
-            else:
-                raise Exception('Platform not supported yet.')
-
-        # Expand relative model paths to absolute paths inside app folder
-        with open(os.path.join(app_dir, 'pyannote', 'pyannote_config.yaml'), 'r') as yaml_file:
-            pyannote_config = yaml.safe_load(yaml_file)
-        pyannote_config['pipeline']['params']['embedding'] = os.path.join(
-            app_dir, *pyannote_config['pipeline']['params']['embedding'].split("/"))
-        pyannote_config['pipeline']['params']['segmentation'] = os.path.join(
-            app_dir, *pyannote_config['pipeline']['params']['segmentation'].split("/"))
-
-        tmpdir = TemporaryDirectory('noScribe_diarize')
-        tmp_cfg = os.path.join(tmpdir.name, 'pyannote_config_macOS.yaml')
-        with open(tmp_cfg, 'w') as yaml_file:
-            yaml.safe_dump(pyannote_config, yaml_file)
-
-        pipeline = Pipeline.from_pretrained(tmp_cfg)
-        pipeline.to(torch.device(device))
+        try:
+            q.put({"type": "log", "level": "debug",
+                   "msg": "Subprocess (diarize) started. Initializing PyAnnote pipeline..."})
+        except Exception:
+            pass
 
-        seg_list = []
-        with SimpleProgressHook() as hook:
-            if num_speakers is not None:
-                diarization = pipeline(audio_file, hook=hook, num_speakers=num_speakers)
-            else:
-                diarization = pipeline(audio_file, hook=hook)
+        load_start = time.perf_counter()
+        pipeline = _build_pipeline(_resolve_device(args.get("device", "")))
+        load_time = time.perf_counter() - load_start
 
-        for segment, _, label in diarization.itertracks(yield_label=True):
-            seg_list.append({
-                'start': int(segment.start * 1000),
-                'end': int((segment.start + segment.duration) * 1000),
-                'label': label,
-            })
+        job_start = time.perf_counter()
+        seg_list = _diarize(pipeline, args, q)
+        job_time = time.perf_counter() - job_start
 
         try:
-            q.put({"type": "result", "ok": True, "segments": seg_list})
+            q.put({"type": "result", "ok": True, "packed": utils.pack_diarization(seg_list),
+                   "load_time": load_time, "job_time": job_time})
         except Exception:
             pass
 
     except Exception as e:
-        try:
-            import traceback as tb
-            q.put({
-                "type": "result",
-                "ok": False,
-                "error": f"{type(e).__name__}: {e}",
-                "trace": tb.format_exc(),
-            })
-        except Exception:
-            pass
+        _put_error(q, e)
+
 
+def pyannote_service_entrypoint(req_q, q):
+    """Resident variant of `pyannote_proc_entrypoint` (see `mp_service.ResidentWorker`).
+    Takes jobs from `req_q` until it receives `None`. The pipeline is built once per
+    device and reused for all following jobs; `load_time` in the result is 0 if the
+    pipeline was already loaded. All messages carry the `job_id` of their job.
+    """
+    default_threads = 0
+    try:
+        import torch
+        if platform.system() == "Darwin" and platform.machine() == "x86_64":
+           torch.set_num_threads(1)
+        default_threads = torch.get_num_threads()
+    except Exception:
+        pass
+
+    pipelines = {}  # device -> pipeline
+    while True:
+        try:
+            args = req_q.get()
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+        if args is None:
+            break
+        job_q = JobQueue(q, args.get('job_id'))
+        try:
+            _set_num_threads(args.get("num_threads", 0), default_threads)
+            device = _resolve_device(args.get("device", ""))
+            load_time = 0.0
+            if device not in pipelines:
+                job_q.put({"type": "log", "level": "debug",
+                           "msg": f"Initializing PyAnnote pipeline on '{device}'..."})
+                load_start = time.perf_counter()
+                pipelines[device] = _build_pipeline(device)
+                load_time = time.perf_counter() - load_start
+
+            job_start = time.perf_counter()
+            seg_list = _diarize(pipelines[device], args, job_q)
+            job_time = time.perf_counter() - job_start
+
+            job_q.put({"type": "result", "ok": True, "packed": utils.pack_diarization(seg_list),
+                       "load_time": load_time, "job_time": job_time})
+        except Exception as e:
+            _put_error(job_q, e)
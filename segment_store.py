@@ -0,0 +1,153 @@
+"""
+Persistent store of finished transcriptions.
+
+For every transcribed recording, the raw segments streamed by the Whisper
+worker (with words), the speaker segments and the VAD result are kept as
+gzipped JSON in a `DiskCache`. With these, a transcript can be rendered again
+in any output format and with other rendering options (timestamps, pause
+markers, overlapping speech) without running the models, and identical audio
+is only transcribed once.
+
+While a transcription is running, its segments are also appended to a
+`SegmentJournal`, so that an interrupted job can be resumed where it stopped.
+"""
+
+import gzip
+import json
+import os
+import time
+
+from disk_cache import DiskCache
+
+# Precision of the timestamps in a transcription, see TranscriptionJob.needed_word_alignment()
+WORD_ALIGNMENT_LEVELS = ['off', 'segment', 'word']
+
+FORMAT_VERSION = 1
+
+
+class SegmentStore:
+    """
+    Transcriptions keyed by the audio and the options that change what
+    Whisper produces (see `segment_store_key()` in engine.py).
+
+    An entry is a dict with:
+      "segments": the segments as streamed by the worker
+      "speech_chunks": VAD result (speech chunks in samples)
+      "duration": length of the transcribed audio in seconds
+      "word_alignment": precision of the timestamps ('off', 'segment' or 'word')
+      "diarization": {speaker detection setting: speaker segments}
+    and some information about the source ("audio_file", "start", "stop", "model").
+    """
+
+    def __init__(self, cache: DiskCache):
+        self.cache = cache
+
+    def get(self, key: str, word_alignment: str = 'off'):
+        """The entry `key` if it exists and its timestamps are at least as precise
+        as `word_alignment`, else None."""
+        data = self.cache.get_bytes(key)
+        if data is None:
+            return None
+        try:
+            entry = json.loads(gzip.decompress(data).decode('utf-8'))
+        except (OSError, EOFError, ValueError):
+            return None  # damaged entry, treated as missing
+        if entry.get('version') != FORMAT_VERSION:
+            return None
+        if _level(entry.get('word_alignment')) < _level(word_alignment):
+            return None
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """Store `entry` under `key`. Speaker segments of an existing entry with the
+        same key are kept, so that the results of all speaker settings accumulate."""
+        old = self.get(key)
+        diarization = dict(old.get('diarization') or {}) if old else {}
+        diarization.update(entry.get('diarization') or {})
+        entry = dict(entry, version=FORMAT_VERSION, diarization=diarization)
+        self.cache.put_bytes(key, gzip.compress(json.dumps(entry, ensure_ascii=False).encode('utf-8')))
+
+
+class SegmentJournal:
+    """
+    Append-only log of the segments of a running transcription: a header line,
+    then one JSON line per segment as streamed by the worker. Every line is
+    flushed when written and synced to disk at least every `sync_interval`
+    seconds, so after a crash or power loss at most the last few segments are
+    lost. A repeated job reads the journal and only transcribes the rest of
+    the audio.
+    """
+
+    def __init__(self, path: str, header: dict, sync_interval: float = 5.0):
+        self.path = path
+        self.header = dict(header, version=FORMAT_VERSION)
+        self.sync_interval = sync_interval
+        self._file = None
+        self._last_sync = 0.0
+
+    def read(self) -> list:
+        """The journaled segments, [] if there is no journal or it belongs to another
+        transcription (different header). A torn last line is ignored."""
+        segments = []
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                try:
+                    if json.loads(f.readline()) != self.header:
+                        return []
+                except ValueError:
+                    return []
+                for line in f:
+                    if not line.endswith('\n'):
+                        break  # interrupted while writing
+                    try:
+                        segments.append(json.loads(line))
+                    except ValueError:
+                        break
+        except OSError:
+            return []
+        return segments
+
+    def open(self, segments: list = ()):
+        """Start a new journal with `segments` (those of `read()` when resuming) and
+        keep it open for `append()`."""
+        self.close()
+        tmp = f'{self.path}.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            for entry in [self.header] + list(segments):
+                f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+        self._file = open(self.path, 'a', encoding='utf-8')
+        self._last_sync = time.monotonic()
+
+    def append(self, seg: dict):
+        self._file.write(json.dumps(seg, ensure_ascii=False) + '\n')
+        self._file.flush()
+        if time.monotonic() - self._last_sync >= self.sync_interval:
+            os.fsync(self._file.fileno())
+            self._last_sync = time.monotonic()
+
+    def close(self):
+        if self._file is not None:
+            try:
+                self._file.flush()
+                os.fsync(self._file.fileno())
+            finally:
+                self._file.close()
+                self._file = None
+
+    def remove(self):
+        """Delete the journal, the transcription is complete."""
+        self.close()
+        try:
+            os.remove(self.path)
+        except OSError:
+            pass
+
+
+def _level(word_alignment) -> int:
+    try:
+        return WORD_ALIGNMENT_LEVELS.index(word_alignment)
+    except ValueError:
+        return -1
@@ -0,0 +1,87 @@
+"""
+Decoded audio shared between processes without copying.
+
+The parent decodes the converted audio once and places the PCM samples
+(float32, 16 kHz mono) in a `multiprocessing.shared_memory` block. The worker
+processes receive a small descriptor dict ({"name", "shape", "dtype"}) and
+attach to the same block zero-copy instead of decoding the file again.
+"""
+
+import os
+import platform
+from multiprocessing import shared_memory
+
+import numpy as np
+
+
+def _shm_space_available(nbytes: int) -> bool:
+    """On Linux, shared memory lives in /dev/shm, which can be small (e.g. 64 MB
+    in Docker containers). Writing beyond its size crashes the process with
+    SIGBUS, so check beforehand."""
+    if platform.system() != 'Linux' or not os.path.isdir('/dev/shm'):
+        return True
+    try:
+        st = os.statvfs('/dev/shm')
+        return st.f_bavail * st.f_frsize > nbytes
+    except OSError:
+        return True
+
+
+class SharedAudio:
+    """Owner (parent side) of a shared memory block holding decoded audio."""
+
+    def __init__(self, audio: np.ndarray):
+        audio = np.ascontiguousarray(audio)
+        if not _shm_space_available(audio.nbytes):
+            raise MemoryError('not enough shared memory available', audio.nbytes)
+        self._shm = shared_memory.SharedMemory(create=True, size=max(audio.nbytes, 1))
+        self.array = np.ndarray(audio.shape, dtype=audio.dtype, buffer=self._shm.buf)
+        self.array[:] = audio
+
+    @property
+    def descriptor(self) -> dict:
+        """Picklable description of the block, passed to the worker processes."""
+        return {
+            'name': self._shm.name,
+            'shape': tuple(self.array.shape),
+            'dtype': str(self.array.dtype),
+        }
+
+    def release(self):
+        """Free the block. `self.array` must not be used afterwards."""
+        if self._shm is None:
+            return
+        self.array = None
+        try:
+            self._shm.close()
+        except BufferError:
+            # there are still views on the buffer, the OS frees it after unlink
+            pass
+        try:
+            self._shm.unlink()
+        except FileNotFoundError:
+            pass
+        self._shm = None
+
+
+def attach_shared_audio(descriptor: dict):
+    """Attach to a block created by `SharedAudio` (worker side).
+
+    Returns a tuple (shm, array). Drop all references to `array` before
+    calling `detach_shared_audio(shm)`.
+    """
+    try:
+        # Python 3.13+: the parent owns the block, don't track it here
+        shm = shared_memory.SharedMemory(name=descriptor['name'], track=False)
+    except TypeError:
+        shm = shared_memory.SharedMemory(name=descriptor['name'])
+    array = np.ndarray(tuple(descriptor['shape']), dtype=np.dtype(descriptor['dtype']), buffer=shm.buf)
+    return shm, array
+
+
+def detach_shared_audio(shm):
+    """Close the worker's handle to the block (never unlinks it)."""
+    try:
+        shm.close()
+    except BufferError:
+        pass
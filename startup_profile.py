@@ -0,0 +1,108 @@
+"""
+Import-time profile of the app start (--profile-startup).
+
+While installed, every `import` statement is timed, like `python -X importtime`
+but also in the frozen app: the time of the imported module's own code
+("self") and including the modules it imports in turn ("cumulative"). Marks
+(see `mark()`) record when a phase of the start is done, e.g. the first window.
+The breakdown is written to stderr when the process exits.
+"""
+
+import atexit
+import builtins
+import sys
+import time
+
+_start = time.perf_counter()
+_original_import = None
+_depth = 0
+_imports = []  # [module, self seconds, cumulative seconds, depth], in import order
+_marks = []  # (name, seconds since start)
+
+
+def install(threshold_ms: float = 2.0):
+    """Start timing imports and print the breakdown at exit. Imports that take less
+    than `threshold_ms` are summed up instead of listed."""
+    global _original_import
+    if _original_import is not None:
+        return
+    _original_import = builtins.__import__
+    builtins.__import__ = _timed_import
+    atexit.register(report, threshold_ms=threshold_ms)
+
+
+def installed() -> bool:
+    return _original_import is not None
+
+
+def elapsed() -> float:
+    """Seconds since the start of the app (more precisely: since this module was
+    imported, which noScribe.py does first)."""
+    return time.perf_counter() - _start
+
+
+def mark(name: str):
+    """Note that a phase of the start is done (no-op if not installed)."""
+    if _original_import is not None:
+        _marks.append((name, time.perf_counter() - _start))
+
+
+def imports() -> list:
+    """The timed imports as (module, self seconds, cumulative seconds, depth) tuples."""
+    return [tuple(record) for record in _imports]
+
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    global _depth
+    known = len(sys.modules)
+    record = [name, 0.0, 0.0, _depth]
+    index = len(_imports)
+    _imports.append(record)
+    _depth += 1
+    t0 = time.perf_counter()
+    try:
+        return _original_import(name, globals, locals, fromlist, level)
+    finally:
+        elapsed = time.perf_counter() - t0
+        _depth -= 1
+        if len(sys.modules) == known:
+            # already imported, nothing to report (nested records are impossible then)
+            del _imports[index:]
+        else:
+            if level > 0 and globals:
+                package = globals.get('__package__') or ''
+                base = package.rsplit('.', level - 1)[0] if level > 1 else package
+                record[0] = f'{base}.{name}' if name else f"{base} ({', '.join(fromlist or ())})"
+            nested = sum(r[2] for r in _imports[index + 1:] if r[3] == record[3] + 1)
+            record[1] = elapsed - nested
+            record[2] = elapsed
+
+
+def report(threshold_ms: float = 2.0, file=None):
+    """Print the marks and the imports as a tree (slowest top-level imports first)."""
+    file = file or sys.stderr
+    total = time.perf_counter() - _start
+    top = [r for r in _imports if r[3] == 0]
+    print('\nStartup profile (ms)', file=file)
+    for name, seconds in _marks:
+        print(f'{seconds * 1000:9.1f}  {name}', file=file)
+    print(f'{sum(r[2] for r in top) * 1000:9.1f}  imports in total', file=file)
+    print(f'{total * 1000:9.1f}  until exit', file=file)
+    print('\n     self   cumul.  module', file=file)
+    small = 0.0
+    # keep every top-level import together with the imports below it
+    groups = []
+    for r in _imports:
+        if r[3] == 0:
+            groups.append([])
+        if groups:
+            groups[-1].append(r)
+    for group in sorted(groups, key=lambda g: g[0][2], reverse=True):
+        for name, self_s, cumulative, depth in group:
+            if cumulative * 1000 < threshold_ms:
+                if depth == 0:
+                    small += cumulative
+                continue
+            print(f'{self_s * 1000:9.1f}{cumulative * 1000:9.1f}  {"  " * depth}{name}', file=file)
+    if small:
+        print(f'{"":9}{small * 1000:9.1f}  (imports under {threshold_ms:g} ms)', file=file)
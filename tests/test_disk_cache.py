@@ -0,0 +1,38 @@
+import os
+import time
+
+from disk_cache import DiskCache
+
+
+def test_disk_cache(tmp_path):
+    """
+    Tests for the `DiskCache` class.
+    """
+
+    cache = DiskCache(str(tmp_path / "cache"), max_size_mb=0.0025, suffix=".bin")  # ~2.6 kB
+    assert cache.get("a") is None
+
+    cache.put_bytes("a", b"1" * 1000)
+    assert cache.get_bytes("a") == b"1" * 1000
+
+    src = tmp_path / "src.bin"
+    src.write_bytes(b"2" * 1000)
+    path = cache.put_file("b", str(src))
+    assert os.path.exists(src) and open(path, "rb").read() == b"2" * 1000
+
+    # "a" is used again, so "b" is the least recently used entry
+    past = time.time() - 100
+    os.utime(cache.path("b"), (past, past))
+    assert cache.get("a") is not None
+    cache.put_bytes("c", b"3" * 1000)
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert sorted(e["key"] for e in cache.entries()) == ["a", "c"]
+
+    # Pruning by age and size
+    old = time.time() - 3 * 86400
+    os.utime(cache.path("a"), (old, old))
+    assert cache.prune(max_age_days=1) == 1
+    assert cache.get("a") is None
+    assert cache.clear() == 1
+    assert cache.entries() == []
@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+engine = pytest.importorskip("engine")
+
+
+def test_early_transcription(monkeypatch):
+    """
+    Tests for `EarlyTranscription`, with a fake Whisper worker that reports one
+    segment per speech chunk of the part it gets.
+    """
+
+    sr = 16000
+    e = engine.Engine()
+    job = engine.TranscriptionJob()
+    job.language_name = "Auto"
+    calls = []
+
+    def run_whisper(tmp_audio_file, job, on_segment, shared_audio=None, speech_chunks=None, language=None,
+                    quiet=False, **kwargs):
+        calls.append((shared_audio["shape"][0], speech_chunks, language, quiet))
+        for c in speech_chunks:
+            on_segment({"start": c["start"] / sr, "end": c["end"] / sr, "text": " x",
+                        "words": [{"start": c["start"] / sr, "end": c["end"] / sr, "word": " x"}]})
+        return engine.WhisperInfo({"language": "de"})
+
+    monkeypatch.setattr(e, "_run_whisper_subprocess_stream", run_whisper)
+    early = engine.EarlyTranscription(e, job, "tmp.wav", min_part_seconds=1)
+    pcm = bytearray(8 * sr * 2)
+    min_gap = sr // 2
+
+    def wait_for_end(end):
+        deadline = time.monotonic() + 10
+        while early.end != end and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert early.end == end
+
+    # The last chunk may continue in the next block, the part ends after the one before it
+    early.feed(pcm, 3 * sr, [{"start": 0, "end": 19200}, {"start": 2 * sr, "end": 3 * sr}], min_gap)
+    wait_for_end(19200 + min_gap // 2)
+
+    # The next part starts where the first one ended, with the detected language
+    chunks = [{"start": 0, "end": 19200}, {"start": 2 * sr, "end": 4 * sr}, {"start": 5 * sr, "end": 6 * sr}]
+    early.feed(pcm, 6 * sr, chunks, min_gap)
+    wait_for_end(4 * sr + min_gap // 2)
+    assert calls == [
+        (23200, [{"start": 0, "end": 19200}], None, True),
+        (44800, [{"start": 8800, "end": 40800}], "de", True),
+    ]
+    assert [(s["start"], s["end"], s["words"][0]["start"]) for s in early.segments] == [
+        (0.0, 1.2, 0.0), (2.0, 4.0, 2.0)]
+
+    # Parts shorter than min_part_seconds wait for more audio, nothing is taken after finish()
+    early.feed(pcm, 6 * sr, chunks[:2] + [{"start": 4 * sr + 9000, "end": 4 * sr + 12000}], min_gap)
+    early.finish()
+    early.feed(pcm, 8 * sr, chunks, min_gap)
+    assert len(calls) == 2 and early.end == 4 * sr + min_gap // 2
+    assert early.error is None
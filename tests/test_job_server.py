@@ -0,0 +1,145 @@
+import json
+import http.client
+import socket
+from threading import Event, Thread
+
+import pytest
+
+job_server = pytest.importorskip("job_server")
+from engine import Engine, JobStatus
+
+
+def test_job_server(tmp_path, monkeypatch):
+    """
+    Tests for the HTTP API of `JobServer`, with a fake transcription that reports
+    two segments per job.
+    """
+
+    engine = Engine()
+    go = Event()
+
+    def transcription_worker(start_job_index=None, max_jobs=None):
+        while engine.queue.has_pending_jobs():
+            job = engine.queue.get_next_waiting_job()
+            job.set_running()
+            engine._jobs_changed()
+            engine._segment_done(job, {"start": 0.0, "end": 1.5, "text": " Hello"}, "S01")
+            go.wait(10)
+            if job.cancel_event.is_set():
+                job.set_canceled("canceled")
+            else:
+                engine._segment_done(job, {"start": 1.5, "end": 3.0, "text": " world."}, "S02")
+                job.set_finished()
+            engine._jobs_changed()
+
+    monkeypatch.setattr(engine, "transcription_worker", transcription_worker)
+    server = job_server.JobServer(engine, port=0, token="secret")
+    Thread(target=server.serve_forever, daemon=True).start()
+    port = server.server_address[1]
+
+    def request(method, path, body=None, token="secret"):
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        headers = {"Authorization": f"Bearer {token}"}
+        conn.request(method, path, json.dumps(body) if body is not None else None, headers)
+        response = conn.getresponse()
+        data = response.read().decode("utf-8")
+        conn.close()
+        return response.status, json.loads(data) if response.getheader("Content-Type", "").startswith(
+            "application/json") else data
+
+    audio = tmp_path / "interview.wav"
+    audio.write_bytes(b"RIFF")
+    try:
+        assert request("GET", "/jobs", token="wrong")[0] == 401
+        status, models = request("GET", "/models")
+        assert status == 200 and "precise" in models
+
+        # Invalid jobs are rejected
+        assert request("POST", "/jobs", {"audio_file": str(audio)})[0] == 400
+        assert request("POST", "/jobs", {"audio_file": str(audio), "transcript_file": "x.html",
+                                         "colour": "red"})[0] == 400
+        assert request("POST", "/jobs", {"audio_file": str(audio), "transcript_file": "x.html",
+                                         "whisper_model_name": "missing"})[0] == 400
+        assert request("POST", "/jobs", {"audio_file": str(tmp_path / "missing.wav"),
+                                         "transcript_file": "x.html"})[0] == 400
+
+        status, job = request("POST", "/jobs", {"audio_file": str(audio), "language_name": "en",
+                                                "transcript_file": str(tmp_path / "out" / "interview.txt"),
+                                                "start_time": "00:00:10", "speaker_detection": "2"})
+        assert status == 201
+        assert job["status"] == "waiting" and job["start"] == 10_000
+        assert (tmp_path / "out").is_dir()
+        assert request("POST", "/jobs", {"audio_file": str(audio),
+                                         "transcript_file": str(tmp_path / "out" / "interview.txt")})[0] == 409
+
+        # The segments are streamed while the job runs
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", f"/jobs/{job['id']}/segments", headers={"Authorization": "Bearer secret"})
+        response = conn.getresponse()
+        assert response.getheader("Content-Type").startswith("text/event-stream")
+        first = response.readline() + response.readline() + response.readline()
+        assert b"id: 0\nevent: segment\n" in first and b"Hello" in first
+        go.set()
+        stream = (first + response.read()).decode("utf-8")
+        conn.close()
+        events = [dict(line.split(": ", 1) for line in block.splitlines())
+                  for block in stream.split("\n\n") if block.strip()]
+        segments = [json.loads(e["data"]) for e in events if e.get("event") == "segment"]
+        assert [(s["start"], s["end"], s["text"], s["speaker"]) for s in segments] == [
+            (10.0, 11.5, " Hello", "S01"), (11.5, 13.0, " world.", "S02")]
+        assert events[-1]["event"] == "end" and json.loads(events[-1]["data"])["status"] == "finished"
+
+        # A finished job can be followed again, clients that reconnect skip what they have seen
+        status, stream = request("GET", f"/jobs/{job['id']}/segments")
+        assert stream.count("event: segment") == 2
+        conn = http.client.HTTPConnection("127.0.0.1", port, timeout=10)
+        conn.request("GET", f"/jobs/{job['id']}/segments",
+                     headers={"Authorization": "Bearer secret", "Last-Event-ID": "0"})
+        stream = conn.getresponse().read().decode("utf-8")
+        conn.close()
+        assert "Hello" not in stream and "world." in stream
+
+        # Cancel a job
+        go.clear()
+        status, second = request("POST", "/jobs", {"audio_file": str(audio),
+                                                   "transcript_file": str(tmp_path / "second.html")})
+        assert request("DELETE", f"/jobs/{second['id']}")[0] == 409
+        status, canceled = request("POST", f"/jobs/{second['id']}/cancel")
+        assert status == 200 and canceled["status"] in ("canceled", "canceling")
+        go.set()
+        status, stream = request("GET", f"/jobs/{second['id']}/segments")
+        assert '"status": "canceled"' in stream.rsplit("event: end", 1)[1]
+
+        status, jobs = request("GET", "/jobs")
+        assert [j["id"] for j in jobs] == [job["id"], second["id"]]
+        assert request("DELETE", f"/jobs/{job['id']}") == (200, {"removed": job["id"]})
+        assert request("GET", f"/jobs/{job['id']}")[0] == 404
+        assert request("GET", "/nothing")[0] == 404
+
+        # Errors close the connection, an unread body is not taken as the next request
+        def raw_request(data):
+            with socket.create_connection(("127.0.0.1", port), timeout=10) as sock:
+                sock.sendall(data)
+                received = b""
+                while chunk := sock.recv(65536):
+                    received += chunk
+            return received.decode("utf-8", "replace")
+
+        smuggled = b"GET /models HTTP/1.1\r\nAuthorization: Bearer secret\r\n\r\n"
+        response = raw_request(b"POST /jobs HTTP/1.1\r\nAuthorization: Bearer wrong\r\n"
+                               b"Content-Length: %d\r\n\r\n" % len(smuggled) + smuggled)
+        assert response.startswith("HTTP/1.1 401") and response.count("HTTP/1.1") == 1
+        response = raw_request("GET /jobs HTTP/1.1\r\nAuthorization: Bearer \u00e4\r\n\r\n".encode("utf-8"))
+        assert response.startswith("HTTP/1.1 401")
+
+        # Unexpected errors are answered as well
+        def broken():
+            raise RuntimeError("models folder broken")
+
+        monkeypatch.setattr(job_server, "find_whisper_models", broken)
+        assert request("GET", "/models") == (500, {"error": "RuntimeError: models folder broken"})
+    finally:
+        server.shutdown()
+        server.server_close()
+    assert engine.queue.get_running_jobs() == []
+    assert JobStatus.WAITING not in [j.status for j in engine.queue.jobs]
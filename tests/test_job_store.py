@@ -0,0 +1,35 @@
+from job_store import JobStore
+
+
+def test_job_store(tmp_path):
+    """
+    Tests for the `JobStore` class.
+    """
+
+    path = str(tmp_path / "queue.sqlite")
+    store = JobStore(path)
+    assert store.load() == []
+
+    store.save("a", "waiting", {"audio_file": "a.mp3"})
+    store.save("b", "transcription", {"audio_file": "b.mp3"})
+    store.save("c", "finished", {"audio_file": "c.mp3"})
+    # Updates keep the position in the queue
+    store.save("a", "waiting", {"audio_file": "a.wav"})
+    store.close()
+
+    # The queue survives a restart, jobs that were running are repeated
+    store = JobStore(path)
+    assert store.recover(["transcription", "speaker_identification"], "waiting") == 1
+    assert store.load() == [
+        ("a", "waiting", {"audio_file": "a.wav"}),
+        ("b", "waiting", {"audio_file": "b.mp3"}),
+        ("c", "finished", {"audio_file": "c.mp3"}),
+    ]
+
+    # Old finished jobs are dropped
+    assert store.prune(["finished"], 1) == 0
+    assert store.prune(["finished"], -1) == 1
+
+    store.remove("a")
+    assert [job_id for job_id, _, _ in store.load()] == ["b"]
+    store.close()
@@ -0,0 +1,67 @@
+from disk_cache import DiskCache
+from segment_store import SegmentJournal, SegmentStore
+
+
+def test_segment_store(tmp_path):
+    """
+    Tests for the `SegmentStore` class.
+    """
+
+    store = SegmentStore(DiskCache(str(tmp_path), 10, ".json.gz"))
+    assert store.get("k") is None
+
+    entry = {
+        "segments": [{"start": 0.0, "end": 1.5, "text": " Hallo"}],
+        "speech_chunks": [{"start": 0, "end": 24000}],
+        "duration": 2.0,
+        "word_alignment": "segment",
+        "diarization": {},
+    }
+    store.put("k", entry)
+    assert store.get("k")["segments"] == entry["segments"]
+
+    # The stored timestamps must be precise enough
+    assert store.get("k", "off") is not None
+    assert store.get("k", "word") is None
+
+    # Speaker segments of different settings accumulate
+    store.put("k", dict(entry, diarization={"2": [{"start": 0, "end": 1500, "label": "SPEAKER_00"}]}))
+    store.put("k", dict(entry, diarization={"auto": []}))
+    assert sorted(store.get("k")["diarization"]) == ["2", "auto"]
+
+    # Damaged entries count as missing
+    store.cache.put_bytes("k", b"no gzip")
+    assert store.get("k") is None
+
+
+def test_segment_journal(tmp_path):
+    """
+    Tests for the `SegmentJournal` class.
+    """
+
+    path = str(tmp_path / "k.jsonl")
+    journal = SegmentJournal(path, {"key": "k", "word_alignment": "segment"})
+    assert journal.read() == []
+
+    seg1 = {"start": 0.0, "end": 1.5, "text": " Hallo"}
+    seg2 = {"start": 1.5, "end": 3.0, "text": " Welt"}
+    journal.open()
+    journal.append(seg1)
+    journal.append(seg2)
+    journal.close()
+    assert journal.read() == [seg1, seg2]
+
+    # A line torn by a crash is ignored, resuming keeps the complete ones
+    with open(path, "a", encoding="utf-8") as f:
+        f.write('{"start": 3.0, "en')
+    assert journal.read() == [seg1, seg2]
+    journal.open(journal.read()[:1])
+    journal.append(seg2)
+    journal.close()
+    assert journal.read() == [seg1, seg2]
+
+    # Journals of another transcription are not used
+    assert SegmentJournal(path, {"key": "k", "word_alignment": "word"}).read() == []
+
+    journal.remove()
+    assert journal.read() == []
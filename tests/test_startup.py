@@ -0,0 +1,88 @@
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+REPO_DIR = Path(__file__).resolve().parents[1]
+
+# Cold start budget for `python noScribe.py --help-models` in ms. Slow machines
+# can raise it with the environment variable NOSCRIBE_STARTUP_BUDGET_MS.
+STARTUP_BUDGET_MS = float(os.environ.get("NOSCRIBE_STARTUP_BUDGET_MS", "1500"))
+
+# Must not be imported before a transcription starts (or the GUI is shown)
+HEAVY_MODULES = ["faster_whisper", "ctranslate2", "onnxruntime", "torch", "numpy",
+                 "AdvancedHTMLParser", "customtkinter", "PIL", "tkinter"]
+
+
+def run_python(tmp_path, *args):
+    """Run python in the repo with an empty config folder, skip the test if a
+    dependency of the app is not installed."""
+    env = dict(os.environ, XDG_CONFIG_HOME=str(tmp_path))
+    proc = subprocess.run([sys.executable, *args], cwd=REPO_DIR, env=env,
+                          capture_output=True, text=True, timeout=120)
+    missing = [line for line in proc.stderr.splitlines() if line.startswith("ModuleNotFoundError")]
+    if proc.returncode != 0 and missing:
+        pytest.skip(missing[-1])
+    return proc
+
+
+def test_engine_import_is_light(tmp_path):
+    """
+    Importing the engine does not load the models' libraries or the GUI.
+    """
+
+    proc = run_python(tmp_path, "-c", "import sys, engine, noScribe; "
+                      f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))")
+    assert proc.returncode == 0, proc.stderr
+    assert proc.stdout.strip() == ""
+
+
+def test_cold_start_budget(tmp_path):
+    """
+    The command line starts within STARTUP_BUDGET_MS and does not write the config.
+    """
+
+    run_python(tmp_path, "noScribe.py", "--help-models")  # compile the modules
+    durations = []
+    for _ in range(3):
+        start = time.perf_counter()
+        proc = run_python(tmp_path, "noScribe.py", "--help-models")
+        durations.append((time.perf_counter() - start) * 1000)
+        assert proc.returncode == 0, proc.stderr
+    assert min(durations) <= STARTUP_BUDGET_MS, (
+        f"cold start took {min(durations):.0f} ms (budget: {STARTUP_BUDGET_MS:.0f} ms), "
+        f"see 'python noScribe.py --help-models --profile-startup'")
+    if sys.platform.startswith("linux"):
+        assert not (tmp_path / "noScribe" / "config.yml").exists()
+
+
+def test_profile_startup(tmp_path):
+    """
+    --profile-startup prints the import times.
+    """
+
+    proc = run_python(tmp_path, "noScribe.py", "--help-models", "--profile-startup")
+    assert proc.returncode == 0, proc.stderr
+    assert "Startup profile" in proc.stderr
+    assert "command line parsed" in proc.stderr
+    assert "engine" in proc.stderr
+
+
+def test_startup_profile_module(tmp_path):
+    """
+    Tests for the import timing of `startup_profile`.
+    """
+
+    proc = run_python(tmp_path, "-c", "import startup_profile; startup_profile.install(threshold_ms=0); "
+                      "import xml.dom.minidom; startup_profile.mark('minidom imported'); "
+                      "import xml.dom.minidom; "
+                      "names = [r[0] for r in startup_profile.imports()]; "
+                      "print(names.count('xml.dom.minidom'), all(r[1] <= r[2] for r in startup_profile.imports()))")
+    assert proc.returncode == 0, proc.stderr
+    # imported once, the second import statement is not recorded
+    assert proc.stdout.strip() == "1 True"
+    assert "minidom imported" in proc.stderr
+    assert "xml.dom.minidom" in proc.stderr
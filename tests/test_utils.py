@@ -1,3 +1,4 @@
+import os
 from pathlib import Path
 
 import pytest
@@ -163,3 +164,332 @@ def test_ms_to_webvtt():
 
     with pytest.raises(ValueError):
         utils.ms_to_webvtt(-1000.5)
+
+
+def test_pad_speech_chunks():
+    """
+    Tests for the `pad_speech_chunks` function.
+    """
+
+    assert utils.pad_speech_chunks([], 10, 100) == []
+
+    # Padding, clipped to the audio
+    chunks = [{"start": 5, "end": 20}, {"start": 50, "end": 95}]
+    assert utils.pad_speech_chunks(chunks, 10, 100) == [
+        {"start": 0, "end": 30},
+        {"start": 40, "end": 100},
+    ]
+
+    # Overlapping chunks are merged
+    chunks = [{"start": 10, "end": 20}, {"start": 30, "end": 40}, {"start": 70, "end": 80}]
+    assert utils.pad_speech_chunks(chunks, 5, 100) == [
+        {"start": 5, "end": 45},
+        {"start": 65, "end": 85},
+    ]
+
+    # The input is not modified
+    assert chunks[0] == {"start": 10, "end": 20}
+
+
+def test_speech_map():
+    """
+    Tests for the `SpeechMap` class.
+    """
+
+    # 1 sample = 1 second for readability
+    chunks = [{"start": 10, "end": 20}, {"start": 30, "end": 40}, {"start": 100, "end": 110}]
+    speech_map = utils.SpeechMap(chunks, 1)
+
+    assert speech_map.chunk_index(0) == 0
+    assert speech_map.chunk_index(9.5) == 0
+    assert speech_map.chunk_index(10) == 1
+    assert speech_map.chunk_index(25) == 2
+    assert speech_map.chunk_index(100) == 2
+
+    assert speech_map.original_time(0) == 10
+    assert speech_map.original_time(5) == 15
+    assert speech_map.original_time(12) == 32
+    assert speech_map.original_time(25) == 105
+
+    # The chunk index can be forced, e.g. for the end of a word
+    assert speech_map.original_time(10, chunk_index=0) == 20
+
+    # Without chunks, times are returned unchanged
+    assert utils.SpeechMap([], 1).original_time(3.5) == 3.5
+
+
+def test_merge_speech_chunks():
+    """
+    Tests for the `merge_speech_chunks` function.
+    """
+
+    assert utils.merge_speech_chunks([], 30) == []
+
+    # Neighbours are joined as long as the clip stays short enough
+    chunks = [{"start": 0, "end": 10}, {"start": 15, "end": 25}, {"start": 28, "end": 40}]
+    assert utils.merge_speech_chunks(chunks, 30) == [
+        {"start": 0, "end": 25},
+        {"start": 28, "end": 40},
+    ]
+
+    # Long chunks are split
+    chunks = [{"start": 5, "end": 75}]
+    assert utils.merge_speech_chunks(chunks, 30) == [
+        {"start": 5, "end": 35},
+        {"start": 35, "end": 65},
+        {"start": 65, "end": 75},
+    ]
+
+
+def test_split_at_pauses():
+    """
+    Tests for the `split_at_pauses` function.
+    """
+
+    chunks = [
+        {"start": 0, "end": 20},
+        {"start": 30, "end": 48},
+        {"start": 52, "end": 70},
+        {"start": 80, "end": 100},
+    ]
+
+    # A single part covers everything
+    assert utils.split_at_pauses(chunks, 100, 1) == [{"start": 0, "end": 100}]
+
+    # Cut in the middle of the pause closest to the middle of the audio
+    assert utils.split_at_pauses(chunks, 100, 2) == [
+        {"start": 0, "end": 50},
+        {"start": 50, "end": 100},
+    ]
+
+    # Prefer long pauses
+    assert utils.split_at_pauses(chunks, 100, 2, min_pause=10) == [
+        {"start": 0, "end": 25},
+        {"start": 25, "end": 100},
+    ]
+
+    # Never more parts than pauses allow
+    assert utils.split_at_pauses(chunks, 100, 10) == [
+        {"start": 0, "end": 25},
+        {"start": 25, "end": 50},
+        {"start": 50, "end": 75},
+        {"start": 75, "end": 100},
+    ]
+
+    # Without pauses, the audio is not split
+    assert utils.split_at_pauses([{"start": 0, "end": 100}], 100, 4) == [{"start": 0, "end": 100}]
+
+
+def test_clip_speech_chunks():
+    """
+    Tests for the `clip_speech_chunks` function.
+    """
+
+    chunks = [
+        {"start": 0, "end": 20},
+        {"start": 30, "end": 48},
+        {"start": 52, "end": 70},
+    ]
+
+    # Chunks overlapping the range are clipped, the result is relative to its start
+    assert utils.clip_speech_chunks(chunks, 40, 100) == [
+        {"start": 0, "end": 8},
+        {"start": 12, "end": 30},
+    ]
+    assert utils.clip_speech_chunks(chunks, 10, 35) == [
+        {"start": 0, "end": 10},
+        {"start": 20, "end": 25},
+    ]
+
+    # Nothing left after the last chunk
+    assert utils.clip_speech_chunks(chunks, 70, 100) == []
+
+    # The full range changes nothing
+    assert utils.clip_speech_chunks(chunks, 0, 100) == chunks
+
+
+def test_shift_segment_times():
+    """
+    Tests for the `shift_segment_times` function.
+    """
+
+    segment = {"start": 1.0, "end": 2.5, "text": " Hallo",
+               "words": [{"start": 1.0, "end": 1.4, "word": " Hallo"}]}
+    assert utils.shift_segment_times(segment, 60.0001) is segment
+    assert (segment["start"], segment["end"]) == (61.0, 62.5)
+    assert segment["words"] == [{"start": 61.0, "end": 61.4, "word": " Hallo"}]
+
+    # Segments without words
+    assert utils.shift_segment_times({"start": 0.0, "end": 1.0, "words": None}, 2)["end"] == 3.0
+
+
+def test_pack_segments():
+    """
+    Tests for the `pack_segments` and `unpack_segments` functions.
+    """
+
+    assert utils.unpack_segments(utils.pack_segments([])) == []
+
+    segments = [
+        {
+            "start": 0.0,
+            "end": 2.5,
+            "text": " Grüß Gott.",
+            "words": [
+                {"word": " Grüß", "start": 0.0, "end": 1.12, "prob": 0.9},
+                {"word": " Gott.", "start": 1.12, "end": 2.5, "prob": None},
+            ],
+        },
+        {"start": 3.0, "end": None, "text": ""},
+        {"start": 3600.25, "end": 3601.5, "text": " 你好", "words": [
+            {"word": " 你好", "start": 3600.25, "end": 3601.5, "prob": 0.5},
+        ]},
+    ]
+    packed = utils.pack_segments(segments)
+    assert all(isinstance(v, bytes) for v in packed.values())
+    assert utils.unpack_segments(packed) == segments
+
+
+def test_pack_diarization():
+    """
+    Tests for the `pack_diarization` and `unpack_diarization` functions.
+    """
+
+    assert utils.unpack_diarization(utils.pack_diarization([])) == []
+
+    segments = [
+        {"start": 0, "end": 1500, "label": "SPEAKER_00"},
+        {"start": 1200, "end": 36000000, "label": "SPEAKER_01"},
+    ]
+    assert utils.unpack_diarization(utils.pack_diarization(segments)) == segments
+
+
+def test_append_speech_chunks():
+    """
+    Tests for the `append_speech_chunks` function.
+    """
+
+    chunks = []
+    utils.append_speech_chunks(chunks, [{"start": 10, "end": 50}, {"start": 80, "end": 100}], 0, 20)
+    assert chunks == [{"start": 10, "end": 50}, {"start": 80, "end": 100}]
+
+    # Speech across the block boundary is joined
+    utils.append_speech_chunks(chunks, [{"start": 0, "end": 30}, {"start": 60, "end": 70}], 100, 20)
+    assert chunks == [{"start": 10, "end": 50}, {"start": 80, "end": 130}, {"start": 160, "end": 170}]
+
+    # A longer pause is kept
+    utils.append_speech_chunks(chunks, [{"start": 50, "end": 60}], 200, 20)
+    assert chunks[-1] == {"start": 250, "end": 260}
+    assert len(chunks) == 4
+
+
+def test_estimate_job_memory_mb():
+    """
+    Tests for the `estimate_job_memory_mb` function.
+    """
+
+    base = utils.estimate_job_memory_mb(1000, 3600, False)
+    assert base > 1500
+
+    # Longer audio, speaker detection and more workers need more memory
+    assert utils.estimate_job_memory_mb(1000, 7200, False) > base
+    assert utils.estimate_job_memory_mb(1000, 3600, True) > base + 1000
+    assert utils.estimate_job_memory_mb(1000, 3600, False, 2) > base + 1000
+
+    # Unknown model size
+    assert utils.estimate_job_memory_mb(0, 0, False) == utils.estimate_job_memory_mb(500, 0, False)
+
+
+def test_file_fingerprint(tmp_path):
+    """
+    Tests for the `file_fingerprint` and `cache_key` functions.
+    """
+
+    a = tmp_path / "a.bin"
+    b = tmp_path / "b.bin"
+    data = bytes(range(256)) * 40000  # larger than the sampled blocks
+    mtime_ns = 1_700_000_000_000_000_000
+    a.write_bytes(data)
+    b.write_bytes(data)
+    os.utime(a, ns=(mtime_ns, mtime_ns))
+    os.utime(b, ns=(mtime_ns, mtime_ns))
+
+    # Depends on the content and modification time, not on the name
+    assert utils.file_fingerprint(str(a)) == utils.file_fingerprint(str(b))
+    os.utime(b, ns=(mtime_ns, mtime_ns + 1))
+    assert utils.file_fingerprint(str(a)) != utils.file_fingerprint(str(b))
+
+    # Changes at the end and in size are noticed
+    b.write_bytes(data[:-1] + b"x")
+    os.utime(b, ns=(mtime_ns, mtime_ns))
+    assert utils.file_fingerprint(str(a)) != utils.file_fingerprint(str(b))
+    b.write_bytes(data + b"x")
+    os.utime(b, ns=(mtime_ns, mtime_ns))
+    assert utils.file_fingerprint(str(a)) != utils.file_fingerprint(str(b))
+
+    # An edit of the same size between the sampled blocks is noticed by the modification time
+    fingerprint = utils.file_fingerprint(str(a))
+    with open(a, "r+b") as f:
+        f.seek(len(data) // 64 * 3)  # between the 2nd and 3rd of 32 sampled blocks
+        f.write(bytes(1000))
+    assert os.path.getsize(a) == len(data)
+    assert utils.file_fingerprint(str(a)) != fingerprint
+    os.utime(a, ns=(mtime_ns, mtime_ns))
+    assert utils.file_fingerprint(str(a)) == fingerprint  # (the content alone is sampled)
+
+    # Small files are hashed completely
+    a.write_bytes(b"abc")
+    b.write_bytes(b"abd")
+    os.utime(a, ns=(mtime_ns, mtime_ns))
+    os.utime(b, ns=(mtime_ns, mtime_ns))
+    assert utils.file_fingerprint(str(a)) != utils.file_fingerprint(str(b))
+
+    assert utils.cache_key("f", 0, 1000) == utils.cache_key("f", 0, 1000)
+    assert utils.cache_key("f", 0, 1000) != utils.cache_key("f", 0, 100)
+
+
+def test_expand_inputs(tmp_path):
+    """
+    Tests for the `expand_inputs` function.
+    """
+
+    for name in ["b.mp3", "a.WAV", "notes.txt", ".hidden.mp3", "sub/c.m4a"]:
+        (tmp_path / name).parent.mkdir(exist_ok=True)
+        (tmp_path / name).write_bytes(b"")
+    d = str(tmp_path)
+
+    # Directories: media files only, sorted
+    assert utils.expand_inputs([d]) == [f"{d}/a.WAV", f"{d}/b.mp3"]
+    assert utils.expand_inputs([d], recursive=True) == [f"{d}/a.WAV", f"{d}/b.mp3", f"{d}/sub/c.m4a"]
+    assert utils.expand_inputs([d], pattern="*.txt") == [f"{d}/notes.txt"]
+
+    # Files as they are, glob patterns, no duplicates
+    assert utils.expand_inputs([f"{d}/notes.txt", f"{d}/*.mp3", f"{d}/b.mp3"]) == [f"{d}/notes.txt", f"{d}/b.mp3"]
+
+    with pytest.raises(FileNotFoundError):
+        utils.expand_inputs([f"{d}/*.flac"])
+
+
+def test_read_manifest(tmp_path):
+    """
+    Tests for the `read_manifest` function.
+    """
+
+    csv_file = tmp_path / "jobs.csv"
+    csv_file.write_text("audio_file,output_file,language,speaker_detection\n"
+                        "a.mp3,,de,2\n"
+                        "/data/b.mp3,out/b.txt,,\n", encoding="utf-8")
+    assert utils.read_manifest(str(csv_file)) == [
+        {"audio_file": str(tmp_path / "a.mp3"), "language": "de", "speaker_detection": "2"},
+        {"audio_file": "/data/b.mp3", "output_file": str(tmp_path / "out/b.txt")},
+    ]
+
+    yaml_file = tmp_path / "jobs.yaml"
+    yaml_file.write_text("jobs:\n"
+                         "  - audio_file: a.mp3\n"
+                         "    timestamps: true\n", encoding="utf-8")
+    assert utils.read_manifest(str(yaml_file)) == [{"audio_file": str(tmp_path / "a.mp3"), "timestamps": True}]
+
+    yaml_file.write_text("- output_file: x.txt\n", encoding="utf-8")
+    with pytest.raises(ValueError):
+        utils.read_manifest(str(yaml_file))
@@ -0,0 +1,97 @@
+import time
+from threading import Event, Thread
+
+import pytest
+
+watch_folder = pytest.importorskip("watch_folder")
+from engine import Engine
+
+
+def wait_for(condition, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.05)
+    return True
+
+
+@pytest.mark.parametrize("backend", ["poll", "inotify"])
+def test_watch_folder(tmp_path, monkeypatch, backend):
+    """
+    Tests for `WatchFolder`, with a fake transcription that records the size of the
+    audio files and fails for "broken" ones.
+    """
+
+    if backend == "inotify":
+        try:
+            watch_folder.InotifyWatcher([str(tmp_path)]).close()
+        except OSError as e:
+            pytest.skip(f"inotify not available: {e}")
+
+    engine = Engine()
+    transcribed = []
+
+    def transcription_worker(start_job_index=None, max_jobs=None):
+        while engine.queue.has_pending_jobs():
+            job = engine.queue.get_next_waiting_job()
+            job.set_running()
+            transcribed.append((job.audio_file, len(open(job.audio_file, "rb").read())))
+            if "broken" in job.audio_file:
+                job.set_error("broken file")
+            else:
+                with open(job.transcript_file, "w") as f:
+                    f.write("transcript")
+                job.set_finished()
+
+    monkeypatch.setattr(engine, "transcription_worker", transcription_worker)
+    incoming, output, archive = tmp_path / "incoming", tmp_path / "transcripts", tmp_path / "done"
+    incoming.mkdir()
+    (incoming / "old.wav").write_bytes(b"old")
+    (incoming / "notes.txt").write_text("not audio")
+
+    with pytest.raises(ValueError):
+        watch_folder.WatchFolder(engine, [str(incoming)], str(tmp_path), str(archive))
+    watch = watch_folder.WatchFolder(engine, [str(incoming)], str(output), str(archive),
+                                     options={"whisper_model_name": "precise", "language_name": "en"},
+                                     file_ext="txt", recursive=True, settle_seconds=0.4, poll_seconds=0.1,
+                                     backend=backend, log=lambda msg: None)
+    stop = Event()
+    thread = Thread(target=watch.run, args=(stop,), daemon=True)
+    thread.start()
+    try:
+        # Files that were there before are transcribed as well
+        assert wait_for(lambda: (archive / "old.wav").exists())
+        assert (output / "old.txt").read_text() == "transcript"
+
+        # A file in a new subfolder is only taken when it is complete
+        (incoming / "sub").mkdir()
+        with open(incoming / "sub" / "new.mp3", "wb") as f:
+            for _ in range(8):
+                f.write(b"x" * 100)
+                f.flush()
+                time.sleep(0.1)
+        (incoming / "sub" / "broken.wav").write_bytes(b"broken")
+        assert wait_for(lambda: (archive / "sub" / "new.mp3").exists())
+        assert (output / "sub" / "new.txt").exists()
+        assert not (incoming / "sub" / "new.mp3").exists()
+
+        # Failed files stay and are not repeated unless they change
+        assert wait_for(lambda: any("broken" in f for f, _ in transcribed))
+        time.sleep(1)
+        assert (incoming / "sub" / "broken.wav").exists()
+        assert (incoming / "notes.txt").exists()
+        assert sorted((name.rsplit("/", 1)[1], size) for name, size in transcribed) == [
+            ("broken.wav", 6), ("new.mp3", 800), ("old.wav", 3)]
+        (incoming / "sub" / "broken.wav").write_bytes(b"fixed")
+        assert wait_for(lambda: len(transcribed) == 4)
+
+        # A new file with the same name does not overwrite the transcript and archived file
+        (incoming / "old.wav").write_bytes(b"again")
+        assert wait_for(lambda: (archive / "old_1.wav").exists())
+        assert (output / "old_1.txt").exists()
+        assert engine.queue.jobs == []
+    finally:
+        stop.set()
+        thread.join(10)
+    assert not thread.is_alive()
@@ -2,6 +2,12 @@
 Different small and distinct helper functions
 """
 
+import csv
+import glob
+import hashlib
+import math
+import os
+import struct
 from pathlib import Path
 
 import i18n
@@ -143,3 +149,552 @@ def ms_to_webvtt(milliseconds: int) -> str:
     """
 
     return ms_to_str(milliseconds, include_ms=True)
+
+
+def pad_speech_chunks(chunks: list, pad: int, total: int) -> list:
+    """
+    Widens speech chunks by a padding on both sides.
+
+    Chunks are dicts with "start" and "end" in samples, as returned by the
+    VAD (`get_speech_timestamps`). Chunks that overlap after padding are
+    merged, boundaries are clipped to the audio.
+
+    Args:
+        chunks (list of dict): Speech chunks, sorted by start.
+        pad (int): Padding in samples added to each side.
+        total (int): Number of samples in the audio.
+
+    Returns:
+        list of dict: The padded chunks.
+    """
+
+    ret = []
+    for chunk in chunks:
+        start = max(0, chunk["start"] - pad)
+        end = min(total, chunk["end"] + pad)
+        if ret and start <= ret[-1]["end"]:
+            ret[-1]["end"] = max(ret[-1]["end"], end)
+        else:
+            ret.append({"start": start, "end": end})
+    return ret
+
+
+class SpeechMap:
+    """
+    Maps times in audio that contains only the speech chunks (silence cut
+    out) back to times in the original audio.
+
+    Args:
+        chunks (list of dict): Speech chunks with "start" and "end" in samples.
+        sampling_rate (int): Sampling rate of the audio.
+    """
+
+    def __init__(self, chunks: list, sampling_rate: int):
+        self.sampling_rate = sampling_rate
+        self.chunk_ends = []  # end of each chunk in the collected audio (samples)
+        self.silence_before = []  # silence removed before each chunk (seconds)
+        removed = 0
+        prev_end = 0
+        for chunk in chunks:
+            removed += chunk["start"] - prev_end
+            prev_end = chunk["end"]
+            self.chunk_ends.append(chunk["end"] - removed)
+            self.silence_before.append(removed / sampling_rate)
+
+    def chunk_index(self, time: float) -> int:
+        """Index of the chunk that contains `time` (seconds in the collected audio)."""
+        sample = int(time * self.sampling_rate)
+        for i, end in enumerate(self.chunk_ends):
+            if sample < end:
+                return i
+        return len(self.chunk_ends) - 1
+
+    def original_time(self, time: float, chunk_index: int = None) -> float:
+        """Convert `time` (seconds in the collected audio) to the original audio."""
+        if not self.chunk_ends:
+            return time
+        if chunk_index is None:
+            chunk_index = self.chunk_index(time)
+        return round(self.silence_before[chunk_index] + time, 3)
+
+
+def append_speech_chunks(chunks: list, new_chunks: list, offset: int, min_gap: int) -> list:
+    """
+    Appends the speech chunks found in one block of audio to the chunks of
+    the preceding blocks.
+
+    Used when the VAD runs block by block. Speech that continues across the
+    block boundary is split by the VAD, so the first new chunk is joined with
+    the last existing one if the gap between them is shorter than `min_gap`.
+
+    Args:
+        chunks (list of dict): Speech chunks found so far, changed in place.
+        new_chunks (list of dict): Speech chunks of the block, relative to
+            its start.
+        offset (int): Start of the block in samples.
+        min_gap (int): Minimum silence between two chunks in samples.
+
+    Returns:
+        list of dict: `chunks`.
+    """
+
+    for i, chunk in enumerate(new_chunks):
+        start, end = chunk["start"] + offset, chunk["end"] + offset
+        if i == 0 and chunks and start - chunks[-1]["end"] < min_gap:
+            chunks[-1]["end"] = max(chunks[-1]["end"], end)
+        else:
+            chunks.append({"start": start, "end": end})
+    return chunks
+
+
+def merge_speech_chunks(chunks: list, max_len: int) -> list:
+    """
+    Groups consecutive speech chunks into clips of limited length.
+
+    Neighbouring chunks are joined (including the silence between them) as
+    long as the resulting clip is not longer than `max_len`. Chunks that are
+    longer than `max_len` on their own are split.
+
+    Args:
+        chunks (list of dict): Speech chunks with "start" and "end" in samples,
+            sorted by start.
+        max_len (int): Maximum length of a clip in samples.
+
+    Returns:
+        list of dict: The clips with "start" and "end" in samples.
+    """
+
+    ret = []
+    for chunk in chunks:
+        start, end = chunk["start"], chunk["end"]
+        if ret and end - ret[-1]["start"] <= max_len:
+            ret[-1]["end"] = end
+            continue
+        while end - start > max_len:
+            ret.append({"start": start, "end": start + max_len})
+            start += max_len
+        ret.append({"start": start, "end": end})
+    return ret
+
+
+def split_at_pauses(chunks: list, total: int, parts: int, min_pause: int = 0) -> list:
+    """
+    Splits audio into contiguous parts of similar length, cutting only in
+    pauses between speech chunks.
+
+    For every ideal cut position (multiples of total / parts), the pause
+    whose middle is closest is chosen. Pauses shorter than `min_pause` are
+    only used if there is no longer one. Parts never cut through speech, so
+    fewer parts than requested may be returned.
+
+    Args:
+        chunks (list of dict): Speech chunks with "start" and "end" in samples,
+            sorted by start.
+        total (int): Number of samples in the audio.
+        parts (int): Number of parts wanted.
+        min_pause (int): Preferred minimum length of a pause in samples.
+
+    Returns:
+        list of dict: The parts with "start" and "end" in samples, covering
+        the whole audio.
+    """
+
+    # (length, middle) of every pause between two speech chunks
+    pauses = [
+        (chunks[i + 1]["start"] - chunks[i]["end"], (chunks[i]["end"] + chunks[i + 1]["start"]) // 2)
+        for i in range(len(chunks) - 1)
+    ]
+    preferred = [mid for length, mid in pauses if length >= min_pause]
+    fallback = [mid for length, mid in pauses if length < min_pause]
+
+    cuts = []
+    for k in range(1, parts):
+        ideal = total * k // parts
+        for candidates in (preferred, fallback):
+            candidates = [c for c in candidates if c not in cuts and 0 < c < total]
+            if candidates:
+                cuts.append(min(candidates, key=lambda c: abs(c - ideal)))
+                break
+    cuts = sorted(set(cuts))
+
+    bounds = [0] + cuts + [total]
+    return [{"start": bounds[i], "end": bounds[i + 1]} for i in range(len(bounds) - 1)]
+
+
+def clip_speech_chunks(chunks: list, start: int, end: int) -> list:
+    """
+    Cuts the speech chunks of a range of the audio out of the full list.
+
+    Chunks that overlap the range are clipped to it, the result is relative
+    to `start`, as the worker expects for an `audio_range`.
+
+    Args:
+        chunks (list of dict): Speech chunks with "start" and "end" in samples,
+            sorted by start.
+        start (int): First sample of the range.
+        end (int): End of the range (exclusive) in samples.
+
+    Returns:
+        list of dict: The chunks within the range, with "start" and "end"
+        relative to `start`.
+    """
+
+    return [
+        {"start": max(c["start"], start) - start, "end": min(c["end"], end) - start}
+        for c in chunks if c["end"] > start and c["start"] < end
+    ]
+
+
+def shift_segment_times(segment: dict, offset: float) -> dict:
+    """
+    Moves a segment and its words by `offset` seconds.
+
+    Used for segments of a part of the audio that was transcribed on its own,
+    to make their timestamps relative to the full audio again.
+
+    Args:
+        segment (dict): Segment as streamed by the Whisper worker, changed in
+            place.
+        offset (float): Start of the part in seconds.
+
+    Returns:
+        dict: `segment`.
+    """
+
+    segment["start"] = round(segment["start"] + offset, 3)
+    segment["end"] = round(segment["end"] + offset, 3)
+    for w in segment.get("words") or []:
+        w["start"] = round(w["start"] + offset, 3)
+        w["end"] = round(w["end"] + offset, 3)
+    return segment
+
+
+# Wire format for segments streamed from the worker processes (see `pack_segments`)
+_SEGMENT_RECORD = struct.Struct("<ddII")  # start, end, end of text in blob, number of words
+_WORD_RECORD = struct.Struct("<fffI")  # start, end, probability, end of text in blob
+_DIARIZATION_RECORD = struct.Struct("<qqI")  # start (ms), end (ms), end of label in blob
+
+
+def _nan_if_none(value) -> float:
+    return math.nan if value is None else value
+
+
+def _none_if_nan(value: float, ndigits: int = None):
+    if math.isnan(value):
+        return None
+    return value if ndigits is None else round(value, ndigits)
+
+
+def pack_segments(segments: list) -> dict:
+    """
+    Packs transcript segments into a compact form for sending them between
+    processes.
+
+    Instead of a list of dicts (which is slow to pickle with many words),
+    segments and words are stored as fixed-width binary records. Their texts
+    are concatenated into one UTF-8 blob, the records hold the end offset of
+    their text in the blob. Word times and probabilities are stored as
+    float32, missing values (None) as NaN.
+
+    Args:
+        segments (list of dict): Segments with "start", "end", "text" and
+            optionally "words" (dicts with "word", "start", "end", "prob").
+
+    Returns:
+        dict: The packed segments ("segs", "words" and "text" as bytes).
+    """
+
+    seg_records = bytearray()
+    word_records = bytearray()
+    text = bytearray()
+    for seg in segments:
+        text += (seg.get("text") or "").encode("utf-8")
+        words = seg.get("words") or []
+        seg_records += _SEGMENT_RECORD.pack(
+            _nan_if_none(seg.get("start")), _nan_if_none(seg.get("end")), len(text), len(words))
+        for w in words:
+            text += (w.get("word") or "").encode("utf-8")
+            word_records += _WORD_RECORD.pack(
+                _nan_if_none(w.get("start")), _nan_if_none(w.get("end")),
+                _nan_if_none(w.get("prob")), len(text))
+    return {"segs": bytes(seg_records), "words": bytes(word_records), "text": bytes(text)}
+
+
+def unpack_segments(packed: dict) -> list:
+    """
+    Restores the segments packed by `pack_segments`.
+
+    Word times are rounded to milliseconds to hide the float32 noise.
+    Segments without words have no "words" key.
+
+    Args:
+        packed (dict): The packed segments.
+
+    Returns:
+        list of dict: The segments.
+    """
+
+    text = packed["text"]
+    words = _WORD_RECORD.iter_unpack(packed["words"])
+    ret = []
+    text_pos = 0
+    for start, end, text_end, word_count in _SEGMENT_RECORD.iter_unpack(packed["segs"]):
+        seg = {
+            "start": _none_if_nan(start),
+            "end": _none_if_nan(end),
+            "text": text[text_pos:text_end].decode("utf-8"),
+        }
+        text_pos = text_end
+        if word_count:
+            seg["words"] = []
+            for _ in range(word_count):
+                w_start, w_end, prob, word_end = next(words)
+                seg["words"].append({
+                    "word": text[text_pos:word_end].decode("utf-8"),
+                    "start": _none_if_nan(w_start, 3),
+                    "end": _none_if_nan(w_end, 3),
+                    "prob": _none_if_nan(prob, 4),
+                })
+                text_pos = word_end
+        ret.append(seg)
+    return ret
+
+
+def pack_diarization(segments: list) -> dict:
+    """
+    Packs a diarization result (dicts with "start" and "end" in milliseconds
+    and the speaker "label") the same way as `pack_segments`.
+
+    Args:
+        segments (list of dict): The speaker segments.
+
+    Returns:
+        dict: The packed segments ("segs" and "text" as bytes).
+    """
+
+    records = bytearray()
+    text = bytearray()
+    for seg in segments:
+        text += str(seg["label"]).encode("utf-8")
+        records += _DIARIZATION_RECORD.pack(seg["start"], seg["end"], len(text))
+    return {"segs": bytes(records), "text": bytes(text)}
+
+
+def unpack_diarization(packed: dict) -> list:
+    """
+    Restores the speaker segments packed by `pack_diarization`.
+
+    Args:
+        packed (dict): The packed segments.
+
+    Returns:
+        list of dict: The speaker segments.
+    """
+
+    text = packed["text"]
+    ret = []
+    text_pos = 0
+    for start, end, text_end in _DIARIZATION_RECORD.iter_unpack(packed["segs"]):
+        ret.append({"start": start, "end": end, "label": text[text_pos:text_end].decode("utf-8")})
+        text_pos = text_end
+    return ret
+
+
+def estimate_job_memory_mb(model_mb: float, duration: float, speaker_detection: bool,
+                           parallel_workers: int = 1) -> float:
+    """
+    Roughly estimates the peak memory a transcription job needs.
+
+    Used to decide whether another job can be started while others are
+    running. Every Whisper worker holds its own copy of the model (plus
+    runtime buffers), the decoded audio is kept as float32 at 16 kHz, and
+    speaker detection adds the pyannote models and embeddings, which grow
+    with the length of the audio.
+
+    Args:
+        model_mb (float): Size of the Whisper model files in MB (0 if unknown).
+        duration (float): Length of the audio in seconds.
+        speaker_detection (bool): Whether the job runs speaker detection.
+        parallel_workers (int): Number of Whisper workers of the job.
+
+    Returns:
+        float: The estimated memory in MB.
+    """
+
+    model_mb = max(model_mb, 500.0)  # unknown or tiny models still need the runtime
+    workers = max(int(parallel_workers), 1)
+    audio_mb = max(duration, 0.0) * 16000 * 4 / (1024 * 1024)
+    mem = workers * (model_mb * 1.5) + audio_mb * 2
+    if speaker_detection:
+        mem += 1000.0 + audio_mb * 3
+    return mem
+
+
+def file_fingerprint(path: str, block_size: int = 1 << 16, blocks: int = 32) -> str:
+    """
+    Computes a fingerprint of a file, e.g. as a cache key.
+
+    Hashing multi-gigabyte video files completely would take longer than
+    some of the work the cache saves, so only `blocks` evenly spread blocks
+    of `block_size` bytes (always including the beginning and the end) are
+    hashed. Smaller files are hashed completely. The file size and
+    modification time are part of the fingerprint, so that edits between
+    the sampled blocks that keep the size (e.g. a muted passage in a WAV
+    file) are noticed as well. The name of the file does not matter.
+
+    Args:
+        path (str): The file.
+        block_size (int): Size of a sampled block in bytes.
+        blocks (int): Number of sampled blocks.
+
+    Returns:
+        str: The fingerprint (hex digest).
+    """
+
+    stat = os.stat(path)
+    size = stat.st_size
+    h = hashlib.blake2b(digest_size=20)
+    h.update(size.to_bytes(8, "little"))
+    h.update(stat.st_mtime_ns.to_bytes(12, "little", signed=True))
+    with open(path, "rb") as f:
+        if size <= block_size * blocks:
+            for data in iter(lambda: f.read(1 << 20), b""):
+                h.update(data)
+        else:
+            step = (size - block_size) / (blocks - 1)
+            for i in range(blocks):
+                f.seek(int(i * step))
+                h.update(f.read(block_size))
+    return h.hexdigest()
+
+
+def cache_key(*parts) -> str:
+    """
+    Combines a fingerprint and the options that influence a cached result
+    into a single cache key.
+
+    Args:
+        *parts: The fingerprint and options (converted to strings).
+
+    Returns:
+        str: The key (hex digest).
+    """
+
+    return hashlib.blake2b("\x1f".join(str(p) for p in parts).encode("utf-8"), digest_size=20).hexdigest()
+
+
+# File types that are picked up from directories (batch mode, watch folders)
+MEDIA_EXTENSIONS = (
+    ".mp3", ".wav", ".m4a", ".aac", ".flac", ".ogg", ".oga", ".opus", ".wma", ".aif", ".aiff", ".amr",
+    ".mp4", ".m4v", ".mov", ".mkv", ".webm", ".avi", ".wmv", ".mpg", ".mpeg", ".3gp",
+)
+
+
+def is_media_file(path: str, pattern: str = None) -> bool:
+    """
+    Checks whether a file is one to transcribe.
+
+    Args:
+        path (str): The file path.
+        pattern (str): Glob pattern the file name must match. If None, the
+            file must have one of the `MEDIA_EXTENSIONS`.
+
+    Returns:
+        bool: True if the file matches.
+    """
+
+    name = os.path.basename(path)
+    if name.startswith("."):
+        return False
+    if pattern:
+        return Path(name).match(pattern)
+    return os.path.splitext(name)[1].lower() in MEDIA_EXTENSIONS
+
+
+def expand_inputs(inputs: list, pattern: str = None, recursive: bool = False) -> list:
+    """
+    Expands the inputs of a batch into a list of files.
+
+    Files are taken as they are, directories are searched for media files
+    (see `is_media_file`), other inputs are treated as glob patterns.
+
+    Args:
+        inputs (list of str): Files, directories and glob patterns.
+        pattern (str): Glob pattern for the files in directories.
+        recursive (bool): Search directories recursively.
+
+    Returns:
+        list of str: The files in the order of the inputs (sorted by name
+        within a directory or pattern), without duplicates.
+
+    Raises:
+        FileNotFoundError: If an input matches nothing.
+    """
+
+    ret = []
+    for item in inputs:
+        if os.path.isfile(item):
+            found = [item]
+        elif os.path.isdir(item):
+            found = []
+            for root, dirs, files in os.walk(item):
+                dirs[:] = sorted(d for d in dirs if not d.startswith(".")) if recursive else []
+                found.extend(os.path.join(root, f) for f in files if is_media_file(f, pattern))
+            found.sort()
+        else:
+            found = sorted(f for f in glob.glob(item, recursive=recursive) if os.path.isfile(f))
+            if not found:
+                raise FileNotFoundError(item)
+        for f in found:
+            if f not in ret:
+                ret.append(f)
+    return ret
+
+
+def read_manifest(path: str) -> list:
+    """
+    Reads a batch manifest: the files to transcribe with options per file.
+
+    A manifest is a CSV file with a header line, or a YAML file with a list
+    of mappings (or a mapping with such a list under "jobs"). Each entry
+    needs an "audio_file", all other columns/keys are passed on as options.
+    Empty CSV cells are left out. Relative paths in "audio_file" and
+    "output_file" are relative to the manifest.
+
+    Args:
+        path (str): The manifest file (.csv, .yaml or .yml).
+
+    Returns:
+        list of dict: One dict of options per file.
+
+    Raises:
+        ValueError: If the manifest is not valid.
+    """
+
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            entries = [
+                {k.strip(): v.strip() for k, v in row.items() if k and v is not None and v.strip() != ""}
+                for row in csv.DictReader(f)
+            ]
+    elif ext in (".yaml", ".yml"):
+        import yaml
+        with open(path, encoding="utf-8") as f:
+            data = yaml.safe_load(f)
+        if isinstance(data, dict):
+            data = data.get("jobs")
+        if not isinstance(data, list) or not all(isinstance(e, dict) for e in data):
+            raise ValueError(f"{path}: expected a list of jobs")
+        entries = [dict(e) for e in data]
+    else:
+        raise ValueError(f"{path}: unknown manifest type (use .csv, .yaml or .yml)")
+
+    base = os.path.dirname(os.path.abspath(path))
+    for i, entry in enumerate(entries):
+        if not entry.get("audio_file"):
+            raise ValueError(f"{path}: entry {i + 1} has no audio_file")
+        for key in ("audio_file", "output_file"):
+            if entry.get(key):
+                entry[key] = os.path.join(base, os.path.expanduser(str(entry[key])))
+    return entries
@@ -0,0 +1,431 @@
+"""
+Watch folders (python noScribe.py --watch IN_DIR --output-dir OUT_DIR --archive-dir DONE_DIR).
+
+New media files in the watched folders are transcribed as soon as they are
+completely written, e.g. when recorders drop them onto a share: a file is
+queued when its size and modification time have not changed for
+'watch_settle_seconds' (config, default 5). The transcript is written to the
+same relative path below the output folder, the audio file is then moved to the
+same relative path below the archive folder. Files that fail stay where they
+are and are tried again when they change or noScribe is restarted.
+
+New files are detected with inotify on Linux (without extra packages), else by
+polling the folders every 'watch_poll_seconds' (config, default 2). Polling
+only lists folders whose modification time has changed, plus all of them once a
+minute. Network file systems (NFS, SMB) are always polled, because inotify does
+not see files written by other computers.
+"""
+
+import ctypes
+import ctypes.util
+import errno
+import os
+import select
+import shutil
+import struct
+import sys
+import time
+from pathlib import Path
+from threading import Event, Thread
+from typing import Callable, Optional
+
+import utils
+from engine import Engine, JobStatus, TranscriptionJob, config, create_transcription_job, get_config
+
+# Poll all folders (not only the changed ones) this often, in case a modification time was missed
+FULL_SCAN_SECONDS = 60
+
+# File systems on which inotify misses changes made by other computers
+NETWORK_FILE_SYSTEMS = ('nfs', 'nfs4', 'cifs', 'smb3', 'smbfs', 'fuse.sshfs', 'afs', '9p', 'davfs')
+
+
+def default_job_options() -> dict:
+    """The options of the last transcription started in the GUI, as parameters of
+    create_transcription_job()"""
+    return dict(
+        language_name=config.get('last_language') or None,
+        whisper_model_name=config.get('last_whisper_model') or None,
+        speaker_detection=config.get('last_speaker') or None,
+        overlapping=bool(config.get('last_overlapping', True)),
+        timestamps=bool(config.get('last_timestamps', False)),
+        disfluencies=bool(config.get('last_disfluencies', True)),
+        pause=config.get('last_pause') or None,
+        decoding_profile=config.get('last_decoding_profile') or None,
+    )
+
+
+def _is_below(path: str, folders: list) -> bool:
+    return any(path == f or path.startswith(f.rstrip(os.sep) + os.sep) for f in folders)
+
+
+def _list_dirs(top: str, recursive: bool, exclude: list) -> list:
+    """`top` and (if `recursive`) its subfolders, except hidden and excluded ones"""
+    if not recursive:
+        return [top]
+    found = []
+    for root, dirs, _ in os.walk(top):
+        found.append(root)
+        dirs[:] = sorted(d for d in dirs
+                         if not d.startswith('.') and not _is_below(os.path.join(root, d), exclude))
+    return found
+
+
+def is_network_path(path: str) -> bool:
+    """Whether `path` is on a network file system (Linux only, else False)"""
+    try:
+        with open('/proc/mounts', 'r', encoding='utf-8') as f:
+            mounts = [line.split()[1:3] for line in f if len(line.split()) > 2]
+    except OSError:
+        return False
+    path = os.path.realpath(path)
+    best, fs_type = '', ''
+    for mount_point, kind in mounts:
+        mount_point = mount_point.replace('\\040', ' ')
+        if _is_below(path, [mount_point]) and len(mount_point) >= len(best):
+            best, fs_type = mount_point, kind
+    return fs_type in NETWORK_FILE_SYSTEMS
+
+
+class PollingWatcher:
+    """Finds changes by comparing the modification times of the watched folders"""
+
+    name = 'polling'
+
+    def __init__(self, roots: list, recursive: bool = False, exclude: list = ()):
+        self.roots = roots
+        self.recursive = recursive
+        self.exclude = list(exclude)
+        self._dirs = {}  # folder -> modification time (ns)
+        self._last_full_scan = time.monotonic()
+        for root in roots:
+            self._add_tree(root)
+
+    def dirs(self) -> list:
+        """All watched folders"""
+        return list(self._dirs)
+
+    def changes(self, timeout: float) -> list:
+        """Wait up to `timeout` seconds, then return the folders whose content has changed"""
+        time.sleep(timeout)
+        full_scan = time.monotonic() - self._last_full_scan >= FULL_SCAN_SECONDS
+        if full_scan:
+            self._last_full_scan = time.monotonic()
+        changed = []
+        for folder, mtime in list(self._dirs.items()):
+            try:
+                new_mtime = os.stat(folder).st_mtime_ns
+            except OSError:
+                if folder not in self.roots:
+                    del self._dirs[folder]
+                continue
+            if new_mtime == mtime and not full_scan:
+                continue
+            self._dirs[folder] = new_mtime
+            changed.append(folder)
+            if self.recursive:
+                try:
+                    subdirs = [e.path for e in os.scandir(folder) if e.is_dir() and not e.name.startswith('.')]
+                except OSError:
+                    continue
+                for subdir in subdirs:
+                    if subdir not in self._dirs and not _is_below(subdir, self.exclude):
+                        changed.extend(self._add_tree(subdir))
+        return changed
+
+    def close(self):
+        pass
+
+    def _add_tree(self, top: str) -> list:
+        added = []
+        for folder in _list_dirs(top, self.recursive, self.exclude):
+            try:
+                self._dirs[folder] = os.stat(folder).st_mtime_ns
+            except OSError:
+                continue
+            added.append(folder)
+        return added
+
+
+class InotifyWatcher:
+    """Finds changes with the inotify API of Linux (OSError if it is not available)"""
+
+    name = 'inotify'
+
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_TO | IN_CREATE | IN_DELETE_SELF | IN_MOVE_SELF | IN_ONLYDIR
+    EVENT_HEADER = struct.Struct('iIII')  # struct inotify_event: wd, mask, cookie, len
+
+    def __init__(self, roots: list, recursive: bool = False, exclude: list = ()):
+        if not sys.platform.startswith('linux'):
+            raise OSError(errno.ENOSYS, 'inotify is only available on Linux')
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c'), use_errno=True)
+        if not hasattr(self._libc, 'inotify_init1'):
+            raise OSError(errno.ENOSYS, 'inotify is not available')
+        self.roots = roots
+        self.recursive = recursive
+        self.exclude = list(exclude)
+        self._wds = {}  # watch descriptor -> folder
+        self._fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            self._raise_errno()
+        try:
+            for root in roots:
+                self._add_tree(root)
+        except OSError:
+            self.close()
+            raise
+
+    def dirs(self) -> list:
+        """All watched folders"""
+        return list(self._wds.values())
+
+    def changes(self, timeout: float) -> list:
+        """Wait up to `timeout` seconds for changes, return the files that were written or
+        moved in and the folders that need to be listed again (new ones, after an overflow)"""
+        if not select.select([self._fd], [], [], timeout)[0]:
+            return []
+        data = b''
+        while True:
+            try:
+                chunk = os.read(self._fd, 65536)
+            except BlockingIOError:
+                break
+            if not chunk:
+                break
+            data += chunk
+        changed = []
+        offset = 0
+        while offset < len(data):
+            wd, mask, _, length = self.EVENT_HEADER.unpack_from(data, offset)
+            offset += self.EVENT_HEADER.size
+            name = os.fsdecode(data[offset:offset + length].rstrip(b'\0'))
+            offset += length
+            if mask & self.IN_Q_OVERFLOW:
+                # events are lost, list all folders again
+                changed.extend(self.dirs())
+                continue
+            folder = self._wds.get(wd)
+            if folder is None:
+                continue
+            if mask & (self.IN_IGNORED | self.IN_DELETE_SELF | self.IN_MOVE_SELF):
+                if mask & self.IN_IGNORED:
+                    del self._wds[wd]
+                continue
+            path = os.path.join(folder, name)
+            if mask & self.IN_ISDIR:
+                if self.recursive and not name.startswith('.') and not _is_below(path, self.exclude):
+                    changed.extend(self._add_tree(path))
+            else:
+                changed.append(path)
+        return changed
+
+    def close(self):
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    def _add_tree(self, top: str) -> list:
+        added = []
+        for folder in _list_dirs(top, self.recursive, self.exclude):
+            wd = self._libc.inotify_add_watch(self._fd, os.fsencode(folder), self.MASK)
+            if wd < 0:
+                if ctypes.get_errno() in (errno.ENOENT, errno.ENOTDIR):  # removed in the meantime
+                    continue
+                self._raise_errno(folder)
+            self._wds[wd] = folder
+            added.append(folder)
+        return added
+
+    @staticmethod
+    def _raise_errno(path: str = None):
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err), path)
+
+
+def open_watcher(roots: list, recursive: bool = False, exclude: list = (), backend: str = 'auto'):
+    """An InotifyWatcher if possible (backend 'auto', not on network file systems, or 'inotify'),
+    else a PollingWatcher"""
+    if backend == 'inotify' or (backend == 'auto' and not any(is_network_path(r) for r in roots)):
+        try:
+            return InotifyWatcher(roots, recursive, exclude)
+        except OSError:
+            # not on Linux, or the limit of inotify watches (fs.inotify.max_user_watches) is reached
+            if backend == 'inotify':
+                raise
+    return PollingWatcher(roots, recursive, exclude)
+
+
+class WatchFolder:
+    """
+    Transcribes the new media files in the folders `inputs` with `engine` (see the
+    module docstring). `options` are parameters of create_transcription_job()
+    (default: default_job_options()), `file_ext` the format of the transcripts
+    (default: the last one used). With several input folders, the output and
+    archive trees have a subfolder per input folder. Raises ValueError if the
+    options are invalid or the folders overlap.
+    """
+
+    def __init__(self, engine: Engine, inputs: list, output_dir: str, archive_dir: str,
+                 options: Optional[dict] = None, file_ext: Optional[str] = None, pattern: Optional[str] = None,
+                 recursive: bool = False, max_jobs: Optional[int] = None, settle_seconds: Optional[float] = None,
+                 poll_seconds: Optional[float] = None, backend: Optional[str] = None,
+                 log: Callable = print):
+        self.engine = engine
+        self.roots = [os.path.abspath(d) for d in inputs]
+        self.output_dir = os.path.abspath(output_dir)
+        self.archive_dir = os.path.abspath(archive_dir)
+        self.options = default_job_options() if options is None else dict(options)
+        self.file_ext = file_ext or config.get('last_filetype') or 'html'
+        self.pattern = pattern
+        self.recursive = recursive
+        self.max_jobs = max_jobs
+        self.settle_seconds = float(settle_seconds if settle_seconds is not None
+                                    else get_config('watch_settle_seconds', '5'))
+        self.poll_seconds = float(poll_seconds if poll_seconds is not None
+                                  else get_config('watch_poll_seconds', '2'))
+        self.backend = backend or get_config('watch_backend', 'auto')
+        self.log = log
+        self.watcher = None
+        self._pending = {}  # audio file -> ((size, mtime), time seen like this first) or None if not checked yet
+        self._jobs = {}  # job -> (input folder, (size, mtime) of the audio file)
+        self._failed = {}  # audio file -> (size, mtime) when it failed, repeated when it changes
+        self._worker = None
+
+        for root in self.roots:
+            if not os.path.isdir(root):
+                raise ValueError(f"Folder '{root}' not found")
+        for folder in (self.output_dir, self.archive_dir):
+            if any(_is_below(root, [folder]) for root in self.roots):
+                raise ValueError(f"The folder '{folder}' must not contain a watched folder")
+        if self.file_ext not in ('html', 'txt', 'vtt'):
+            raise ValueError(f'Invalid format: {self.file_ext}')
+        job = create_transcription_job(transcript_file=f'check.{self.file_ext}', **self.options)
+        if not os.path.isdir(job.whisper_model):
+            raise ValueError(f"Model '{job.whisper_model}' not found")
+
+    def run(self, stop: Optional[Event] = None):
+        """Watch the folders until `stop` is set (or Ctrl+C), then cancel the running jobs"""
+        stop = stop or Event()
+        self.watcher = open_watcher(self.roots, self.recursive, [self.output_dir, self.archive_dir],
+                                    self.backend)
+        self.log(f"Watching {', '.join(self.roots)} ({self.watcher.name})")
+        try:
+            # files that arrived while noScribe was not running
+            for folder in self.watcher.dirs():
+                self._list_folder(folder)
+            while not stop.is_set():
+                self.step()
+                # check waiting files and running jobs often, else just wait for new files
+                busy = self._pending or self._jobs
+                timeout = min(self.poll_seconds, max(self.settle_seconds / 2, 0.05)) if busy else self.poll_seconds
+                for path in self.watcher.changes(timeout):
+                    if os.path.isdir(path):
+                        self._list_folder(path)
+                    else:
+                        self._file_changed(path)
+        finally:
+            self.engine.stop_queue()
+            if self._worker is not None:
+                self._worker.join()
+            self.watcher.close()
+
+    def step(self):
+        """Queue the files that are complete, start the transcription and archive the finished files"""
+        now = time.monotonic()
+        # failed files are checked here, rewriting a file does not change the folder (see PollingWatcher)
+        for path, signature in list(self._failed.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._failed[path]
+                continue
+            if (stat.st_size, stat.st_mtime_ns) != signature:
+                del self._failed[path]
+                self._pending[path] = None
+        for path, seen in list(self._pending.items()):
+            try:
+                stat = os.stat(path)
+            except OSError:
+                del self._pending[path]  # removed or renamed (the new name is reported as well)
+                continue
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if seen is None or seen[0] != signature:
+                self._pending[path] = (signature, now)
+            elif now - seen[1] >= self.settle_seconds and stat.st_size > 0:
+                del self._pending[path]
+                self._add_job(path, signature)
+
+        if self.engine.queue.has_pending_jobs() and (self._worker is None or not self._worker.is_alive()):
+            self._worker = Thread(target=self.engine.transcription_worker, kwargs={'max_jobs': self.max_jobs},
+                                  daemon=True)
+            self._worker.start()
+
+        for job, (root, signature) in list(self._jobs.items()):
+            if job.status == JobStatus.FINISHED:
+                if not self._archive(job, root):
+                    self._failed[job.audio_file] = signature
+            elif job.status in (JobStatus.ERROR, JobStatus.CANCELED):
+                self.log(f'Failed: {job.audio_file} ({job.error_message})')
+                self._failed[job.audio_file] = signature
+            else:
+                continue
+            del self._jobs[job]
+            self.engine.queue.remove_job(job)
+
+    def _list_folder(self, folder: str):
+        try:
+            files = [e.path for e in os.scandir(folder) if e.is_file()]
+        except OSError:
+            return
+        for path in sorted(files):
+            self._file_changed(path)
+
+    def _file_changed(self, path: str):
+        if path in self._pending or not utils.is_media_file(path, self.pattern):
+            return
+        if path in self._failed or any(job.audio_file == path for job in self._jobs):
+            return
+        self._pending[path] = None
+
+    def _mirror_path(self, base_dir: str, root: str, path: str) -> Path:
+        """`path` (in the watched folder `root`) below `base_dir`"""
+        relative = Path(os.path.relpath(path, root))
+        if len(self.roots) > 1:
+            relative = Path(os.path.basename(root)) / relative
+        return Path(base_dir) / relative
+
+    def _add_job(self, path: str, signature: tuple):
+        root = max((r for r in self.roots if _is_below(path, [r])), key=len)
+        try:
+            transcript = self._mirror_path(self.output_dir, root, path).with_suffix(f'.{self.file_ext}')
+            transcript.parent.mkdir(parents=True, exist_ok=True)
+            transcript = utils.create_unique_filenames([transcript])[0]
+            job = create_transcription_job(audio_file=path, transcript_file=str(transcript), **self.options)
+        except Exception as e:
+            self.log(f'Failed: {path} ({e})')
+            self._failed[path] = signature
+            return
+        self.engine.queue.add_job(job)
+        self._jobs[job] = (root, signature)
+        self.log(f'Queued: {path} -> {job.transcript_file}')
+
+    def _archive(self, job: TranscriptionJob, root: str) -> bool:
+        """Move the audio file of `job` to the archive, False if that fails"""
+        try:
+            target = self._mirror_path(self.archive_dir, root, job.audio_file)
+            target.parent.mkdir(parents=True, exist_ok=True)
+            target = utils.create_unique_filenames([target])[0]
+            shutil.move(job.audio_file, target)
+        except (OSError, RuntimeError) as e:
+            self.log(f'Transcribed: {job.audio_file} -> {job.transcript_file}, cannot archive it: {e}')
+            return False
+        self.log(f'Transcribed: {job.audio_file} -> {job.transcript_file}, archived as {target}')
+        return True
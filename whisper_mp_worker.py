@@ -1,131 +1,329 @@
 import gc
 import os
-import platform
+import threading
+import time
 import traceback
+from collections import OrderedDict
 from dataclasses import asdict, is_dataclass
 from i18n import t
+import numpy as np
 
+import utils
+from mp_service import JobQueue
 
-def whisper_proc_entrypoint(args: dict, q):
-    """
-    Runs in a child process. Streams progress/logs to parent via `q`.
-    Messages put on `q` are dicts with one of the following shapes:
-      {"type": "log", "level": "info"|"warn"|"error"|"debug", "msg": "..."}
-      {"type": "progress", "pct": float, "detail": "..."}   # optional
-      {"type": "result", "ok": True, "segments": [...], "info": {...}}
-      {"type": "result", "ok": False, "error": str, "trace": str}
+app_dir = os.path.abspath(os.path.dirname(__file__))
+
+
+def _init_i18n(locale):
+    """Initialize i18n in child process (PyInstaller uses spawn; no globals shared)"""
+    import i18n
+    try:
+        i18n.set('filename_format', '{locale}.{format}')
+        # Ensure translations directory is available to python-i18n
+        trans_dir = os.path.join(app_dir, 'trans')
+        if trans_dir not in i18n.load_path:
+            i18n.load_path.append(trans_dir)
+        i18n.set('fallback', 'en')
+        # Use locale passed by parent when available
+        i18n.set('locale', locale or 'en')
+    except Exception:
+        # Safe fallback: leave i18n defaults; keys may pass through
+        pass
+
+
+def _model_key(args: dict) -> tuple:
+    return (
+        args["model_name_or_path"],
+        args.get("device", "auto"),
+        args.get("compute_type", "float16"),
+        args.get("cpu_threads", 4),
+    )
+
+
+def _load_model(args: dict):
+    from faster_whisper import WhisperModel
+    return WhisperModel(
+        args["model_name_or_path"],
+        device=args.get("device", "auto"),
+        compute_type=args.get("compute_type", "float16"),
+        cpu_threads=args.get("cpu_threads", 4),
+        local_files_only=args.get("local_files_only", True),
+    )
+
+
+def model_size_mb(model_path: str) -> float:
+    """Rough memory footprint of a CTranslate2 model, estimated from its files on disk."""
+    total = 0
+    try:
+        for entry in os.scandir(model_path):
+            if entry.is_file():
+                total += entry.stat().st_size
+    except OSError:
+        pass
+    return total / (1024 * 1024)
+
+
+class ModelCache:
+    """LRU of loaded WhisperModels, keyed by (model path, device, compute_type, cpu_threads).
+
+    Models are evicted (least recently used first) as long as the estimated
+    size of all loaded models exceeds `budget_mb`. The model that is requested
+    is always kept, even if it alone exceeds the budget.
     """
+
+    def __init__(self, budget_mb: float):
+        self.budget_mb = budget_mb
+        self.models = OrderedDict()  # key -> (model, size_mb)
+
+    def get(self, args: dict, log_cb):
+        key = _model_key(args)
+        if key in self.models:
+            self.models.move_to_end(key)
+            log_cb('debug', f'Reusing loaded Whisper model: {key}')
+            return self.models[key][0]
+
+        size_mb = model_size_mb(args["model_name_or_path"])
+        self._evict(self.budget_mb - size_mb, log_cb)
+        start = time.perf_counter()
+        model = _load_model(args)
+        log_cb('debug', f'Whisper model loaded in {time.perf_counter() - start:.1f}s: {key}')
+        self.models[key] = (model, size_mb)
+        return model
+
+    def _evict(self, target_mb: float, log_cb):
+        evicted = False
+        while self.models and sum(s for _, s in self.models.values()) > max(target_mb, 0):
+            key, _ = self.models.popitem(last=False)
+            log_cb('debug', f'Evicting Whisper model from cache: {key}')
+            evicted = True
+        if evicted:
+            _free_memory()
+
+    def clear(self):
+        self.models.clear()
+        _free_memory()
+
+
+def _free_memory():
+    # Cleanup VRAM (harmless on CPU)
+    gc.collect()
     try:
-        # Import heavy libs only in the child
-        from faster_whisper import WhisperModel
-        from faster_whisper.audio import decode_audio
-        from faster_whisper.vad import VadOptions, get_speech_timestamps
         import torch
-        import yaml
-        import i18n
+        torch.cuda.empty_cache()
+    except Exception:
+        pass
 
-        def plog(level, msg):
-            try:
-                q.put({"type": "log", "level": level, "msg": str(msg)})
-            except Exception:
-                pass
 
-        # Initialize i18n in child process (PyInstaller uses spawn; no globals shared)
-        try:
-            app_dir = os.path.abspath(os.path.dirname(__file__))
-            i18n.set('filename_format', '{locale}.{format}')
-            # Ensure translations directory is available to python-i18n
-            i18n.load_path.append(os.path.join(app_dir, 'trans'))
-            i18n.set('fallback', 'en')
-            # Use locale passed by parent when available
-            child_locale = args.get('locale') or 'en'
-            i18n.set('locale', child_locale)
-        except Exception:
-            # Safe fallback: leave i18n defaults; keys may pass through
-            pass
-            
-        # Build model in child using provided options
-        model = WhisperModel(
-            args["model_name_or_path"],
-            device=args.get("device", "auto"),
-            compute_type=args.get("compute_type", "float16"),
-            cpu_threads=args.get("cpu_threads", 4),
-            local_files_only=args.get("local_files_only", True),
-        )
-
-        # Define callbacks that forward to parent via queue (not used by faster-whisper directly, but kept for parity)
-        def log_cb(level, msg):
-            plog(level, msg)
-
-        # Prepare audio and VAD
+class _SegmentBatcher:
+    """
+    Coalesces streamed segments into packed "segments" messages (see
+    `utils.pack_segments`). A batch is sent when it holds `max_segments`
+    segments or its oldest segment has waited `max_delay` seconds, so that
+    slow transcriptions still update the parent promptly.
+    """
+
+    def __init__(self, q, max_segments: int = 32, max_delay: float = 0.25):
+        self._q = q
+        self._max_segments = max_segments
+        self._max_delay = max_delay
+        self._pending = []
+        self._lock = threading.Lock()
+        self._timer = None
+
+    def add(self, seg_d: dict):
+        with self._lock:
+            self._pending.append(seg_d)
+            if len(self._pending) >= self._max_segments:
+                self._flush_locked()
+            elif self._timer is None:
+                self._timer = threading.Timer(self._max_delay, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def flush(self):
+        with self._lock:
+            self._flush_locked()
+
+    def _flush_locked(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._pending:
+            self._q.put({"type": "segments", "packed": utils.pack_segments(self._pending)})
+            self._pending = []
+
+
+def _transcribe(model, args: dict, q):
+    """Transcribe the job's audio with an already loaded model, streaming
+    segments and the final result to `q`. The audio is taken from the shared
+    memory block in `args["shared_audio"]` if given, else decoded from
+    `args["audio_path"]`. If `args["audio_range"]` (start, end in samples) is
+    given, only this part of the audio is transcribed; the timestamps stay
+    relative to the full audio."""
+    from faster_whisper.audio import decode_audio
+
+    # Prepare audio and VAD
+    sampling_rate = model.feature_extractor.sampling_rate
+    shared = args.get("shared_audio")
+    shm = None
+    if shared:
+        # Decoded once by the parent, attach zero-copy
+        from shared_audio import attach_shared_audio
+        shm, audio = attach_shared_audio(shared)
+    else:
         audio_path = args.get("audio_path")
         if not audio_path or not os.path.exists(audio_path):
             raise FileNotFoundError(f"Audio path does not exist: {audio_path}")
-
-        sampling_rate = model.feature_extractor.sampling_rate
         audio = decode_audio(audio_path, sampling_rate=sampling_rate)
-        duration = audio.shape[0] / sampling_rate
-        log_cb("info", t('vad'))
+    audio_range = args.get("audio_range")
+    if audio_range:
+        audio = audio[audio_range[0]:audio_range[1]] # a view, no copy
+    try:
+        _transcribe_audio(model, audio, sampling_rate, args, q)
+    finally:
+        if shm is not None:
+            from shared_audio import detach_shared_audio
+            audio = None
+            gc.collect()
+            detach_shared_audio(shm)
 
-        # VAD options
-        vad_threshold = float(args.get("vad_threshold", 0.5))
+
+def _transcribe_audio(model, audio, sampling_rate: int, args: dict, q):
+    from faster_whisper.vad import VadOptions
+    import yaml
+
+    def log_cb(level, msg):
         try:
-            vad_parameters = VadOptions(min_silence_duration_ms=500, threshold=vad_threshold, speech_pad_ms=50)
-        except TypeError:
-            vad_parameters = VadOptions(min_silence_duration_ms=500, onset=vad_threshold, speech_pad_ms=50)
-
-        # Language handling
-        language_name = args.get("language_name")
-        language_code = args.get("language_code")
-        multilingual = False
-        whisper_lang = None
-        if language_name == "Multilingual":
-            multilingual = True
-            whisper_lang = None
-        elif language_name == "Auto":
-            whisper_lang = None
+            q.put({"type": "log", "level": level, "msg": str(msg)})
+        except Exception:
+            pass
+
+    duration = audio.shape[0] / sampling_rate
+    time_offset = (args.get("audio_range") or (0, 0))[0] / sampling_rate
+    log_cb("info", t('vad'))
+
+    # VAD options
+    vad_threshold = float(args.get("vad_threshold", 0.5))
+    try:
+        vad_parameters = VadOptions(min_silence_duration_ms=500, threshold=vad_threshold, speech_pad_ms=50)
+    except TypeError:
+        vad_parameters = VadOptions(min_silence_duration_ms=500, onset=vad_threshold, speech_pad_ms=50)
+
+    # If the parent has already run the VAD, reuse its speech chunks instead of running
+    # Silero again, else run it here (before the model sees the audio). The silence is cut
+    # out here (the same as vad_filter does internally) and the timestamps are mapped back
+    # to the original audio afterwards.
+    batch_size = int(args.get("batch_size") or 0)
+    speech_map = None
+    clip_timestamps = None
+    speech_chunks = args.get("speech_chunks")
+    if args.get("vad_filter", True):
+        if speech_chunks is not None:
+            chunks = utils.pad_speech_chunks(speech_chunks, int(sampling_rate * vad_parameters.speech_pad_ms / 1000),
+                                             audio.shape[0])
         else:
-            whisper_lang = language_code
+            from faster_whisper.vad import get_speech_timestamps
+            chunks = get_speech_timestamps(audio, vad_parameters)  # padded already
+        if batch_size > 1:
+            # The batched pipeline takes the speech chunks as clips of up to 30 seconds, 
+            # which are decoded in parallel. Timestamps stay relative to the original audio.
+            clip_timestamps = [
+                {"start": c["start"] / sampling_rate, "end": c["end"] / sampling_rate}
+                for c in utils.merge_speech_chunks(chunks, 30 * sampling_rate)
+            ]
+            if chunks:
+                lang_audio = np.concatenate([audio[c['start']:c['end']] for c in chunks])
+            else:
+                lang_audio = audio[:0]
+        else:
+            speech_map = utils.SpeechMap(chunks, sampling_rate)
+            if chunks:
+                audio = np.concatenate([audio[c['start']:c['end']] for c in chunks])
+            else:
+                audio = audio[:0]
+            lang_audio = audio
+        has_speech = len(chunks) > 0
+    else:
+        lang_audio = audio
+        has_speech = audio.shape[0] > 0
+
+    if not has_speech:
+        # nothing to transcribe, don't run the model on silence
+        log_cb("debug", "No speech found.")
+        q.put({"type": "result", "ok": True, "info": {"language": None, "language_probability": None,
+                                                       "duration": duration}})
+        return
 
-        # Detect language if requested (Auto)
-        if language_name == "Auto":
-            language, language_probability, _ = model.detect_language(
-                audio, vad_filter=True, vad_parameters=vad_parameters
-            )
-            log_cb("info", t('language_detect', lang=language, prob=f'{language_probability:.2f}'))
-            whisper_lang = language
+    # Language handling
+    language_name = args.get("language_name")
+    language_code = args.get("language_code")
+    multilingual = False
+    whisper_lang = None
+    if language_name == "Multilingual":
+        multilingual = True
+        whisper_lang = None
+    elif language_name == "Auto":
+        whisper_lang = None
+    else:
+        whisper_lang = language_code
 
-        # Build prompt/hotwords if disfluencies suppression is requested
+    # Detect language if requested (Auto)
+    if language_name == "Auto":
+        language, language_probability, _ = model.detect_language(lang_audio, vad_filter=False)
+        log_cb("info", t('language_detect', lang=language, prob=f'{language_probability:.2f}'))
+        whisper_lang = language
+        if args.get("detect_language_only"):
+            q.put({"type": "result", "ok": True,
+                   "info": {"language": language, "language_probability": language_probability}})
+            return
+    if args.get("detect_language_only"):
+        q.put({"type": "result", "ok": True, "info": {"language": whisper_lang, "language_probability": None}})
+        return
+
+    # Build prompt/hotwords if disfluencies suppression is requested
+    prompt = ""
+    if args.get("disfluencies", False):
+        prompt_file = 'prompt.yml'
+    else:
+        prompt_file = 'prompt_nd.yml'
+    try:
+        with open(os.path.join(app_dir, prompt_file), 'r', encoding='utf-8') as f:
+            prompts = yaml.safe_load(f) or {}
+        prompt = prompts.get(whisper_lang, '')
+    except Exception:
+        log_cb('error', t('err_loading_prompt') + '\n')
         prompt = ""
-        if args.get("disfluencies", False):
-            prompt_file = 'prompt.yml'
-        else:
-            prompt_file = 'prompt_nd.yml'         
-        try:
-            with open(os.path.join(app_dir, prompt_file), 'r', encoding='utf-8') as f:
-                prompts = yaml.safe_load(f) or {}
-            prompt = prompts.get(whisper_lang, '')
-        except Exception:
-            log_cb('error', t('err_loading_prompt') + '\n')
-            prompt = ""
-
-        # Perform transcription (streaming)
-        segments, info = model.transcribe(
-            audio_path,
-            language=whisper_lang,
-            multilingual=multilingual,
-            beam_size=args.get("beam_size", 5),
-            # temperature=args.get("temperature"),
-            word_timestamps=args.get("word_timestamps", True),
-            # initial_prompt=args.get("initial_prompt"),
-            hotwords=prompt,
-            vad_filter=args.get("vad_filter", True),
-            vad_parameters=vad_parameters,
-        )
-        
-        log_cb('info', t('start_transcription') + '\n')
-        
-        # Stream segments to parent as they arrive
+
+    # Perform transcription (streaming)
+    transcribe_kwargs = dict(
+        language=whisper_lang,
+        multilingual=multilingual,
+        beam_size=args.get("beam_size", 5),
+        best_of=args.get("best_of", 5),
+        temperature=args.get("temperature", [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]),
+        word_timestamps=args.get("word_timestamps", True),
+        without_timestamps=args.get("without_timestamps", False),
+        # initial_prompt=args.get("initial_prompt"),
+        hotwords=prompt,
+        vad_filter=False,  # done above
+    )
+    if batch_size > 1:
+        # Batched mode: independent speech chunks are decoded in batches. 
+        # Segments are still yielded in timestamp order.
+        from faster_whisper import BatchedInferencePipeline
+        log_cb('debug', f'Batched inference, batch size: {batch_size}')
+        if clip_timestamps is not None:
+            transcribe_kwargs['clip_timestamps'] = clip_timestamps
+        segments, info = BatchedInferencePipeline(model=model).transcribe(
+            audio, batch_size=batch_size, **transcribe_kwargs)
+    else:
+        segments, info = model.transcribe(audio, **transcribe_kwargs)
+
+    log_cb('info', t('start_transcription') + '\n')
+
+    # Stream segments to parent as they arrive
+    batcher = _SegmentBatcher(q)
+    try:
         for s in segments:
             try:
                 seg_d = {
@@ -144,46 +342,186 @@ def whisper_proc_entrypoint(args: dict, q):
                         }
                         for w in words
                     ]
-                q.put({"type": "segment", "segment": seg_d})
+                if speech_map is not None:
+                    _restore_timestamps(seg_d, speech_map)
+                if time_offset:
+                    utils.shift_segment_times(seg_d, time_offset)
+                batcher.add(seg_d)
             except Exception:
                 # Best-effort; continue on serialization issues
                 pass
+    finally:
+        # also send what was decoded before an error
+        batcher.flush()
 
-        # info into dict
-        if is_dataclass(info):
-            info_dict = asdict(info)
-        else:
-            info_dict = {}
-            for k in ("language", "language_probability", "duration", "sample_rate"):
-                if hasattr(info, k):
-                    info_dict[k] = getattr(info, k)
-        # Ensure duration is available
-        info_dict.setdefault("duration", duration)
+    # info into dict
+    if is_dataclass(info):
+        info_dict = asdict(info)
+    else:
+        info_dict = {}
+        for k in ("language", "language_probability", "duration", "sample_rate"):
+            if hasattr(info, k):
+                info_dict[k] = getattr(info, k)
+    # Ensure duration is available
+    info_dict.setdefault("duration", duration)
+
+    try:
+        q.put({"type": "result", "ok": True, "info": info_dict})
+    except Exception:
+        pass
+
+
+def _restore_timestamps(seg_d: dict, speech_map):
+    """Map segment and word times from the speech-only audio back to the original audio."""
+    words = seg_d.get("words")
+    if words:
+        for w in words:
+            # use the middle of the word to find its chunk, so that start and end stay in the same chunk
+            chunk_index = speech_map.chunk_index((w["start"] + w["end"]) / 2)
+            w["start"] = speech_map.original_time(w["start"], chunk_index)
+            w["end"] = speech_map.original_time(w["end"], chunk_index)
+        seg_d["start"] = words[0]["start"]
+        seg_d["end"] = words[-1]["end"]
+    else:
+        start, end = seg_d["start"], seg_d["end"]
+        seg_d["start"] = speech_map.original_time(start)
+        # an end exactly on a chunk boundary belongs to the chunk before
+        seg_d["end"] = speech_map.original_time(end, speech_map.chunk_index(max(start, end - 0.001)))
 
-        try:
-            q.put({"type": "result", "ok": True, "info": info_dict})
-        except Exception:
-            pass
+
+def _put_error(q, e):
+    try:
+        q.put({
+            "type": "result",
+            "ok": False,
+            "error": f"{type(e).__name__}: {e}",
+            "trace": traceback.format_exc(),
+        })
+    except Exception:
+        pass
+
+
+def whisper_proc_entrypoint(args: dict, q):
+    """
+    Runs in a child process. Streams progress/logs to parent via `q`.
+    Messages put on `q` are dicts with one of the following shapes:
+      {"type": "log", "level": "info"|"warn"|"error"|"debug", "msg": "..."}
+      {"type": "progress", "pct": float, "detail": "..."}   # optional
+      {"type": "segments", "packed": {...}}   # see utils.pack_segments
+      {"type": "result", "ok": True, "info": {...}}
+      {"type": "result", "ok": False, "error": str, "trace": str}
+    """
+    try:
+        _init_i18n(args.get('locale'))
+        # Build model in child using provided options
+        model = _load_model(args)
+        _transcribe(model, args, q)
 
         # Cleanup VRAM (harmless on CPU)
         try:
             del model
         except Exception:
             pass
+        _free_memory()
         try:
-            torch.cuda.empty_cache()
+            q.put({"type": "log", "level": "debug", "msg": "Subprocess finished cleanly."})
         except Exception:
             pass
-        gc.collect()
-        plog("debug", "Subprocess finished cleanly.")
 
     except Exception as e:
+        _put_error(q, e)
+
+
+def whisper_service_entrypoint(req_q, q, cache_budget_mb: float = 0):
+    """
+    Resident variant of `whisper_proc_entrypoint` (see `mp_service.ResidentWorker`).
+    Runs in a long-lived child process and takes jobs (the same `args` dicts as
+    `whisper_proc_entrypoint`, plus a `job_id`) from `req_q` until it receives
+    `None`. Loaded models are kept in a `ModelCache` between jobs. All messages
+    carry the `job_id` of the job they belong to.
+    """
+    cache = ModelCache(cache_budget_mb)
+    while True:
         try:
-            q.put({
-                "type": "result",
-                "ok": False,
-                "error": f"{type(e).__name__}: {e}",
-                "trace": traceback.format_exc(),
-            })
-        except Exception:
-            pass
+            args = req_q.get()
+        except (EOFError, OSError, KeyboardInterrupt):
+            break
+        if args is None:
+            break
+        job_q = JobQueue(q, args.get('job_id'))
+        try:
+            _init_i18n(args.get('locale'))
+            model = cache.get(args, lambda level, msg: job_q.put({"type": "log", "level": level, "msg": str(msg)}))
+            _transcribe(model, args, job_q)
+        except Exception as e:
+            _put_error(job_q, e)
+        finally:
+            model = None
+            gc.collect()
+    cache.clear()
+
+
+def synthetic_speech(seconds: float, sampling_rate: int = 16000) -> np.ndarray:
+    """Speech-like test signal for benchmarks: harmonic tones with a varying pitch,
+    modulated at syllable rate, plus a little noise. Deterministic."""
+    rng = np.random.default_rng(0)
+    t_ = np.arange(int(seconds * sampling_rate)) / sampling_rate
+    pitch = 140 + 40 * np.sin(2 * np.pi * 0.3 * t_)
+    phase = 2 * np.pi * np.cumsum(pitch) / sampling_rate
+    voice = sum(np.sin(k * phase) / k for k in range(1, 6))
+    envelope = np.clip(np.sin(2 * np.pi * 4 * t_), 0, None) * (np.sin(2 * np.pi * 0.2 * t_) > -0.6)
+    audio = 0.3 * voice * envelope + 0.01 * rng.standard_normal(t_.shape[0])
+    return (audio / np.max(np.abs(audio))).astype(np.float32) * 0.5
+
+
+def whisper_autotune_entrypoint(args: dict, q):
+    """
+    Runs in a child process. Benchmarks every combination of `args["compute_types"]`
+    and `args["thread_counts"]` for one model and reports the real-time factor
+    (processing time / audio duration) of each.
+    The workload is `args["audio_path"]` (decoded, cut to `args["seconds"]`) or,
+    without a path, a synthetic signal of that length.
+    Messages:
+      {"type": "log", "level": "info"|"error"|"debug", "msg": "..."}
+      {"type": "bench", "compute_type": str, "threads": int, "rtf": float|None, "error": str}
+      {"type": "result", "ok": True}
+      {"type": "result", "ok": False, "error": str, "trace": str}
+    """
+    try:
+        seconds = float(args.get("seconds", 30))
+        sampling_rate = 16000
+        if args.get("audio_path"):
+            from faster_whisper.audio import decode_audio
+            audio = decode_audio(args["audio_path"], sampling_rate=sampling_rate)
+            audio = audio[:int(seconds * sampling_rate)]
+        else:
+            audio = synthetic_speech(seconds, sampling_rate)
+        duration = audio.shape[0] / sampling_rate
+
+        for compute_type in args["compute_types"]:
+            for threads in args["thread_counts"]:
+                result = {"type": "bench", "compute_type": compute_type, "threads": threads, "rtf": None}
+                model = None
+                try:
+                    model = _load_model(dict(args, compute_type=compute_type, cpu_threads=threads))
+                    # warm up, the first call allocates buffers
+                    segments, _ = model.transcribe(audio[:sampling_rate * 2], language="en", beam_size=1,
+                                                   vad_filter=False, without_timestamps=True)
+                    list(segments)
+                    start = time.perf_counter()
+                    segments, _ = model.transcribe(audio, language="en", beam_size=args.get("beam_size", 5),
+                                                   temperature=0.0, condition_on_previous_text=False,
+                                                   vad_filter=False, without_timestamps=True)
+                    list(segments)
+                    result["rtf"] = (time.perf_counter() - start) / duration
+                except Exception as e:
+                    # e.g. compute type not supported on this device
+                    result["error"] = f"{type(e).__name__}: {e}"
+                finally:
+                    model = None
+                    _free_memory()
+                q.put(result)
+
+        q.put({"type": "result", "ok": True})
+    except Exception as e:
+        _put_error(q, e)